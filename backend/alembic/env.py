@@ -16,6 +16,7 @@ if config.config_file_name is not None:
 
 # add your model's MetaData object here
 # for 'autogenerate' support
+import re
 import sys
 import os
 
@@ -27,11 +28,26 @@ from app.models import (
     project,
     shotlist,
     shotlist_item,
+    shotlist_item_tombstone,
     client,
+    job,
 )  # Import all models
 
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Hash partitions (see app/models/shotlist_item.py) have no models of
+    # their own; don't offer to drop them
+    if type_ == "table" and reflected and compare_to is None:
+        return not re.fullmatch(r"shotlist_items_p\d+", name)
+    # Trigram indexes exist only where pg_trgm is installed, so migrations
+    # create them conditionally and the models don't declare them
+    if type_ == "index" and name.endswith("_trgm"):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -58,6 +74,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -81,7 +98,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
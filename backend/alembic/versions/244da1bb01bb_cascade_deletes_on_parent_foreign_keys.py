@@ -0,0 +1,42 @@
+"""Cascade deletes on parent foreign keys
+
+Revision ID: 244da1bb01bb
+Revises: 26fe8bc15fe5
+Create Date: 2026-10-19 15:59:28.103575
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "244da1bb01bb"
+down_revision: Union[str, None] = "26fe8bc15fe5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table)
+FOREIGN_KEYS = [
+    ("projects", "client_id", "clients"),
+    ("shotlists", "project_id", "projects"),
+    ("shotlist_items", "shotlist_id", "shotlists"),
+]
+
+
+def upgrade() -> None:
+    for table, column, referred in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name, table, referred, [column], ["id"], ondelete="CASCADE"
+        )
+
+
+def downgrade() -> None:
+    for table, column, referred in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(name, table, referred, [column], ["id"])
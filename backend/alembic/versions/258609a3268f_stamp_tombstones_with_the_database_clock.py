@@ -0,0 +1,41 @@
+"""Stamp tombstones with the database clock
+
+Revision ID: 258609a3268f
+Revises: 09955ffd9188
+Create Date: 2026-10-19 17:19:43.752222
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "258609a3268f"
+down_revision: Union[str, None] = "09955ffd9188"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Autogenerate doesn't compare server defaults. Tombstones now take the
+    # same clock as the items' updated_at they are compared with
+    op.alter_column(
+        "shotlist_item_tombstones",
+        "deleted_at",
+        existing_type=sa.DateTime(),
+        existing_nullable=False,
+        server_default=sa.text("timezone('utc', now())"),
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "shotlist_item_tombstones",
+        "deleted_at",
+        existing_type=sa.DateTime(),
+        existing_nullable=False,
+        server_default=None,
+    )
@@ -0,0 +1,47 @@
+"""Store item custom properties as indexed JSONB
+
+Revision ID: 596dcfaa0bdb
+Revises: 94cf94a6f215
+Create Date: 2026-10-19 16:41:49.493546
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "596dcfaa0bdb"
+down_revision: Union[str, None] = "94cf94a6f215"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rewrites every partition
+    op.alter_column(
+        "shotlist_items",
+        "custom_properties",
+        type_=postgresql.JSONB(),
+        postgresql_using="custom_properties::jsonb",
+    )
+    op.create_index(
+        "ix_shotlist_items_custom_properties",
+        "shotlist_items",
+        ["custom_properties"],
+        postgresql_using="gin",
+        postgresql_ops={"custom_properties": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_shotlist_items_custom_properties", table_name="shotlist_items")
+    op.alter_column(
+        "shotlist_items",
+        "custom_properties",
+        type_=sa.JSON(),
+        postgresql_using="custom_properties::json",
+    )
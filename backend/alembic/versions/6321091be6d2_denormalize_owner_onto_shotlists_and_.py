@@ -0,0 +1,144 @@
+"""Denormalize owner onto shotlists and shotlist items
+
+Revision ID: 6321091be6d2
+Revises: 8aeb231efde1
+Create Date: 2026-10-19 15:36:50.622131
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6321091be6d2"
+down_revision: Union[str, None] = "8aeb231efde1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("shotlists", sa.Column("user_id", sa.UUID(), nullable=True))
+    op.add_column("shotlist_items", sa.Column("user_id", sa.UUID(), nullable=True))
+
+    # Backfill from the owning project
+    op.execute(
+        """
+        UPDATE shotlists SET user_id = projects.user_id
+        FROM projects WHERE projects.id = shotlists.project_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE shotlist_items SET user_id = shotlists.user_id
+        FROM shotlists WHERE shotlists.id = shotlist_items.shotlist_id
+        """
+    )
+
+    op.alter_column("shotlists", "user_id", nullable=False)
+    op.alter_column("shotlist_items", "user_id", nullable=False)
+    op.create_index(op.f("ix_shotlists_user_id"), "shotlists", ["user_id"])
+    op.create_index(op.f("ix_shotlist_items_user_id"), "shotlist_items", ["user_id"])
+    op.create_foreign_key(
+        "shotlists_user_id_fkey", "shotlists", "users", ["user_id"], ["id"]
+    )
+    op.create_foreign_key(
+        "shotlist_items_user_id_fkey", "shotlist_items", "users", ["user_id"], ["id"]
+    )
+
+    # Keep the copies in sync when a project changes owner or a shotlist/item
+    # moves to a different parent
+    op.execute(
+        """
+        CREATE FUNCTION propagate_project_owner() RETURNS trigger AS $$
+        BEGIN
+            UPDATE shotlists SET user_id = NEW.user_id WHERE project_id = NEW.id;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER projects_propagate_owner
+        AFTER UPDATE OF user_id ON projects
+        FOR EACH ROW WHEN (OLD.user_id IS DISTINCT FROM NEW.user_id)
+        EXECUTE FUNCTION propagate_project_owner()
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION inherit_shotlist_owner() RETURNS trigger AS $$
+        BEGIN
+            SELECT user_id INTO NEW.user_id FROM projects WHERE id = NEW.project_id;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER shotlists_inherit_owner
+        BEFORE UPDATE OF project_id ON shotlists
+        FOR EACH ROW WHEN (OLD.project_id IS DISTINCT FROM NEW.project_id)
+        EXECUTE FUNCTION inherit_shotlist_owner()
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION propagate_shotlist_owner() RETURNS trigger AS $$
+        BEGIN
+            UPDATE shotlist_items SET user_id = NEW.user_id
+            WHERE shotlist_id = NEW.id;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER shotlists_propagate_owner
+        AFTER UPDATE OF user_id, project_id ON shotlists
+        FOR EACH ROW WHEN (OLD.user_id IS DISTINCT FROM NEW.user_id)
+        EXECUTE FUNCTION propagate_shotlist_owner()
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION inherit_item_owner() RETURNS trigger AS $$
+        BEGIN
+            SELECT user_id INTO NEW.user_id FROM shotlists WHERE id = NEW.shotlist_id;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER shotlist_items_inherit_owner
+        BEFORE UPDATE OF shotlist_id ON shotlist_items
+        FOR EACH ROW WHEN (OLD.shotlist_id IS DISTINCT FROM NEW.shotlist_id)
+        EXECUTE FUNCTION inherit_item_owner()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER shotlist_items_inherit_owner ON shotlist_items")
+    op.execute("DROP FUNCTION inherit_item_owner()")
+    op.execute("DROP TRIGGER shotlists_propagate_owner ON shotlists")
+    op.execute("DROP FUNCTION propagate_shotlist_owner()")
+    op.execute("DROP TRIGGER shotlists_inherit_owner ON shotlists")
+    op.execute("DROP FUNCTION inherit_shotlist_owner()")
+    op.execute("DROP TRIGGER projects_propagate_owner ON projects")
+    op.execute("DROP FUNCTION propagate_project_owner()")
+    op.drop_constraint(
+        "shotlist_items_user_id_fkey", "shotlist_items", type_="foreignkey"
+    )
+    op.drop_constraint("shotlists_user_id_fkey", "shotlists", type_="foreignkey")
+    op.drop_index(op.f("ix_shotlist_items_user_id"), table_name="shotlist_items")
+    op.drop_index(op.f("ix_shotlists_user_id"), table_name="shotlists")
+    op.drop_column("shotlist_items", "user_id")
+    op.drop_column("shotlists", "user_id")
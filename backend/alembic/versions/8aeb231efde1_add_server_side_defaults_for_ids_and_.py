@@ -0,0 +1,37 @@
+"""Add server-side defaults for ids and timestamps
+
+Revision ID: 8aeb231efde1
+Revises: 1d9cbd327217
+Create Date: 2026-10-19 15:36:16.618543
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8aeb231efde1"
+down_revision: Union[str, None] = "1d9cbd327217"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ["users", "clients", "projects", "shotlists", "shotlist_items"]
+UTC_NOW = sa.text("timezone('utc', now())")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=sa.text("gen_random_uuid()"))
+        op.alter_column(table, "created_at", server_default=UTC_NOW)
+        op.alter_column(table, "updated_at", server_default=UTC_NOW)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, "updated_at", server_default=None)
+        op.alter_column(table, "created_at", server_default=None)
+        op.alter_column(table, "id", server_default=None)
@@ -0,0 +1,135 @@
+"""Hash partition shotlist items by shotlist
+
+Revision ID: 94cf94a6f215
+Revises: e12e61790135
+Create Date: 2026-10-19 16:19:51.152809
+
+Postgres can't partition a table in place, so this copies shotlist_items into
+a new table and swaps it in. The copy holds an exclusive lock on the table and
+recomputes every search vector; on a large install run it in a maintenance
+window.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "94cf94a6f215"
+down_revision: Union[str, None] = "e12e61790135"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS = 16
+
+LIVE = sa.text("deleted_at IS NULL")
+
+
+def rebuild(partitioned: bool) -> None:
+    """Replace shotlist_items with a copy, partitioned or not, and recreate
+    its keys, indexes and trigger"""
+    bind = op.get_bind()
+    columns = ", ".join(
+        bind.execute(
+            sa.text(
+                "SELECT quote_ident(column_name) FROM information_schema.columns "
+                "WHERE table_schema = current_schema() "
+                "AND table_name = 'shotlist_items' AND is_generated = 'NEVER' "
+                "ORDER BY ordinal_position"
+            )
+        ).scalars()
+    )
+
+    op.execute(
+        "CREATE TABLE shotlist_items_rebuilt "
+        "(LIKE shotlist_items INCLUDING DEFAULTS INCLUDING GENERATED)"
+        + (" PARTITION BY HASH (shotlist_id)" if partitioned else "")
+    )
+    if partitioned:
+        for remainder in range(PARTITIONS):
+            op.execute(
+                f"CREATE TABLE shotlist_items_p{remainder} "
+                "PARTITION OF shotlist_items_rebuilt "
+                f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+            )
+    op.execute(
+        f"INSERT INTO shotlist_items_rebuilt ({columns}) "
+        f"SELECT {columns} FROM shotlist_items"
+    )
+    # Takes the old indexes, constraints, trigger and partitions with it
+    op.execute("DROP TABLE shotlist_items")
+    op.rename_table("shotlist_items_rebuilt", "shotlist_items")
+
+    # Keys and indexes are built after the copy, which is much faster than
+    # maintaining them row by row. A partitioned table's primary key must
+    # include the partition key
+    op.create_primary_key(
+        "shotlist_items_pkey",
+        "shotlist_items",
+        ["id", "shotlist_id"] if partitioned else ["id"],
+    )
+    op.create_foreign_key(
+        "shotlist_items_shotlist_id_fkey",
+        "shotlist_items",
+        "shotlists",
+        ["shotlist_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_foreign_key(
+        "shotlist_items_user_id_fkey", "shotlist_items", "users", ["user_id"], ["id"]
+    )
+    op.create_index("ix_shotlist_items_user_id", "shotlist_items", ["user_id"])
+    op.create_index(
+        "ix_shotlist_items_shotlist_updated",
+        "shotlist_items",
+        ["shotlist_id", "updated_at"],
+    )
+    op.create_index(
+        "ix_shotlist_items_shotlist_order",
+        "shotlist_items",
+        ["shotlist_id", "order_index"],
+        postgresql_where=LIVE,
+    )
+    op.create_index(
+        "ix_shotlist_items_deleted",
+        "shotlist_items",
+        ["deleted_at"],
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_shotlist_items_search",
+        "shotlist_items",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    # Only where 05af9147a381 could install pg_trgm
+    if bind.execute(
+        sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    ).scalar():
+        op.create_index(
+            "ix_shotlist_items_shot_name_trgm",
+            "shotlist_items",
+            ["shot_name"],
+            postgresql_using="gin",
+            postgresql_ops={"shot_name": "gin_trgm_ops"},
+        )
+    op.execute(
+        """
+        CREATE TRIGGER shotlist_items_inherit_owner
+        BEFORE UPDATE OF shotlist_id ON shotlist_items
+        FOR EACH ROW WHEN (OLD.shotlist_id IS DISTINCT FROM NEW.shotlist_id)
+        EXECUTE FUNCTION inherit_item_owner()
+        """
+    )
+    op.execute("ANALYZE shotlist_items")
+
+
+def upgrade() -> None:
+    rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    rebuild(partitioned=False)
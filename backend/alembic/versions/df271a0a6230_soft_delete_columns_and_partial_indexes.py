@@ -0,0 +1,74 @@
+"""Soft delete columns and partial indexes
+
+Revision ID: df271a0a6230
+Revises: 244da1bb01bb
+Create Date: 2026-10-19 16:07:59.127107
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "df271a0a6230"
+down_revision: Union[str, None] = "244da1bb01bb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["clients", "projects", "shotlists", "shotlist_items"]
+
+LIVE = sa.text("deleted_at IS NULL")
+
+# List indexes that now only cover rows that aren't deleted
+PARTIAL_INDEXES = [
+    (
+        "ix_projects_user_status_shoot_date",
+        "projects",
+        ["user_id", "status", "shoot_date"],
+    ),
+    ("ix_projects_user_shoot_date", "projects", ["user_id", "shoot_date"]),
+    ("ix_projects_user_updated", "projects", ["user_id", "updated_at"]),
+    (
+        "ix_shotlists_project_shooting_date",
+        "shotlists",
+        ["project_id", "shooting_date"],
+    ),
+]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column("deleted_at", sa.DateTime(), nullable=True))
+        # Lets the purger find marked rows without scanning
+        op.create_index(
+            f"ix_{table}_deleted",
+            table,
+            ["deleted_at"],
+            postgresql_where=sa.text("deleted_at IS NOT NULL"),
+        )
+
+    for name, table, columns in PARTIAL_INDEXES:
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, columns, postgresql_where=LIVE)
+    op.create_index("ix_clients_user", "clients", ["user_id"], postgresql_where=LIVE)
+    op.create_index(
+        "ix_shotlist_items_shotlist_order",
+        "shotlist_items",
+        ["shotlist_id", "order_index"],
+        postgresql_where=LIVE,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_shotlist_items_shotlist_order", table_name="shotlist_items")
+    op.drop_index("ix_clients_user", table_name="clients")
+    for name, table, columns in PARTIAL_INDEXES:
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, columns)
+
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_deleted", table_name=table)
+        op.drop_column(table, "deleted_at")
@@ -3,10 +3,11 @@ from sqlalchemy import and_
 from sqlalchemy.orm import Session
 from starlette.responses import RedirectResponse
 from app.core.oauth import oauth
-from app.db.database import get_db
+from app.db.database import get_db, read_only
 from app.models.user import User
 from app.core.config import settings
 from app.schemas.user import User as UserSchema
+from app.core.query_budget import query_budget
 
 router = APIRouter()
 
@@ -19,6 +20,7 @@ async def login_google(request: Request):
 
 
 @router.get("/google/callback")
+@query_budget(2)
 async def auth_google_callback(request: Request, db: Session = Depends(get_db)):
     try:
         token = await oauth.google.authorize_access_token(request)
@@ -72,6 +74,8 @@ async def logout(request: Request):
 
 
 @router.get("/me", response_model=UserSchema)
+@query_budget(1)
+@read_only
 async def get_current_user(request: Request, db: Session = Depends(get_db)):
     user_id = request.session.get("user_id")
     if not user_id:
@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
+from app.db.database import get_db, read_only
+from app.schemas.calendar import CalendarFeeds
+from app.models.user import User
+from app.api.endpoints.auth import get_current_user
+from app.core.config import settings
+from app.services import calendar as calendar_service
+from app.core.query_budget import query_budget
+
+router = APIRouter()
+
+
+def feed_urls(request: Request, token: Optional[str]) -> CalendarFeeds:
+    if token is None:
+        return CalendarFeeds()
+    project_url = str(
+        request.url_for("read_project_feed", token=token, project_id="PROJECT_ID")
+    )
+    return CalendarFeeds(
+        token=token,
+        url=str(request.url_for("read_user_feed", token=token)),
+        project_url=project_url.replace("PROJECT_ID", "{project_id}"),
+    )
+
+
+@router.get("/", response_model=CalendarFeeds)
+@query_budget(1)
+@read_only
+def read_calendar_feeds(
+    request: Request, current_user: User = Depends(get_current_user)
+):
+    """Your calendar feed URLs, once a token has been issued"""
+    return feed_urls(request, current_user.calendar_token)
+
+
+@router.post("/token", response_model=CalendarFeeds)
+@query_budget(2)
+def rotate_calendar_token(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Issue a new feed token; URLs with the old one stop working"""
+    token = calendar_service.rotate_calendar_token(db, current_user.id)
+    return feed_urls(request, token)
+
+
+@router.delete("/token")
+@query_budget(2)
+def revoke_calendar_token(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    calendar_service.revoke_calendar_token(db, current_user.id)
+    return {"detail": "Calendar feeds revoked"}
+
+
+def feed_response(
+    request: Request, db: Session, token: str, project_id: Optional[UUID] = None
+) -> Response:
+    # Feeds are fetched by calendar apps without a session; the token in the
+    # URL is the only credential
+    user = calendar_service.get_user_by_calendar_token(db, token)
+    if user is None:
+        raise HTTPException(status_code=404, detail="Calendar not found")
+
+    etag = calendar_service.feed_etag(db, user.id, project_id)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.CALENDAR_FEED_MAX_AGE_SECONDS}",
+    }
+    if calendar_service.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = calendar_service.get_feed(db, user.id, etag, project_id)
+    return Response(
+        content=body, media_type="text/calendar; charset=utf-8", headers=headers
+    )
+
+
+@router.get("/{token}.ics", response_class=Response)
+@query_budget(4)
+@read_only
+def read_user_feed(token: str, request: Request, db: Session = Depends(get_db)):
+    """Shoot days across all your projects, as iCalendar"""
+    return feed_response(request, db, token)
+
+
+@router.get("/{token}/projects/{project_id}.ics", response_class=Response)
+@query_budget(4)
+@read_only
+def read_project_feed(
+    token: str, project_id: UUID, request: Request, db: Session = Depends(get_db)
+):
+    """One project's shoot days, as iCalendar"""
+    return feed_response(request, db, token, project_id)
@@ -2,16 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
-from app.db.database import get_db
+from app.db.database import get_db, read_only
 from app.schemas.client import Client, ClientCreate, ClientUpdate, ClientWithProjects
 from app.models.user import User
 from app.api.endpoints.auth import get_current_user
 from app.services import clients as client_service
+from app.core.query_budget import query_budget
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[Client])
+@query_budget(2)
+@read_only
 def read_clients(
     skip: int = 0,
     limit: int = 100,
@@ -25,6 +28,7 @@ def read_clients(
 
 
 @router.post("/", response_model=Client)
+@query_budget(2)
 def create_client(
     client: ClientCreate,
     db: Session = Depends(get_db),
@@ -34,6 +38,8 @@ def create_client(
 
 
 @router.get("/{client_id}", response_model=ClientWithProjects)
+@query_budget(3)
+@read_only
 def read_client(
     client_id: UUID,
     db: Session = Depends(get_db),
@@ -48,32 +54,30 @@ def read_client(
 
 
 @router.put("/{client_id}", response_model=Client)
+@query_budget(2)
 def update_client(
     client_id: UUID,
     client: ClientUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    db_client = client_service.get_client(
-        db, client_id=client_id, user_id=current_user.id
+    db_client = client_service.update_client(
+        db=db, client_id=client_id, client=client, user_id=current_user.id
     )
     if db_client is None:
         raise HTTPException(status_code=404, detail="Client not found")
-    return client_service.update_client(
-        db=db, client_id=client_id, client=client, user_id=current_user.id
-    )
+    return db_client
 
 
 @router.delete("/{client_id}")
+@query_budget(2)
 def delete_client(
     client_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    db_client = client_service.get_client(
-        db, client_id=client_id, user_id=current_user.id
-    )
-    if db_client is None:
+    if not client_service.delete_client(
+        db=db, client_id=client_id, user_id=current_user.id
+    ):
         raise HTTPException(status_code=404, detail="Client not found")
-    client_service.delete_client(db=db, client_id=client_id, user_id=current_user.id)
     return {"detail": "Client deleted successfully"}
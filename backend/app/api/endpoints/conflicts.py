@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date, datetime, timedelta
+from app.db.database import get_db, read_only
+from app.schemas.conflict import Conflicts
+from app.models.user import User
+from app.api.endpoints.auth import get_current_user
+from app.services import conflicts as conflict_service
+from app.core.query_budget import query_budget
+
+router = APIRouter()
+
+DEFAULT_RANGE_DAYS = 90
+MAX_RANGE_DAYS = 366
+
+
+@router.get("/", response_model=Conflicts)
+@query_budget(3)
+@read_only
+def read_conflicts(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Locations double-booked across your shotlists between two shooting
+    dates (default: the next 90 days)"""
+    date_from = date_from or datetime.utcnow().date()
+    date_to = date_to or date_from + timedelta(days=DEFAULT_RANGE_DAYS)
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to is before date_from")
+    if date_to - date_from > timedelta(days=MAX_RANGE_DAYS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range can't be longer than {MAX_RANGE_DAYS} days",
+        )
+
+    return conflict_service.find_conflicts(
+        db, user_id=current_user.id, date_from=date_from, date_to=date_to
+    )
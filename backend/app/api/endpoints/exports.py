@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from uuid import UUID
+from app.db.database import get_db, read_only
+from app.models.user import User
+from app.api.endpoints.auth import get_current_user
+from app.services import exports as export_service
+from app.services import shotlists as shotlist_service
+from app.services import projects as project_service
+from app.services.exports import ExportFormat
+from app.core.query_budget import query_budget
+
+router = APIRouter()
+
+
+def _export_response(db: Session, export_format: ExportFormat, name: str, **scope):
+    filename = export_service.export_filename(name, export_format)
+    return StreamingResponse(
+        export_service.stream_export(db.get_bind(), export_format, name, **scope),
+        media_type=export_service.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/shotlists/{shotlist_id}/export.{export_format}")
+@query_budget(2)
+@read_only
+def export_shotlist(
+    shotlist_id: UUID,
+    export_format: ExportFormat,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    db_shotlist = shotlist_service.get_shotlist(
+        db, shotlist_id=shotlist_id, user_id=current_user.id
+    )
+    if db_shotlist is None:
+        raise HTTPException(status_code=404, detail="Shotlist not found")
+
+    return _export_response(
+        db, export_format, db_shotlist.name, shotlist_id=shotlist_id
+    )
+
+
+@router.get("/projects/{project_id}/export.{export_format}")
+@query_budget(2)
+@read_only
+def export_project(
+    project_id: UUID,
+    export_format: ExportFormat,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    db_project = project_service.get_project(
+        db, project_id=project_id, user_id=current_user.id
+    )
+    if db_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    return _export_response(db, export_format, db_project.name, project_id=project_id)
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+from app.db.database import get_db, read_only
+from app.schemas.job import Job, JobStatus
+from app.models.user import User
+from app.api.endpoints.auth import get_current_user
+from app.services import jobs as job_service
+from app.core.query_budget import query_budget
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Job])
+@query_budget(2)
+@read_only
+def read_jobs(
+    status: Optional[JobStatus] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return job_service.get_user_jobs(
+        db, user_id=current_user.id, status=status, skip=skip, limit=limit
+    )
+
+
+@router.get("/{job_id}", response_model=Job)
+@query_budget(2)
+@read_only
+def read_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    db_job = job_service.get_job(db, job_id=job_id, user_id=current_user.id)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return db_job
@@ -1,27 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import date, datetime
 from uuid import UUID
-from app.db.database import get_db
+from app.db.database import get_db, read_only
 from app.schemas.project import (
     Project,
     ProjectCreate,
+    ProjectFilters,
+    ProjectSort,
+    ProjectStatus,
     ProjectUpdate,
     ProjectWithShotlists,
 )
+from app.schemas.summary import DashboardSummary, ProjectSummary
 from app.models.user import User
 from app.api.endpoints.auth import get_current_user
 from app.services import projects as project_service
 from app.services import clients as client_service
+from app.services import summaries as summary_service
+from app.core.query_budget import query_budget
 
 router = APIRouter()
 
 
+def project_filters(
+    status: Optional[List[ProjectStatus]] = Query(None),
+    shoot_date_from: Optional[date] = None,
+    shoot_date_to: Optional[date] = None,
+    location: Optional[str] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    sort: Optional[ProjectSort] = None,
+) -> ProjectFilters:
+    return ProjectFilters(
+        status=status,
+        shoot_date_from=shoot_date_from,
+        shoot_date_to=shoot_date_to,
+        location=location,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        sort=sort,
+    )
+
+
 @router.get("/", response_model=List[Project])
+@query_budget(3)
+@read_only
 def read_projects(
     skip: int = 0,
     limit: int = 100,
     client_id: Optional[UUID] = None,
+    filters: ProjectFilters = Depends(project_filters),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -34,16 +64,17 @@ def read_projects(
                 detail="Client not found",
             )
         projects = project_service.get_client_projects(
-            db, client_id=client_id, skip=skip, limit=limit
+            db, client_id=client_id, skip=skip, limit=limit, filters=filters
         )
     else:
         projects = project_service.get_user_projects(
-            db, user_id=current_user.id, skip=skip, limit=limit
+            db, user_id=current_user.id, skip=skip, limit=limit, filters=filters
         )
     return projects
 
 
 @router.post("/", response_model=Project)
+@query_budget(2)
 def create_project(
     project: ProjectCreate,
     db: Session = Depends(get_db),
@@ -54,7 +85,19 @@ def create_project(
     )
 
 
+@router.get("/summary", response_model=DashboardSummary)
+@query_budget(2)
+@read_only
+def read_dashboard_summary(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return summary_service.get_dashboard_summary(db, user_id=current_user.id)
+
+
 @router.get("/{project_id}", response_model=ProjectWithShotlists)
+@query_budget(3)
+@read_only
 def read_project(
     project_id: UUID,
     db: Session = Depends(get_db),
@@ -68,10 +111,11 @@ def read_project(
     return db_project
 
 
-@router.put("/{project_id}", response_model=Project)
-def update_project(
+@router.get("/{project_id}/summary", response_model=ProjectSummary)
+@query_budget(3)
+@read_only
+def read_project_summary(
     project_id: UUID,
-    project: ProjectUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -80,23 +124,50 @@ def update_project(
     )
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project_service.update_project(
-        db=db, project_id=project_id, project=project, user_id=current_user.id
+    return summary_service.get_project_summary(db, project_id=project_id)
+
+
+@router.post("/{project_id}/duplicate", response_model=Project)
+@query_budget(3)
+def duplicate_project(
+    project_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    db_project = project_service.duplicate_project(
+        db=db, project_id=project_id, user_id=current_user.id
     )
+    if db_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return db_project
 
 
-@router.delete("/{project_id}")
-def delete_project(
+@router.put("/{project_id}", response_model=Project)
+@query_budget(2)
+def update_project(
     project_id: UUID,
+    project: ProjectUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    db_project = project_service.get_project(
-        db, project_id=project_id, user_id=current_user.id
+    db_project = project_service.update_project(
+        db=db, project_id=project_id, project=project, user_id=current_user.id
     )
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    project_service.delete_project(
+    return db_project
+
+
+@router.delete("/{project_id}")
+@query_budget(2)
+def delete_project(
+    project_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    deleted = project_service.delete_project(
         db=db, project_id=project_id, user_id=current_user.id
     )
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Project not found")
     return {"detail": "Project deleted successfully"}
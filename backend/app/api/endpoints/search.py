@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.db.database import get_db, read_only
+from app.schemas.search import SearchResults, SearchResultType
+from app.models.user import User
+from app.api.endpoints.auth import get_current_user
+from app.services import search as search_service
+from app.core.query_budget import query_budget
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchResults)
+@query_budget(3)
+@read_only
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[List[SearchResultType]] = Query(None, alias="type"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    results, has_more, truncated = search_service.search(
+        db, user_id=current_user.id, q=q, types=types, skip=skip, limit=limit
+    )
+    return {
+        "results": results,
+        "skip": skip,
+        "limit": limit,
+        "has_more": has_more,
+        "truncated": truncated,
+    }
@@ -1,47 +1,174 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    UploadFile,
+    File,
+    Request,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from uuid import UUID
-from app.db.database import get_db
+from app.db.database import get_db, read_only
 from app.schemas.image_response import ImageResponse
+from app.schemas.job import Job
 from app.schemas.shotlist_item import (
     ShotlistItem,
+    ShotlistItemChanges,
     ShotlistItemCreate,
+    ShotlistItemImportResult,
     ShotlistItemUpdate,
     ReorderRequest,
 )
 from app.models.user import User
 from app.api.endpoints.auth import get_current_user
+from app.core.config import settings
+from app.core.events import broker, shotlist_channel
 from app.services import shotlist_items as shotlist_item_service
 from app.services import shotlists as shotlist_service
 from app.services import projects as project_service
-import os
-import uuid
-from PIL import Image
+from app.services import images as image_service
+from app.services import imports as import_service
+from app.services import jobs as job_service
+import asyncio
 import io
+import json
 from app.schemas.shotlist_item import ShotlistItemUpdate
+from app.core.query_budget import query_budget
 
 
 router = APIRouter()
 
 
-@router.get("/shotlists/{shotlist_id}/items", response_model=List[ShotlistItem])
+def properties_filter(
+    properties: Optional[str] = Query(
+        None,
+        description="Only items whose custom properties contain this JSON "
+        'object, e.g. {"lens": "35mm"}',
+    ),
+) -> Optional[dict]:
+    if properties is None:
+        return None
+    try:
+        value = json.loads(properties)
+    except ValueError:
+        value = None
+    if not isinstance(value, dict):
+        raise HTTPException(status_code=400, detail="properties must be a JSON object")
+    return value
+
+
+# Not @read_only: sync tokens come from this server's clock, so a lagging
+# replica would hand out tokens past rows it hasn't replayed yet
+@router.get(
+    "/shotlists/{shotlist_id}/items",
+    response_model=Union[List[ShotlistItem], ShotlistItemChanges],
+)
+@query_budget(4)
 def read_shotlist_items(
     shotlist_id: UUID,
+    response: Response,
+    since: Optional[str] = None,
+    properties: Optional[dict] = Depends(properties_filter),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    """List items, or only the changes since a sync token when ``since`` is set.
+
+    Full listings and changes carry the next token in the ``X-Sync-Token``
+    header. ``properties`` narrows a full listing to items whose custom
+    properties contain it; that listing gets no token, since syncing from it
+    would never send the items it left out.
+    """
     db_shotlist = shotlist_service.get_shotlist(
         db, shotlist_id=shotlist_id, user_id=current_user.id
     )
     if db_shotlist is None:
         raise HTTPException(status_code=404, detail="Shotlist not found")
 
-    items = shotlist_item_service.get_shotlist_items(db, shotlist_id=shotlist_id)
+    if since is not None:
+        if properties is not None:
+            raise HTTPException(
+                status_code=400, detail="properties can't be combined with since"
+            )
+        since_time = shotlist_item_service.decode_sync_token(since)
+        if since_time is None:
+            raise HTTPException(status_code=400, detail="Invalid sync token")
+        changes = shotlist_item_service.get_shotlist_item_changes(
+            db, shotlist_id=shotlist_id, since=since_time
+        )
+        response.headers["X-Sync-Token"] = changes["token"]
+        return changes
+
+    if properties is None:
+        response.headers["X-Sync-Token"] = shotlist_item_service.new_sync_token()
+    items = shotlist_item_service.get_shotlist_items(
+        db, shotlist_id=shotlist_id, properties=properties
+    )
     return items
 
 
+@router.get("/shotlist-items", response_model=List[ShotlistItem])
+@query_budget(2)
+@read_only
+def read_items_by_properties(
+    properties: Optional[dict] = Depends(properties_filter),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Your items across all shotlists whose custom properties contain
+    ``properties``, e.g. every shot on the 35mm lens"""
+    if properties is None:
+        raise HTTPException(status_code=400, detail="properties is required")
+    return shotlist_item_service.get_user_items_by_properties(
+        db, user_id=current_user.id, properties=properties, skip=skip, limit=limit
+    )
+
+
+@router.get("/shotlists/{shotlist_id}/events")
+@query_budget(2)
+@read_only
+def stream_shotlist_events(
+    shotlist_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Server-sent events for item changes on a shotlist"""
+    db_shotlist = shotlist_service.get_shotlist(
+        db, shotlist_id=shotlist_id, user_id=current_user.id
+    )
+    if db_shotlist is None:
+        raise HTTPException(status_code=404, detail="Shotlist not found")
+
+    async def event_stream():
+        async with broker.subscribe(shotlist_channel(shotlist_id)) as queue:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(
+                        queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {payload}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/shotlists/{shotlist_id}/items", response_model=ShotlistItem)
+@query_budget(3)
 def create_shotlist_item(
     shotlist_id: UUID,
     item: ShotlistItemCreate,
@@ -55,18 +182,50 @@ def create_shotlist_item(
         raise HTTPException(status_code=404, detail="Shotlist not found")
 
     return shotlist_item_service.create_shotlist_item(
-        db=db, item=item, shotlist_id=shotlist_id
+        db=db, item=item, shotlist_id=shotlist_id, user_id=current_user.id
+    )
+
+
+# Ahead of the item routes, whose {item_id} would otherwise take "reorder"
+@router.put("/shotlists/{shotlist_id}/items/reorder", response_model=List[ShotlistItem])
+@query_budget(6)
+def reorder_shotlist_items(
+    shotlist_id: UUID,
+    reorder_request: ReorderRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    db_shotlist = shotlist_service.get_shotlist(
+        db, shotlist_id=shotlist_id, user_id=current_user.id
+    )
+    if db_shotlist is None:
+        raise HTTPException(status_code=404, detail="Shotlist not found")
+
+    items = shotlist_item_service.reorder_shotlist_items(
+        db=db,
+        shotlist_id=shotlist_id,
+        reorder_request=reorder_request,
+        call_time=db_shotlist.call_time,
+        user_id=current_user.id,
     )
+    return items
 
 
+# The routes under /shotlists/{shotlist_id}/items/ are the ones to use: the
+# item table is partitioned by shotlist, and without it /shotlist-items/{id}
+# has to look in every partition (as ?shotlist_id= can tell it not to)
+@router.get("/shotlists/{shotlist_id}/items/{item_id}", response_model=ShotlistItem)
 @router.get("/shotlist-items/{item_id}", response_model=ShotlistItem)
+@query_budget(2)
+@read_only
 def read_shotlist_item(
     item_id: UUID,
+    shotlist_id: Optional[UUID] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     db_item = shotlist_item_service.get_shotlist_item(
-        db, item_id=item_id, user_id=current_user.id
+        db, item_id=item_id, user_id=current_user.id, shotlist_id=shotlist_id
     )
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
@@ -74,46 +233,54 @@ def read_shotlist_item(
     return db_item
 
 
+@router.put("/shotlists/{shotlist_id}/items/{item_id}", response_model=ShotlistItem)
 @router.put("/shotlist-items/{item_id}", response_model=ShotlistItem)
+@query_budget(2)
 def update_shotlist_item(
     item_id: UUID,
     item: ShotlistItemUpdate,
+    shotlist_id: Optional[UUID] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    db_item = shotlist_item_service.get_shotlist_item(
-        db, item_id=item_id, user_id=current_user.id
+    db_item = shotlist_item_service.update_shotlist_item(
+        db=db,
+        item_id=item_id,
+        item=item,
+        user_id=current_user.id,
+        shotlist_id=shotlist_id,
     )
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    return shotlist_item_service.update_shotlist_item(
-        db=db, item_id=item_id, item=item, user_id=current_user.id
-    )
+    return db_item
 
 
+@router.delete("/shotlists/{shotlist_id}/items/{item_id}")
 @router.delete("/shotlist-items/{item_id}")
+@query_budget(5)
 def delete_shotlist_item(
     item_id: UUID,
+    shotlist_id: Optional[UUID] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    db_item = shotlist_item_service.get_shotlist_item(
-        db, item_id=item_id, user_id=current_user.id
+    deleted = shotlist_item_service.delete_shotlist_item(
+        db=db, item_id=item_id, user_id=current_user.id, shotlist_id=shotlist_id
     )
-    if db_item is None:
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    shotlist_item_service.delete_shotlist_item(
-        db=db, item_id=item_id, user_id=current_user.id
-    )
     return {"detail": "Item deleted successfully"}
 
 
-@router.put("/shotlists/{shotlist_id}/items/reorder", response_model=List[ShotlistItem])
-def reorder_shotlist_items(
+@router.post(
+    "/shotlists/{shotlist_id}/items/import", response_model=ShotlistItemImportResult
+)
+@query_budget(6)
+def import_shotlist_items(
     shotlist_id: UUID,
-    reorder_request: ReorderRequest,
+    file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -123,25 +290,45 @@ def reorder_shotlist_items(
     if db_shotlist is None:
         raise HTTPException(status_code=404, detail="Shotlist not found")
 
-    items = shotlist_item_service.reorder_shotlist_items(
-        db=db,
-        shotlist_id=shotlist_id,
-        reorder_request=reorder_request,
-        call_time=db_shotlist.call_time,
-        user_id=current_user.id,
-    )
-    return items
-
-
-@router.post("/shotlist-items/{item_id}/upload-image", response_model=ImageResponse)
+    # Parse straight from the spooled upload instead of reading it into memory
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_service.import_shotlist_items(
+            db, shotlist_id=shotlist_id, user_id=current_user.id, lines=lines
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded CSV")
+    except import_service.CSVFormatError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid CSV: {e}")
+    except import_service.TooManyRowsError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+
+@router.post(
+    "/shotlists/{shotlist_id}/items/{item_id}/upload-image",
+    response_model=ImageResponse,
+    responses={202: {"model": Job, "description": "Queued with background=true"}},
+)
+@router.post(
+    "/shotlist-items/{item_id}/upload-image",
+    response_model=ImageResponse,
+    responses={202: {"model": Job, "description": "Queued with background=true"}},
+)
+@query_budget(3)
 async def upload_image(
     item_id: UUID,
+    shotlist_id: Optional[UUID] = None,
     file: UploadFile = File(...),
+    background: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    db_item = shotlist_item_service.get_shotlist_item(
-        db, item_id=item_id, user_id=current_user.id
+    db_item = await run_in_threadpool(
+        shotlist_item_service.get_shotlist_item,
+        db,
+        item_id=item_id,
+        user_id=current_user.id,
+        shotlist_id=shotlist_id,
     )
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
@@ -160,62 +347,43 @@ async def upload_image(
             detail=f"File too large. Maximum size is 3MB",
         )
 
-    # Process the image with PIL
-    try:
-        image = Image.open(io.BytesIO(contents))
-
-        # Convert to RGB if necessary (handles PNG with transparency, etc.)
-        if image.mode != "RGB":
-            image = image.convert("RGB")
-
-        # Determine target size based on original image aspect ratio
-        original_width, original_height = image.size
-        aspect_ratio = original_width / original_height
-
-        # Choose target format based on aspect ratio
-        if aspect_ratio > 1.5:  # Wide image -> 16:9
-            target_size = (1920, 1080)
-        elif aspect_ratio < 0.75:  # Tall image -> 9:16
-            target_size = (1080, 1920)
-        else:  # Square-ish image -> 1:1
-            target_size = (1080, 1080)
-
-        # Calculate resize dimensions to fit within target while maintaining aspect ratio
-        image.thumbnail(target_size, Image.Resampling.LANCZOS)
-
-        # Create a new image with target size and white background
-        new_image = Image.new("RGB", target_size, (255, 255, 255))
-
-        # Calculate position to center the resized image
-        x = (target_size[0] - image.size[0]) // 2
-        y = (target_size[1] - image.size[1]) // 2
-
-        # Paste the resized image onto the center of the new image
-        new_image.paste(image, (x, y))
-
-        # Generate unique filename
-        file_extension = ".jpg"  # Always save as JPG for consistency
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-
-        # Ensure uploads directory exists
-        uploads_dir = "static/uploads"
-        os.makedirs(uploads_dir, exist_ok=True)
-
-        # Save the processed image
-        file_path = os.path.join(uploads_dir, unique_filename)
-        new_image.save(file_path, "JPEG", quality=85, optimize=True)
-
-        # Create URL for the image
-        image_url = f"/static/uploads/{unique_filename}"
+    # Hand the image to the job queue and let the client poll the job
+    if background:
+        path = await run_in_threadpool(image_service.stage_upload, contents)
+        db_job = await run_in_threadpool(
+            job_service.enqueue_job,
+            db,
+            "image.process",
+            payload={
+                "path": path,
+                "item_id": str(item_id),
+                "shotlist_id": str(db_item.shotlist_id),
+                "user_id": str(current_user.id),
+            },
+            user_id=current_user.id,
+        )
+        return JSONResponse(
+            status_code=202,
+            content=Job.model_validate(db_job).model_dump(mode="json"),
+            headers={"Location": f"/api/jobs/{db_job.id}"},
+        )
 
+    # Process the image on an image worker, keeping the event loop free
+    try:
+        image_url = await image_service.process_in_worker(contents)
     except Exception as e:
         raise HTTPException(
             status_code=400, detail="Error processing image. Please try again."
         )
 
     update_data = ShotlistItemUpdate(shot_reference_image=image_url)
-    updated_item = shotlist_item_service.update_shotlist_item(
-        db=db, item_id=item_id, item=update_data, user_id=current_user.id
+    updated_item = await run_in_threadpool(
+        shotlist_item_service.update_shotlist_item,
+        db=db,
+        item_id=item_id,
+        item=update_data,
+        user_id=current_user.id,
+        shotlist_id=db_item.shotlist_id,
     )
 
     return {"url": image_url}
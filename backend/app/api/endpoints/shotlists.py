@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import date, datetime
 from uuid import UUID
-from app.db.database import get_db
+from app.db.database import get_db, read_only
 from app.schemas.shotlist import (
     Shotlist,
     ShotlistCreate,
+    ShotlistFilters,
+    ShotlistSort,
     ShotlistUpdate,
     ShotlistWithItems,
 )
@@ -13,15 +16,37 @@ from app.models.user import User
 from app.api.endpoints.auth import get_current_user
 from app.services import shotlists as shotlist_service
 from app.services import projects as project_service
+from app.core.query_budget import query_budget
 
 router = APIRouter()
 
 
+def shotlist_filters(
+    shooting_date_from: Optional[date] = None,
+    shooting_date_to: Optional[date] = None,
+    location: Optional[str] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    sort: Optional[ShotlistSort] = None,
+) -> ShotlistFilters:
+    return ShotlistFilters(
+        shooting_date_from=shooting_date_from,
+        shooting_date_to=shooting_date_to,
+        location=location,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        sort=sort,
+    )
+
+
 @router.get("/projects/{project_id}/shotlists", response_model=List[Shotlist])
+@query_budget(3)
+@read_only
 def read_shotlists(
     project_id: UUID,
     skip: int = 0,
     limit: int = 100,
+    filters: ShotlistFilters = Depends(shotlist_filters),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -32,12 +57,13 @@ def read_shotlists(
         raise HTTPException(status_code=404, detail="Project not found")
 
     shotlists = shotlist_service.get_project_shotlists(
-        db, project_id=project_id, skip=skip, limit=limit
+        db, project_id=project_id, skip=skip, limit=limit, filters=filters
     )
     return shotlists
 
 
 @router.post("/projects/{project_id}/shotlists", response_model=Shotlist)
+@query_budget(3)
 def create_shotlist(
     project_id: UUID,
     shotlist: ShotlistCreate,
@@ -51,11 +77,13 @@ def create_shotlist(
         raise HTTPException(status_code=404, detail="Project not found")
 
     return shotlist_service.create_shotlist(
-        db=db, shotlist=shotlist, project_id=project_id
+        db=db, shotlist=shotlist, project_id=project_id, user_id=current_user.id
     )
 
 
 @router.get("/shotlists/{shotlist_id}", response_model=ShotlistWithItems)
+@query_budget(3)
+@read_only
 def read_shotlist(
     shotlist_id: UUID,
     db: Session = Depends(get_db),
@@ -70,37 +98,49 @@ def read_shotlist(
     return db_shotlist
 
 
+@router.post("/shotlists/{shotlist_id}/duplicate", response_model=Shotlist)
+@query_budget(3)
+def duplicate_shotlist(
+    shotlist_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    db_shotlist = shotlist_service.duplicate_shotlist(
+        db=db, shotlist_id=shotlist_id, user_id=current_user.id
+    )
+    if db_shotlist is None:
+        raise HTTPException(status_code=404, detail="Shotlist not found")
+    return db_shotlist
+
+
 @router.put("/shotlists/{shotlist_id}", response_model=Shotlist)
+@query_budget(2)
 def update_shotlist(
     shotlist_id: UUID,
     shotlist: ShotlistUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    db_shotlist = shotlist_service.get_shotlist(
-        db, shotlist_id=shotlist_id, user_id=current_user.id
+    db_shotlist = shotlist_service.update_shotlist(
+        db=db, shotlist_id=shotlist_id, shotlist=shotlist, user_id=current_user.id
     )
     if db_shotlist is None:
         raise HTTPException(status_code=404, detail="Shotlist not found")
 
-    return shotlist_service.update_shotlist(
-        db=db, shotlist_id=shotlist_id, shotlist=shotlist, user_id=current_user.id
-    )
+    return db_shotlist
 
 
 @router.delete("/shotlists/{shotlist_id}")
+@query_budget(2)
 def delete_shotlist(
     shotlist_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    db_shotlist = shotlist_service.get_shotlist(
-        db, shotlist_id=shotlist_id, user_id=current_user.id
+    deleted = shotlist_service.delete_shotlist(
+        db=db, shotlist_id=shotlist_id, user_id=current_user.id
     )
-    if db_shotlist is None:
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Shotlist not found")
 
-    shotlist_service.delete_shotlist(
-        db=db, shotlist_id=shotlist_id, user_id=current_user.id
-    )
     return {"detail": "Shotlist deleted successfully"}
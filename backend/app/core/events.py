@@ -0,0 +1,202 @@
+"""Publish/subscribe for shotlist change events.
+
+Service write paths publish compact events on the same session that performs
+the write, so an event is only delivered when its transaction commits.
+Subscribers (the SSE endpoint) receive them through an in-process broker; the
+backend decides how events travel between worker processes.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PG_CHANNEL = "shotlist_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+PG_MAX_NOTIFY_BYTES = 7999
+SUBSCRIBER_QUEUE_SIZE = 256
+RESYNC = json.dumps({"type": "resync"})
+
+Deliver = Callable[[str, str], None]
+
+
+def shotlist_channel(shotlist_id: UUID) -> str:
+    return f"shotlist:{shotlist_id}"
+
+
+class LocalBackend:
+    """Delivers events to subscribers in this process only, after commit."""
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_soft_rollback", self._after_rollback)
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def stop(self):
+        self._deliver = None
+
+    def publish(self, db: Session, channel: str, payload: str):
+        db.info.setdefault("pending_events", []).append((channel, payload))
+
+    def _after_commit(self, session: Session):
+        pending = session.info.pop("pending_events", None)
+        if pending and self._deliver:
+            for channel, payload in pending:
+                self._deliver(channel, payload)
+
+    def _after_rollback(self, session: Session, previous_transaction):
+        session.info.pop("pending_events", None)
+
+
+class PostgresBackend:
+    """Fans events out across workers with LISTEN/NOTIFY.
+
+    NOTIFY is issued inside the writing transaction, so Postgres only delivers
+    it on commit. Every worker (including the publisher) LISTENs on a dedicated
+    connection and hands notifications to its local broker. Events too large
+    for a NOTIFY are sent as ``resync``, telling subscribers to refetch.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._deliver: Optional[Deliver] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._listen, name="shotlist-events-listener", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self):
+        self._stopping.set()
+        if self._thread:
+            await asyncio.to_thread(self._thread.join, 5)
+            self._thread = None
+
+    def publish(self, db: Session, channel: str, payload: str):
+        message = json.dumps({"c": channel, "p": payload})
+        if len(message.encode()) > PG_MAX_NOTIFY_BYTES:
+            # An item with long text or large custom properties doesn't fit;
+            # failing the write over it would be worse than a refetch
+            message = json.dumps({"c": channel, "p": RESYNC})
+        db.execute(
+            text("SELECT pg_notify(:pg_channel, :message)"),
+            {"pg_channel": PG_CHANNEL, "message": message},
+        )
+
+    def _listen(self):
+        while not self._stopping.is_set():
+            try:
+                self._listen_once()
+            except Exception:
+                logger.exception("Event listener connection failed, reconnecting")
+                self._stopping.wait(2)
+
+    def _listen_once(self):
+        # Detach so the long-lived LISTEN connection does not hold a pool slot
+        pooled = self.engine.raw_connection()
+        conn = pooled.driver_connection
+        pooled.detach()
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {PG_CHANNEL}")
+            while not self._stopping.is_set():
+                if select.select([conn], [], [], 1.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    message = json.loads(notify.payload)
+                    if self._deliver:
+                        self._deliver(message["c"], message["p"])
+        finally:
+            conn.close()
+
+
+class EventBroker:
+    def __init__(self, backend):
+        self.backend = backend
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        await self.backend.start(self._deliver)
+
+    async def stop(self):
+        await self.backend.stop()
+        self._loop = None
+
+    def publish(self, db: Session, channel: str, event_data: Dict[str, Any]):
+        """Queue an event on ``db``; it is delivered once ``db`` commits."""
+        if self._loop is None:
+            return
+        self.backend.publish(db, channel, json.dumps(event_data, default=str))
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[channel].discard(queue)
+            if not self._subscribers[channel]:
+                del self._subscribers[channel]
+
+    def _deliver(self, channel: str, payload: str):
+        # Called from request threads and the listener thread
+        loop = self._loop
+        if loop is not None and channel in self._subscribers:
+            loop.call_soon_threadsafe(self._fanout, channel, payload)
+
+    def _fanout(self, channel: str, payload: str):
+        for queue in list(self._subscribers.get(channel, ())):
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                # Slow consumer: tell it to refetch instead of growing unbounded
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+
+def _create_backend():
+    if settings.EVENTS_BACKEND == "postgres":
+        from app.db.database import engine
+
+        return PostgresBackend(engine)
+    return LocalBackend()
+
+
+broker = EventBroker(_create_backend())
+
+
+def publish_shotlist_event(
+    db: Session, shotlist_id: UUID, event_type: str, **data: Any
+):
+    broker.publish(
+        db,
+        shotlist_channel(shotlist_id),
+        {"type": event_type, "shotlist_id": str(shotlist_id), **data},
+    )
@@ -0,0 +1,82 @@
+"""Background database probe whose cached result backs the readiness check.
+
+Probes run on an interval in a worker thread, so health endpoints never touch
+the database themselves and a slow database can't stall the event loop.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+def _ping():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+class DatabaseProbe:
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.healthy = False
+        self.detail = "not checked yet"
+        self.checked_at: Optional[float] = None
+        self.latency: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Future] = None
+
+    async def check(self):
+        # A ping stuck past its timeout keeps its thread; don't pile up more
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(asyncio.to_thread(_ping))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._inflight), self.timeout)
+            self.healthy, self.detail = True, "healthy"
+        except asyncio.TimeoutError:
+            self.healthy = False
+            self.detail = f"unhealthy: no response within {self.timeout}s"
+        except Exception as e:
+            self.healthy, self.detail = False, f"unhealthy: {str(e)}"
+        self.latency = time.perf_counter() - start
+        self.checked_at = time.time()
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "detail": self.detail,
+            "latency_seconds": self.latency,
+            "age_seconds": (time.time() - self.checked_at if self.checked_at else None),
+        }
+
+
+database_probe = DatabaseProbe(
+    interval=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,246 @@
+"""Durable background jobs stored in Postgres.
+
+Work that is too slow for a request is enqueued as a row in ``jobs`` (see
+app/services/jobs.py) and the request returns 202 with the job's id. Worker
+coroutines started from the app lifespan claim due jobs with
+``FOR UPDATE SKIP LOCKED``, so any number of processes can share the table
+without handing a job out twice, and run the handler in a thread.
+
+Handlers are registered per job type with ``@job_handler``, which also sets
+how many jobs of that type one process runs at a time and how often a job is
+tried. A failed attempt is retried with exponential backoff; raising
+``JobError`` fails the job at once. While a job runs its lock is refreshed;
+a lock older than JOBS_LOCK_TIMEOUT_SECONDS means the worker died, and the
+job is claimed again as a new attempt, or failed if it has none left.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, case, cast, delete, or_, select, update
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class JobError(Exception):
+    """Fails the job without further attempts"""
+
+
+@dataclass
+class JobType:
+    name: str
+    handler: Callable[[dict], Optional[dict]]
+    concurrency: int
+    max_attempts: int
+
+
+registry: Dict[str, JobType] = {}
+
+
+def job_handler(name: str, concurrency: int = 1, max_attempts: int = 3):
+    """Register ``handler(payload) -> result`` for jobs of type ``name``.
+
+    Handlers run in a worker thread and open their own database sessions.
+    """
+
+    def decorator(handler):
+        registry[name] = JobType(name, handler, concurrency, max_attempts)
+        return handler
+
+    return decorator
+
+
+def claim_job(job_type: str) -> Optional[Job]:
+    """Lock the next due job of a type for this worker, if there is one"""
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS)
+    next_job = (
+        select(Job.id)
+        .where(
+            Job.type == job_type,
+            or_(
+                and_(Job.status == JobStatus.QUEUED, Job.run_at <= now),
+                and_(Job.status == JobStatus.RUNNING, Job.locked_at < stale),
+            ),
+        )
+        .order_by(Job.run_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    # A stale job whose last attempt died with its worker is failed as it is
+    # picked, rather than tried forever
+    exhausted = and_(Job.status == JobStatus.RUNNING, Job.attempts >= Job.max_attempts)
+    with SessionLocal(expire_on_commit=False) as db:
+        while True:
+            job = db.scalars(
+                update(Job)
+                .where(Job.id == next_job)
+                .values(
+                    # The enum stores member names; a CASE of them is text
+                    status=cast(
+                        case(
+                            (exhausted, JobStatus.FAILED.name),
+                            else_=JobStatus.RUNNING.name,
+                        ),
+                        Job.status.type,
+                    ),
+                    attempts=case((exhausted, Job.attempts), else_=Job.attempts + 1),
+                    locked_at=case((exhausted, None), else_=now),
+                    finished_at=case((exhausted, now), else_=None),
+                    error=case(
+                        (exhausted, "Worker stopped responding on the last attempt"),
+                        else_=Job.error,
+                    ),
+                )
+                .returning(Job)
+                .execution_options(synchronize_session=False)
+            ).first()
+            db.commit()
+            if job is None or job.status == JobStatus.RUNNING:
+                return job
+            logger.warning("Job %s (%s) failed: %s", job.id, job.type, job.error)
+
+
+def _update_claimed(job: Job, **values) -> bool:
+    # A job reclaimed after a stale lock has moved on to another attempt;
+    # the old worker's writes must not land
+    with SessionLocal() as db:
+        result = db.execute(
+            update(Job)
+            .where(
+                Job.id == job.id,
+                Job.attempts == job.attempts,
+                Job.status == JobStatus.RUNNING,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+
+def heartbeat(job: Job) -> bool:
+    return _update_claimed(job, locked_at=datetime.utcnow())
+
+
+def complete_job(job: Job, result: Optional[dict]):
+    _update_claimed(
+        job,
+        status=JobStatus.SUCCEEDED,
+        result=result,
+        error=None,
+        locked_at=None,
+        finished_at=datetime.utcnow(),
+    )
+
+
+def fail_job(job: Job, error: str, retry: bool):
+    if retry and job.attempts < job.max_attempts:
+        backoff = settings.JOBS_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+        _update_claimed(
+            job,
+            status=JobStatus.QUEUED,
+            error=error,
+            locked_at=None,
+            run_at=datetime.utcnow() + timedelta(seconds=backoff),
+        )
+    else:
+        _update_claimed(
+            job,
+            status=JobStatus.FAILED,
+            error=error,
+            locked_at=None,
+            finished_at=datetime.utcnow(),
+        )
+
+
+def prune_jobs() -> int:
+    """Drop finished jobs past retention; returns how many went"""
+    cutoff = datetime.utcnow() - timedelta(days=settings.JOBS_RETENTION_DAYS)
+    with SessionLocal() as db:
+        result = db.execute(delete(Job).where(Job.finished_at < cutoff))
+        db.commit()
+        return result.rowcount
+
+
+class JobRunner:
+    def __init__(self, poll_interval: float, lock_timeout: float):
+        self.poll_interval = poll_interval
+        # Refresh locks well before they would be taken for stale
+        self.heartbeat_interval = lock_timeout / 3
+        self._tasks: List[asyncio.Task] = []
+
+    async def run_job(self, job_type: JobType, job: Job):
+        task = asyncio.ensure_future(asyncio.to_thread(job_type.handler, job.payload))
+        try:
+            while True:
+                try:
+                    result = await asyncio.wait_for(
+                        asyncio.shield(task), self.heartbeat_interval
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    if not await asyncio.to_thread(heartbeat, job):
+                        logger.warning("Lost the lock on job %s", job.id)
+        except JobError as e:
+            logger.warning("Job %s (%s) failed: %s", job.id, job.type, e)
+            await asyncio.to_thread(fail_job, job, str(e), False)
+        except Exception as e:
+            logger.exception(
+                "Job %s (%s) attempt %d failed", job.id, job.type, job.attempts
+            )
+            await asyncio.to_thread(fail_job, job, f"{type(e).__name__}: {e}", True)
+        else:
+            await asyncio.to_thread(complete_job, job, result)
+
+    async def _work(self, job_type: JobType):
+        while True:
+            try:
+                job = await asyncio.to_thread(claim_job, job_type.name)
+            except Exception:
+                logger.exception("Claiming %s jobs failed", job_type.name)
+                job = None
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self.run_job(job_type, job)
+
+    async def _prune(self):
+        while True:
+            try:
+                pruned = await asyncio.to_thread(prune_jobs)
+                if pruned:
+                    logger.info("Pruned %d finished jobs", pruned)
+            except Exception:
+                logger.exception("Pruning finished jobs failed")
+            await asyncio.sleep(3600)
+
+    async def start(self):
+        if not settings.JOBS_ENABLED:
+            return
+        for job_type in registry.values():
+            for _ in range(job_type.concurrency):
+                self._tasks.append(asyncio.create_task(self._work(job_type)))
+        self._tasks.append(asyncio.create_task(self._prune()))
+
+    async def stop(self):
+        # Jobs cut short here keep their lock and are retried once it goes
+        # stale
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+job_runner = JobRunner(
+    poll_interval=settings.JOBS_POLL_INTERVAL_SECONDS,
+    lock_timeout=settings.JOBS_LOCK_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,301 @@
+"""Prometheus metrics for requests, database queries and image processing.
+
+A small in-process registry rendered in the Prometheus text format, fed by an
+ASGI middleware and SQLAlchemy cursor events. Updates are a dict lookup and a
+few additions under a lock, cheap enough to leave on in production. Values are
+per process; with several workers each one is scraped separately.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = ""):
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def set(self, *labelvalues: str, value: float):
+        """Overwrite with a sampled value, e.g. a total kept elsewhere"""
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            items = list(self._values.items())
+        for labelvalues, value in items:
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, *labelvalues: str, amount: float = 1):
+        self.inc(*labelvalues, amount=-amount)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labelvalues: str, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                # Per-bucket counts (made cumulative on render), sum, count
+                state = self._values[labelvalues] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                    0,
+                ]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        with self._lock:
+            items = [(k, (list(v[0]), v[1], v[2])) for k, v in self._values.items()]
+        for labelvalues, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    self.labelnames, labelvalues, f'le="{_format_value(bound)}"'
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Run ``collector`` before each scrape, to refresh sampled gauges"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.register(
+    Counter(
+        "http_requests_total",
+        "HTTP requests by route template and status code",
+        ("method", "route", "status"),
+    )
+)
+HTTP_REQUEST_DURATION = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template",
+        ("method", "route"),
+    )
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being served")
+)
+HTTP_REQUEST_DB_QUERIES = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "Database statements executed per HTTP request",
+        ("method", "route"),
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+HTTP_REQUEST_DB_DURATION = registry.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Time spent in database statements per HTTP request",
+        ("method", "route"),
+    )
+)
+DB_QUERIES = registry.register(
+    Counter("db_queries_total", "Database statements executed")
+)
+DB_QUERY_DURATION = registry.register(
+    Histogram("db_query_duration_seconds", "Database statement latency")
+)
+IMAGE_PROCESSING_DURATION = registry.register(
+    Histogram(
+        "image_processing_duration_seconds",
+        "Time to process an uploaded reference image on an image worker",
+    )
+)
+
+DB_POOL_CONNECTIONS = registry.register(
+    Gauge("db_pool_connections", "Pooled database connections by state", ("state",))
+)
+DB_POOL_CHECKOUTS = registry.register(
+    Counter("db_pool_checkouts_total", "Connections handed out by the pool")
+)
+DB_POOL_CHECKOUT_WAIT = registry.register(
+    Counter(
+        "db_pool_checkout_wait_seconds_total",
+        "Time spent waiting for a pooled connection",
+    )
+)
+DB_POOL_CHECKOUT_TIMEOUTS = registry.register(
+    Counter("db_pool_checkout_timeouts_total", "Checkouts that gave up on a full pool")
+)
+IMAGE_QUEUE_DEPTH = registry.register(
+    Gauge("image_queue_depth", "Uploads queued or running on image workers")
+)
+
+
+def record_pool_status(pool: dict):
+    DB_POOL_CONNECTIONS.set("size", value=pool["size"])
+    DB_POOL_CONNECTIONS.set("checked_out", value=pool["checked_out"])
+    DB_POOL_CONNECTIONS.set("overflow", value=pool["overflow"])
+    DB_POOL_CHECKOUTS.set(value=pool["checkouts"])
+    DB_POOL_CHECKOUT_WAIT.set(value=pool["wait_seconds_total"])
+    DB_POOL_CHECKOUT_TIMEOUTS.set(value=pool["timeouts"])
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+# The start time lives on the statement's execution context, not the
+# connection: a statement that fails never reaches after_cursor_execute, and
+# its context is dropped with it
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    started = getattr(context, "_query_start_time", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    DB_QUERIES.inc()
+    DB_QUERY_DURATION.observe(value=elapsed)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def instrument_sqlalchemy():
+    """Time every statement on every engine, attributing it to the request"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and DB usage per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            current_request_stats.reset(token)
+            # Label by template, never the raw path, to bound cardinality
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, route_path, status)
+            HTTP_REQUEST_DURATION.observe(method, route_path, value=elapsed)
+            HTTP_REQUEST_DB_QUERIES.observe(method, route_path, value=stats.queries)
+            HTTP_REQUEST_DB_DURATION.observe(method, route_path, value=stats.db_seconds)
@@ -0,0 +1,125 @@
+"""Background removal of soft-deleted clients, projects, shotlists and items.
+
+Delete endpoints only mark rows (see Client.deleted_at), so they return
+without locking or touching a whole tree. This task removes marked rows off
+the request path in small batches, each in its own short transaction: items
+first, then shotlists once they are empty, then projects, then clients.
+Candidates are locked with SKIP LOCKED, so every worker process can run a
+purger without waiting on the others.
+"""
+
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.client import Client
+from app.models.project import Project
+from app.models.shotlist import Shotlist
+from app.models.shotlist_item import ShotlistItem
+
+logger = logging.getLogger(__name__)
+
+
+def purge_steps() -> List[Tuple[type, Select]]:
+    """(model, ids that can go now), children before their parents"""
+    return [
+        (
+            ShotlistItem,
+            select(ShotlistItem.id).where(ShotlistItem.deleted_at.isnot(None)),
+        ),
+        (
+            ShotlistItem,
+            select(ShotlistItem.id)
+            .join(Shotlist, Shotlist.id == ShotlistItem.shotlist_id)
+            .where(Shotlist.deleted_at.isnot(None)),
+        ),
+        (
+            Shotlist,
+            select(Shotlist.id).where(
+                Shotlist.deleted_at.isnot(None),
+                ~exists().where(ShotlistItem.shotlist_id == Shotlist.id),
+            ),
+        ),
+        (
+            Project,
+            select(Project.id).where(
+                Project.deleted_at.isnot(None),
+                ~exists().where(Shotlist.project_id == Project.id),
+            ),
+        ),
+        (
+            Client,
+            select(Client.id).where(
+                Client.deleted_at.isnot(None),
+                ~exists().where(Project.client_id == Client.id),
+            ),
+        ),
+    ]
+
+
+def purge_batch(model, candidates: Select, batch_size: int) -> int:
+    """Delete up to ``batch_size`` candidate rows; returns how many went"""
+    batch = candidates.limit(batch_size).with_for_update(skip_locked=True, of=model)
+    with SessionLocal() as db:
+        result = db.execute(
+            delete(model)
+            .where(model.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+
+class Purger:
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        """Purge everything currently marked; returns the rows removed"""
+        removed = 0
+        for model, candidates in purge_steps():
+            while True:
+                # One batch per thread hop, so stopping never waits on a pass
+                count = await asyncio.to_thread(
+                    purge_batch, model, candidates, self.batch_size
+                )
+                removed += count
+                if count < self.batch_size:
+                    break
+        return removed
+
+    async def _run(self):
+        while True:
+            try:
+                removed = await self.run_once()
+                if removed:
+                    logger.info("Purged %d soft-deleted rows", removed)
+            except Exception:
+                logger.exception("Purging soft-deleted rows failed")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+purger = Purger(
+    interval=settings.PURGE_INTERVAL_SECONDS,
+    batch_size=settings.PURGE_BATCH_SIZE,
+)
@@ -0,0 +1,179 @@
+"""Per-request SQL statement budgets and N+1 detection for development and tests.
+
+Routes declare how many statements they may issue with ``@query_budget(n)``,
+placed under the router decorator. With QUERY_BUDGET_MODE set to "warn" every
+request's statements are counted and over-budget requests or repeated
+statement shapes are logged; "strict" raises instead, failing the request (and
+any test driving it). ``report()`` lists the worst offenders seen so far.
+"""
+
+import logging
+import re
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_BIND_PARAM = re.compile(r"%\(\w+\)s|\$\d+|\?")
+_PARAM_LIST = re.compile(r"\?(\s*,\s*\?)+")
+_VALUES_LIST = re.compile(r"\(\?\)(\s*,\s*\(\?\))+")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(max_queries: int):
+    """Declare the most statements a route may execute per request"""
+
+    def decorator(endpoint):
+        endpoint.__query_budget__ = max_queries
+        return endpoint
+
+    return decorator
+
+
+def statement_shape(statement: str) -> str:
+    """Collapse parameters and expanded IN/VALUES lists so repeats compare equal"""
+    shape = _BIND_PARAM.sub("?", " ".join(statement.split()))
+    shape = _PARAM_LIST.sub("?, ...", shape)
+    return _VALUES_LIST.sub("(?), ...", shape)
+
+
+current_statements: ContextVar[Optional[List[str]]] = ContextVar(
+    "current_statements", default=None
+)
+
+
+def _record_statement(conn, cursor, statement, parameters, context, many):
+    statements = current_statements.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+class RouteReport:
+    def __init__(self, route: str, budget: Optional[int]):
+        self.route = route
+        self.budget = budget
+        self.requests = 0
+        self.max_queries = 0
+        self.over_budget = 0
+        self.repeated: Counter = Counter()
+
+    def as_dict(self) -> dict:
+        return {
+            "route": self.route,
+            "budget": self.budget,
+            "requests": self.requests,
+            "max_queries": self.max_queries,
+            "over_budget": self.over_budget,
+            "repeated_statements": [
+                {"statement": shape, "max_repeats": count}
+                for shape, count in self.repeated.most_common(3)
+            ],
+        }
+
+
+_reports: Dict[str, RouteReport] = {}
+_reports_lock = threading.Lock()
+
+
+def check_request(route: str, budget: Optional[int], statements: List[str]):
+    shapes = Counter(statement_shape(s) for s in statements)
+    repeated = {
+        shape: count
+        for shape, count in shapes.items()
+        if count >= settings.QUERY_BUDGET_REPEAT_THRESHOLD
+    }
+    over_budget = budget is not None and len(statements) > budget
+
+    with _reports_lock:
+        report = _reports.setdefault(route, RouteReport(route, budget))
+        report.requests += 1
+        report.max_queries = max(report.max_queries, len(statements))
+        report.over_budget += over_budget
+        for shape, count in repeated.items():
+            report.repeated[shape] = max(report.repeated[shape], count)
+
+    problems = []
+    if over_budget:
+        problems.append(f"{len(statements)} statements, budget is {budget}")
+    for shape, count in repeated.items():
+        problems.append(f"possible N+1, {count}x: {shape[:200]}")
+    if not problems:
+        return
+
+    message = f"Query budget check failed for {route}: " + "; ".join(problems)
+    if settings.QUERY_BUDGET_MODE == "strict":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def report(limit: int = 10) -> List[dict]:
+    """Routes ranked by how far they go over budget, then by query count"""
+    with _reports_lock:
+        reports = list(_reports.values())
+
+    def overshoot(r: RouteReport):
+        budget = r.budget if r.budget is not None else r.max_queries
+        return (r.max_queries - budget, bool(r.repeated), r.max_queries)
+
+    reports.sort(key=overshoot, reverse=True)
+    return [r.as_dict() for r in reports[:limit]]
+
+
+def format_report(limit: int = 10) -> str:
+    lines = ["Query budget report (worst first):"]
+    for entry in report(limit):
+        budget = entry["budget"] if entry["budget"] is not None else "-"
+        lines.append(
+            f"  {entry['route']}: max {entry['max_queries']} statements "
+            f"(budget {budget}), over budget {entry['over_budget']}/"
+            f"{entry['requests']} requests"
+        )
+        for repeat in entry["repeated_statements"]:
+            lines.append(
+                f"    repeated {repeat['max_repeats']}x: {repeat['statement'][:120]}"
+            )
+    return "\n".join(lines)
+
+
+class QueryBudgetMiddleware:
+    """Counts statements per request and checks them against the route budget"""
+
+    def __init__(self, app):
+        self.app = app
+        if not event.contains(Engine, "before_cursor_execute", _record_statement):
+            event.listen(Engine, "before_cursor_execute", _record_statement)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        statements: List[str] = []
+        token = current_statements.set(statements)
+
+        async def send_wrapper(message):
+            # Check before the response starts so strict mode can still fail it
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                if route is not None:
+                    check_request(
+                        f"{scope['method']} {route.path}",
+                        getattr(route.endpoint, "__query_budget__", None),
+                        statements,
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_statements.reset(token)
@@ -1,22 +1,99 @@
-from sqlalchemy import create_engine
+import time
+from itertools import cycle
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import OperationalError
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool
+
+
+def _connect_args(url: str) -> dict:
+    connect_args = {"connect_timeout": settings.DB_CONNECT_TIMEOUT}
+    # psycopg2 never prepares statements server-side; psycopg 3 does
+    if settings.DB_PGBOUNCER and make_url(url).get_driver_name() == "psycopg":
+        connect_args["prepare_threshold"] = None
+    return connect_args
+
+
+def create_db_engine(url: str):
+    return create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=_connect_args(url),
+    )
+
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using them
-    pool_recycle=300,  # Recycle connections after 5 minutes
-    connect_args={"connect_timeout": 5},  # 5 second connection timeout
+engine = create_db_engine(settings.DATABASE_URL)
+replica_engines = [create_db_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+_replicas = cycle(replica_engines)
+
+# Rows come back from INSERT/UPDATE ... RETURNING already current, so don't
+# expire them on commit and force a second SELECT
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
+def utc_now():
+    """Server-side default matching the naive UTC timestamps used everywhere"""
+    return text("timezone('utc', now())")
+
+
+def pool_status() -> dict:
+    return engine.pool.status_dict()
+
+
+def dispose_engines():
+    engine.dispose()
+    for replica in replica_engines:
+        replica.dispose()
+
+
+# Read-your-writes: the session cookie carries the time of the user's last
+# commit, so the window holds whichever worker or instance serves the next
+# request
+LAST_WRITE_KEY = "last_write_at"
+
+
+def read_only(endpoint):
+    """Let a route read from a replica. Only for routes that never write and
+    can tolerate replication lag beyond the read-your-writes window"""
+    endpoint.__read_only__ = True
+    return endpoint
+
+
+def _recently_wrote(request: Request) -> bool:
+    last_write = request.session.get(LAST_WRITE_KEY, 0)
+    return time.time() - last_write < settings.DB_READ_YOUR_WRITES_SECONDS
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _remember_write(session):
+    request = session.info.get("request")
+    if request is not None:
+        request.session[LAST_WRITE_KEY] = time.time()
+
+
+def get_db(request: Request):
+    if not replica_engines:
+        db = SessionLocal()
+    elif getattr(
+        request.scope.get("endpoint"), "__read_only__", False
+    ) and not _recently_wrote(request):
+        db = SessionLocal(bind=next(_replicas))
+    else:
+        db = SessionLocal(info={"request": request})
     try:
         yield db
     finally:
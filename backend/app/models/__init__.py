@@ -4,5 +4,16 @@ from app.models.client import Client
 from app.models.project import Project
 from app.models.shotlist import Shotlist
 from app.models.shotlist_item import ShotlistItem
+from app.models.shotlist_item_tombstone import ShotlistItemTombstone
+from app.models.job import Job
 
-__all__ = ["Base", "User", "Client", "Project", "Shotlist", "ShotlistItem"]
+__all__ = [
+    "Base",
+    "User",
+    "Client",
+    "Project",
+    "Shotlist",
+    "ShotlistItem",
+    "ShotlistItemTombstone",
+    "Job",
+]
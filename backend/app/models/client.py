@@ -1,23 +1,43 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
 
-from app.db.database import Base
+from app.db.database import Base, utc_now
 
 
 class Client(Base):
     __tablename__ = "clients"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     name = Column(String(255), nullable=False)
     description = Column(String(500))
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
+    # Set by the delete endpoints, which also mark everything under the row
+    # (items through their shotlist). Marked rows are hidden from reads and
+    # removed later by app/core/purge.py
+    deleted_at = Column(DateTime)
 
     owner = relationship("User", back_populates="clients")
     projects = relationship(
-        "Project", back_populates="client", cascade="all, delete-orphan"
+        "Project",
+        back_populates="client",
+        primaryjoin="and_(Client.id == Project.client_id, "
+        "Project.deleted_at.is_(None))",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    __table_args__ = (
+        Index("ix_clients_user", user_id, postgresql_where=deleted_at.is_(None)),
+        Index(
+            "ix_clients_deleted",
+            deleted_at,
+            postgresql_where=deleted_at.isnot(None),
+        ),
     )
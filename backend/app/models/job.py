@@ -0,0 +1,69 @@
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    ForeignKey,
+    DateTime,
+    Enum,
+    Integer,
+    Index,
+    JSON,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+import enum
+
+from app.db.database import Base, utc_now
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base):
+    """A unit of background work, claimed by workers with SKIP LOCKED (see
+    app/core/jobs.py)"""
+
+    __tablename__ = "jobs"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
+    type = Column(String(100), nullable=False)
+    # Who may see the job through the API; None for system jobs
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    payload = Column(JSON, nullable=False)
+    result = Column(JSON)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    # Not claimed before this; pushed back on every retry
+    run_at = Column(DateTime, nullable=False, server_default=utc_now())
+    # Refreshed while a worker runs the job; a stale lock means the worker died
+    locked_at = Column(DateTime)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        # Claims look at unfinished jobs of one type in run_at order
+        Index(
+            "ix_jobs_claim",
+            type,
+            run_at,
+            postgresql_where=status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+        ),
+        Index(
+            "ix_jobs_finished",
+            finished_at,
+            postgresql_where=finished_at.isnot(None),
+        ),
+    )
@@ -1,11 +1,21 @@
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Enum, Time, Date
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    ForeignKey,
+    DateTime,
+    Enum,
+    Time,
+    Date,
+    Index,
+    Computed,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 import enum
 
-from app.db.database import Base
+from app.db.database import Base, utc_now
 
 
 class ProjectStatus(str, enum.Enum):
@@ -18,9 +28,17 @@ class ProjectStatus(str, enum.Enum):
 class Project(Base):
     __tablename__ = "projects"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=True)
+    client_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("clients.id", ondelete="CASCADE"),
+        nullable=True,
+    )
     name = Column(String(255), nullable=False)
     description = Column(Text)
     production_company = Column(String(255))
@@ -35,11 +53,93 @@ class Project(Base):
     end_time = Column(Time)
     location = Column(Text)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utc_now())
+    updated_at = Column(
+        DateTime, nullable=False, server_default=utc_now(), onupdate=utc_now()
+    )
+    # Soft delete, see Client.deleted_at
+    deleted_at = Column(DateTime)
+    # Full-text search document, maintained by Postgres
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(director, '') || ' ' || "
+                "coalesce(producer, '') || ' ' || coalesce(production_company, '') || "
+                "' ' || coalesce(location, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+                persisted=True,
+            ),
+        )
+    )
 
     owner = relationship("User", back_populates="projects")
     client = relationship("Client", back_populates="projects")
     shotlists = relationship(
-        "Shotlist", back_populates="project", cascade="all, delete-orphan"
+        "Shotlist",
+        back_populates="project",
+        primaryjoin="and_(Project.id == Shotlist.project_id, "
+        "Shotlist.deleted_at.is_(None))",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    __table_args__ = (
+        # List filters and sorts (see app/services/projects.py), over the
+        # rows that aren't deleted. Each sort reads one of these in order:
+        # NOT NULL columns scan them backwards for descending sorts, but a
+        # descending shoot_date keeps empty dates last, so it has its own
+        Index(
+            "ix_projects_user_status_shoot_date",
+            user_id,
+            status,
+            shoot_date,
+            postgresql_where=deleted_at.is_(None),
+        ),
+        Index(
+            "ix_projects_user_shoot_date",
+            user_id,
+            shoot_date,
+            id,
+            postgresql_where=deleted_at.is_(None),
+        ),
+        Index(
+            "ix_projects_user_shoot_date_desc",
+            user_id,
+            shoot_date.desc().nulls_last(),
+            id.desc(),
+            postgresql_where=deleted_at.is_(None),
+        ),
+        Index(
+            "ix_projects_user_name",
+            user_id,
+            name,
+            id,
+            postgresql_where=deleted_at.is_(None),
+        ),
+        Index(
+            "ix_projects_user_created",
+            user_id,
+            created_at,
+            id,
+            postgresql_where=deleted_at.is_(None),
+        ),
+        Index(
+            "ix_projects_user_updated",
+            user_id,
+            updated_at,
+            id,
+            postgresql_where=deleted_at.is_(None),
+        ),
+        # Covers deleted rows too: it backs the cascade from clients
+        Index("ix_projects_client_shoot_date", client_id, shoot_date),
+        Index(
+            "ix_projects_deleted", deleted_at, postgresql_where=deleted_at.isnot(None)
+        ),
+        Index("ix_projects_search", search_vector, postgresql_using="gin"),
+        # ix_projects_name_trgm and ix_projects_location_trgm (gin_trgm_ops)
+        # back fuzzy search and the location filter where pg_trgm is
+        # installed; migrations create them only there, so they aren't
+        # declared here
     )
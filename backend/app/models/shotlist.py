@@ -1,30 +1,122 @@
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Date, Time
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    ForeignKey,
+    DateTime,
+    Date,
+    Time,
+    Index,
+    Computed,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 
-from app.db.database import Base
+from app.db.database import Base, utc_now
 
 
 class Shotlist(Base):
     __tablename__ = "shotlists"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
+    project_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # Copy of the project owner so authorization needs no join; kept in sync by
+    # database triggers when a project changes hands
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
+    )
     name = Column(String(255), nullable=False)
     shooting_date = Column(Date)
     call_time = Column(Time)
     wrap_time = Column(Time)
     location = Column(String(500))
     notes = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utc_now())
+    updated_at = Column(
+        DateTime, nullable=False, server_default=utc_now(), onupdate=utc_now()
+    )
+    # Soft delete, see Client.deleted_at
+    deleted_at = Column(DateTime)
+    # Full-text search document, maintained by Postgres
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(notes, '')), 'C')",
+                persisted=True,
+            ),
+        )
+    )
 
     project = relationship("Project", back_populates="shotlists")
     items = relationship(
         "ShotlistItem",
         back_populates="shotlist",
         cascade="all, delete-orphan",
+        passive_deletes=True,
+        primaryjoin="and_(Shotlist.id == ShotlistItem.shotlist_id, "
+        "ShotlistItem.deleted_at.is_(None))",
         order_by="ShotlistItem.order_index",
     )
+
+    __table_args__ = (
+        # List filters and sorts (see app/services/shotlists.py), one index
+        # per sort as for projects; the updated_at one also backs the cascade
+        # from projects, so it isn't partial
+        Index(
+            "ix_shotlists_project_shooting_date",
+            project_id,
+            shooting_date,
+            id,
+            postgresql_where=deleted_at.is_(None),
+        ),
+        Index(
+            "ix_shotlists_project_shooting_date_desc",
+            project_id,
+            shooting_date.desc().nulls_last(),
+            id.desc(),
+            postgresql_where=deleted_at.is_(None),
+        ),
+        Index(
+            "ix_shotlists_project_name",
+            project_id,
+            name,
+            id,
+            postgresql_where=deleted_at.is_(None),
+        ),
+        Index(
+            "ix_shotlists_project_created",
+            project_id,
+            created_at,
+            id,
+            postgresql_where=deleted_at.is_(None),
+        ),
+        Index("ix_shotlists_project_updated", project_id, updated_at, id),
+        # A user's shoot days in a date range, for conflict checks (see
+        # app/services/conflicts.py)
+        Index(
+            "ix_shotlists_user_shooting_date",
+            user_id,
+            shooting_date,
+            postgresql_where=deleted_at.is_(None),
+        ),
+        Index(
+            "ix_shotlists_deleted", deleted_at, postgresql_where=deleted_at.isnot(None)
+        ),
+        Index("ix_shotlists_search", search_vector, postgresql_using="gin"),
+        # ix_shotlists_name_trgm and ix_shotlists_location_trgm (gin_trgm_ops)
+        # back fuzzy search and the location filter where pg_trgm is
+        # installed; migrations create them only there, so they aren't
+        # declared here
+    )
@@ -6,22 +6,46 @@ from sqlalchemy import (
     DateTime,
     Integer,
     Time,
-    JSON,
     Boolean,
+    Index,
+    Computed,
+    DDL,
+    event,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 
-from app.db.database import Base
+from app.db.database import Base, utc_now
+
+# Items are hash-partitioned on shotlist_id, so everything that works on one
+# shotlist (lists, counts, reorders, delta sync) touches a single partition.
+# A query by item id alone can't be pruned and probes every partition's
+# primary key: services take the shotlist id where callers have it (see
+# shotlist_items.by_id), while /shotlist-items/{id}, cross-shotlist search
+# and per-user queries still go through all partitions. The key is part of
+# the primary key, as Postgres requires. Changing the count means rebuilding
+# the table in a migration
+PARTITIONS = 16
 
 
 class ShotlistItem(Base):
     __tablename__ = "shotlist_items"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    shotlist_id = Column(UUID(as_uuid=True), ForeignKey("shotlists.id"), nullable=False)
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
+    shotlist_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("shotlists.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Copy of the project owner, see Shotlist.user_id
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
+    )
     shot_name = Column(String(100), nullable=False)
     shot_type = Column(String(50), default="Standard")  # Standard, Lunch, Break
     shot_description = Column(Text)  # Match actual database column name
@@ -31,15 +55,72 @@ class ShotlistItem(Base):
     notes = Column(Text)
     shot_reference_image = Column(String(500))  # file path or URL
     order_index = Column(Integer, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
     # Additional columns that exist in database
     camera_angle = Column(String(100))
     aspect_ratio = Column(String(20))
     fps = Column(Integer)
     scheduled_time = Column(Time)
-    custom_properties = Column(JSON)
+    # Free-form lens, rig, talent... details; filtered by containment (@>)
+    custom_properties = Column(JSONB)
     is_completed = Column(Boolean, default=False, nullable=False)
     duration_locked = Column(Boolean, default=False, nullable=False)
+    # Soft delete, see Client.deleted_at
+    deleted_at = Column(DateTime)
+    # Full-text search document, maintained by Postgres; see app/services/search.py
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('english', coalesce(shot_name, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(shot_description, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(notes, '') || ' ' || "
+                "coalesce(camera_angle, '') || ' ' || coalesce(time_of_day, '')), 'C')",
+                persisted=True,
+            ),
+        )
+    )
 
     shotlist = relationship("Shotlist", back_populates="items")
+
+    __table_args__ = (
+        Index("ix_shotlist_items_shotlist_updated", shotlist_id, updated_at),
+        # Items in shooting order, as every list and reorder reads them
+        Index(
+            "ix_shotlist_items_shotlist_order",
+            shotlist_id,
+            order_index,
+            postgresql_where=deleted_at.is_(None),
+        ),
+        Index(
+            "ix_shotlist_items_deleted",
+            deleted_at,
+            postgresql_where=deleted_at.isnot(None),
+        ),
+        Index("ix_shotlist_items_search", search_vector, postgresql_using="gin"),
+        # jsonb_path_ops only serves @>, but is smaller and faster than the
+        # default opclass
+        Index(
+            "ix_shotlist_items_custom_properties",
+            custom_properties,
+            postgresql_using="gin",
+            postgresql_ops={"custom_properties": "jsonb_path_ops"},
+        ),
+        # ix_shotlist_items_shot_name_trgm (gin_trgm_ops) backs fuzzy search where
+        # pg_trgm is installed; migrations create it only there, so it isn't
+        # declared here
+        {"postgresql_partition_by": "HASH (shotlist_id)"},
+    )
+
+
+# The partitions themselves are plain DDL, not models
+for remainder in range(PARTITIONS):
+    event.listen(
+        ShotlistItem.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE shotlist_items_p{remainder} PARTITION OF shotlist_items "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        ),
+    )
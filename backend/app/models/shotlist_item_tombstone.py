@@ -0,0 +1,22 @@
+from sqlalchemy import Column, ForeignKey, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.database import Base, utc_now
+
+
+class ShotlistItemTombstone(Base):
+    """Records deleted items so delta sync can tell clients what to drop"""
+
+    __tablename__ = "shotlist_item_tombstones"
+
+    item_id = Column(UUID(as_uuid=True), primary_key=True)
+    shotlist_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("shotlists.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    deleted_at = Column(DateTime, server_default=utc_now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_shotlist_item_tombstones_shotlist_deleted", shotlist_id, deleted_at),
+    )
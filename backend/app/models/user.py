@@ -1,16 +1,18 @@
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from datetime import datetime
-import uuid
 
-from app.db.database import Base
+from app.db.database import Base, utc_now
 
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    )
     email = Column(String, unique=True, index=True, nullable=False)
     full_name = Column(String, nullable=True)
     picture = Column(String, nullable=True)
@@ -21,9 +23,11 @@ class User(Base):
 
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    # Secret in the user's calendar feed URLs; rotating it revokes them
+    calendar_token = Column(String(64), unique=True, index=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
 
     # Relationships
     projects = relationship(
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class CalendarFeeds(BaseModel):
+    """Where to subscribe; all None until a token is issued"""
+
+    token: Optional[str] = None
+    # Shoot days across every project
+    url: Optional[str] = None
+    # One project's shoot days, with {project_id} to fill in
+    project_url: Optional[str] = None
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+from uuid import UUID
+from enum import Enum
+
+
+class BookingType(str, Enum):
+    SHOTLIST = "shotlist"  # the call to wrap window
+    SHOT = "shot"  # a scheduled item, for shotlists without one
+
+
+class Booking(BaseModel):
+    type: BookingType
+    project_id: UUID
+    project_name: str
+    shotlist_id: UUID
+    shotlist_name: str
+    item_id: Optional[UUID] = None
+    shot_name: Optional[str] = None
+    start: datetime
+    end: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class Conflict(BaseModel):
+    location: str
+    overlap_start: datetime
+    overlap_end: datetime
+    bookings: List[Booking]
+
+
+class Conflicts(BaseModel):
+    date_from: date
+    date_to: date
+    conflicts: List[Conflict]
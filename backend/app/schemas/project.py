@@ -29,6 +29,29 @@ class ProjectBase(BaseModel):
     location: Optional[str] = None
 
 
+class ProjectSort(str, Enum):
+    NAME = "name"
+    NAME_DESC = "-name"
+    SHOOT_DATE = "shoot_date"
+    SHOOT_DATE_DESC = "-shoot_date"
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    UPDATED_AT = "updated_at"
+    UPDATED_AT_DESC = "-updated_at"
+
+
+class ProjectFilters(BaseModel):
+    """Query parameters narrowing and ordering a project list"""
+
+    status: Optional[List[ProjectStatus]] = None
+    shoot_date_from: Optional[date] = None
+    shoot_date_to: Optional[date] = None
+    location: Optional[str] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    sort: Optional[ProjectSort] = None
+
+
 class ProjectCreate(ProjectBase):
     pass
 
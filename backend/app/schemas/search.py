@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from uuid import UUID
+from enum import Enum
+
+
+class SearchResultType(str, Enum):
+    PROJECT = "project"
+    SHOTLIST = "shotlist"
+    SHOT = "shot"
+
+
+class SearchResult(BaseModel):
+    type: SearchResultType
+    id: UUID
+    title: str
+    subtitle: Optional[str] = None
+    project_id: UUID
+    shotlist_id: Optional[UUID] = None
+    rank: float
+
+
+class SearchResults(BaseModel):
+    results: List[SearchResult]
+    skip: int
+    limit: int
+    has_more: bool
+    # Some type matched more than the search ranks (see app/services/search.py);
+    # the best matches may be missing, so a narrower query is worth trying
+    truncated: bool = False
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime, date, time
 from uuid import UUID
+from enum import Enum
 
 
 class ShotlistBase(BaseModel):
@@ -13,6 +14,28 @@ class ShotlistBase(BaseModel):
     notes: Optional[str] = None
 
 
+class ShotlistSort(str, Enum):
+    NAME = "name"
+    NAME_DESC = "-name"
+    SHOOTING_DATE = "shooting_date"
+    SHOOTING_DATE_DESC = "-shooting_date"
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    UPDATED_AT = "updated_at"
+    UPDATED_AT_DESC = "-updated_at"
+
+
+class ShotlistFilters(BaseModel):
+    """Query parameters narrowing and ordering a project's shotlists"""
+
+    shooting_date_from: Optional[date] = None
+    shooting_date_to: Optional[date] = None
+    location: Optional[str] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    sort: Optional[ShotlistSort] = None
+
+
 class ShotlistCreate(ShotlistBase):
     pass
 
@@ -44,6 +44,14 @@ class ShotlistItemCreate(BaseModel):
     duration_locked: Optional[bool] = None
 
 
+class ShotlistItemImportRow(ShotlistItemCreate):
+    """A CSV row: what an export writes, including the fields set after
+    creation"""
+
+    start_time: Optional[time] = None
+    shot_reference_image: Optional[str] = Field(None, max_length=500)
+
+
 class ShotlistItemUpdate(BaseModel):
     shot_name: Optional[str] = Field(None, min_length=1, max_length=100)
     shot_type: Optional[str] = Field(None, pattern="^(Standard|Lunch|Break)$")
@@ -79,6 +87,15 @@ class ShotlistItem(ShotlistItemInDB):
     pass
 
 
+class ShotlistItemChanges(BaseModel):
+    """Delta since a sync token: changed items plus ids of deleted ones"""
+
+    items: List[ShotlistItem]
+    deleted: List[UUID]
+    token: str
+    reset: bool = False  # token too old; items is the full list
+
+
 class ShotlistItemReorder(BaseModel):
     item_id: UUID
     new_index: int = Field(..., ge=0)
@@ -86,3 +103,15 @@ class ShotlistItemReorder(BaseModel):
 
 class ReorderRequest(BaseModel):
     items: List[ShotlistItemReorder]
+
+
+class ShotlistItemImportError(BaseModel):
+    line: int
+    errors: List[str]
+
+
+class ShotlistItemImportResult(BaseModel):
+    imported: int
+    failed: int
+    # The first 100 failed rows; ``failed`` has the full count
+    errors: List[ShotlistItemImportError]
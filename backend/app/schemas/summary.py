@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date
+from uuid import UUID
+from app.schemas.project import ProjectStatus
+
+
+class ShotCounts(BaseModel):
+    shot_count: int = 0
+    completed_count: int = 0
+    remaining_count: int = 0
+    total_duration: int = 0  # minutes
+
+
+class ShotlistSummary(ShotCounts):
+    shotlist_id: UUID
+    name: str
+    shooting_date: Optional[date] = None
+
+
+class ProjectSummary(ShotCounts):
+    project_id: UUID
+    shotlist_count: int
+    shotlists: List[ShotlistSummary]
+
+
+class DashboardSummary(BaseModel):
+    project_count: int
+    projects_by_status: Dict[ProjectStatus, int]
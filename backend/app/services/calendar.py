@@ -0,0 +1,311 @@
+"""iCalendar feeds of a user's shoot days.
+
+Every shotlist with a shooting date is an event from call to wrap time (past
+midnight when wrap is earlier than call), or all day without a call time. A
+project's own shoot date, from call to end time, is an event too unless one
+of its shotlists is already on that day. Times carry no zone: they are wall
+clock times where the shoot is, and calendars show them as written.
+
+Calendar apps poll feeds every few minutes and almost always find nothing
+new. A feed's ETag comes from the newest ``updated_at`` and the number of
+live projects and shotlists behind it, read with one aggregate query, so a
+poll that sends it back in If-None-Match gets a 304 with nothing loaded or
+rendered. Rendered feeds are kept per process under that ETag, so a change
+re-renders each affected feed once however many clients poll it.
+"""
+
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.project import Project
+from app.models.shotlist import Shotlist
+from app.models.user import User
+
+# Part of every ETag: bump it when the rendered output changes, so clients
+# holding feeds in the old format fetch them again
+FEED_VERSION = 1
+PRODID = "-//Call Sheet//Shoot days//EN"
+
+
+def rotate_calendar_token(db: Session, user_id: UUID) -> str:
+    token = secrets.token_urlsafe(32)
+    db.execute(update(User).where(User.id == user_id).values(calendar_token=token))
+    db.commit()
+    return token
+
+
+def revoke_calendar_token(db: Session, user_id: UUID):
+    db.execute(update(User).where(User.id == user_id).values(calendar_token=None))
+    db.commit()
+
+
+def get_user_by_calendar_token(db: Session, token: str) -> Optional[User]:
+    return db.scalars(
+        select(User).where(User.calendar_token == token, User.is_active.is_(True))
+    ).first()
+
+
+def feed_scope(user_id: UUID, project_id: Optional[UUID] = None) -> str:
+    return f"project:{project_id}" if project_id else f"user:{user_id}"
+
+
+def feed_etag(
+    db: Session, user_id: UUID, project_id: Optional[UUID] = None
+) -> Optional[str]:
+    """The feed's current ETag, or None when the project isn't found"""
+    projects = select(Project.updated_at).where(
+        Project.user_id == user_id, Project.deleted_at.is_(None)
+    )
+    shotlists = select(Shotlist.updated_at).where(
+        Shotlist.user_id == user_id, Shotlist.deleted_at.is_(None)
+    )
+    if project_id:
+        projects = projects.where(Project.id == project_id)
+        shotlists = shotlists.where(Shotlist.project_id == project_id)
+    rows = union_all(projects, shotlists).subquery()
+    updated_at, count = db.execute(
+        select(func.max(rows.c.updated_at), func.count())
+    ).one()
+    # A project feed always counts its project
+    if project_id and not count:
+        return None
+
+    validator = f"{FEED_VERSION}:{feed_scope(user_id, project_id)}:{updated_at}:{count}"
+    return '"' + hashlib.sha256(validator.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ tags match too"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+class FeedCache:
+    """Rendered feeds by scope, each with the ETag it was rendered for"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._feeds: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, scope: str, etag: str) -> Optional[bytes]:
+        with self._lock:
+            cached = self._feeds.get(scope)
+            if cached is None or cached[0] != etag:
+                return None
+            self._feeds.move_to_end(scope)
+            return cached[1]
+
+    def put(self, scope: str, etag: str, body: bytes):
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._feeds[scope] = (etag, body)
+            self._feeds.move_to_end(scope)
+            while len(self._feeds) > self.size:
+                self._feeds.popitem(last=False)
+
+
+feed_cache = FeedCache(settings.CALENDAR_FEED_CACHE_SIZE)
+
+
+def get_feed(
+    db: Session, user_id: UUID, etag: str, project_id: Optional[UUID] = None
+) -> bytes:
+    """The feed rendered for ``etag``, from the cache when it's there"""
+    scope = feed_scope(user_id, project_id)
+    body = feed_cache.get(scope, etag)
+    if body is None:
+        body = render_feed(db, user_id, project_id)
+        feed_cache.put(scope, etag, body)
+    return body
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """Split a content line into 75-octet pieces, never inside a character"""
+    encoded = line.encode()
+    pieces = []
+    start, limit = 0, 75
+    while len(encoded) - start > limit:
+        end = start + limit
+        while encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        pieces.append(encoded[start:end].decode())
+        # Continuation lines start with a space, which counts
+        start, limit = end, 74
+    pieces.append(encoded[start:].decode())
+    return "\r\n ".join(pieces)
+
+
+def format_datetime(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def event_lines(
+    uid: str,
+    updated_at: datetime,
+    summary: str,
+    day: date,
+    start: Optional[time],
+    end: Optional[time],
+    location: Optional[str],
+    description: Optional[str],
+) -> List[str]:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_datetime(updated_at)}Z",
+        f"LAST-MODIFIED:{format_datetime(updated_at)}Z",
+    ]
+    if start is None:
+        lines.append(f"DTSTART;VALUE=DATE:{day:%Y%m%d}")
+        lines.append(f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}")
+    else:
+        starts = datetime.combine(day, start)
+        lines.append(f"DTSTART:{format_datetime(starts)}")
+        if end is not None:
+            ends = datetime.combine(day, end)
+            if ends <= starts:
+                ends += timedelta(days=1)
+            lines.append(f"DTEND:{format_datetime(ends)}")
+    lines.append(f"SUMMARY:{escape_text(summary)}")
+    if location:
+        lines.append(f"LOCATION:{escape_text(location)}")
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def render_feed(db: Session, user_id: UUID, project_id: Optional[UUID] = None) -> bytes:
+    shotlist_query = (
+        select(
+            Shotlist.id,
+            Shotlist.name,
+            Shotlist.shooting_date,
+            Shotlist.call_time,
+            Shotlist.wrap_time,
+            Shotlist.location,
+            Shotlist.notes,
+            Shotlist.updated_at,
+            Project.id,
+            Project.name,
+            Project.location,
+        )
+        .join(Project, Project.id == Shotlist.project_id)
+        .where(
+            Shotlist.user_id == user_id,
+            Shotlist.shooting_date.isnot(None),
+            Shotlist.deleted_at.is_(None),
+            Project.deleted_at.is_(None),
+        )
+        .order_by(Shotlist.shooting_date, Shotlist.call_time, Shotlist.id)
+    )
+    project_query = (
+        select(
+            Project.id,
+            Project.name,
+            Project.shoot_date,
+            Project.call_time,
+            Project.end_time,
+            Project.location,
+            Project.description,
+            Project.updated_at,
+        )
+        .where(Project.user_id == user_id, Project.deleted_at.is_(None))
+        .order_by(Project.shoot_date, Project.id)
+    )
+    if project_id:
+        shotlist_query = shotlist_query.where(Shotlist.project_id == project_id)
+        project_query = project_query.where(Project.id == project_id)
+    else:
+        project_query = project_query.where(Project.shoot_date.isnot(None))
+
+    calendar_name = settings.PROJECT_NAME
+    events = []
+    # Project shoot days a shotlist already covers
+    covered = set()
+    for (
+        shotlist_id,
+        name,
+        shooting_date,
+        call_time,
+        wrap_time,
+        location,
+        notes,
+        updated_at,
+        shotlist_project_id,
+        project_name,
+        project_location,
+    ) in db.execute(shotlist_query):
+        covered.add((shotlist_project_id, shooting_date))
+        events += event_lines(
+            uid=f"shotlist-{shotlist_id}@callsheet",
+            updated_at=updated_at,
+            summary=f"{project_name}: {name}",
+            day=shooting_date,
+            start=call_time,
+            end=wrap_time,
+            location=location or project_location,
+            description=notes,
+        )
+    for (
+        id,
+        name,
+        shoot_date,
+        call_time,
+        end_time,
+        location,
+        description,
+        updated_at,
+    ) in db.execute(project_query):
+        if project_id:
+            calendar_name = f"{name} - {settings.PROJECT_NAME}"
+        if shoot_date is None or (id, shoot_date) in covered:
+            continue
+        events += event_lines(
+            uid=f"project-{id}@callsheet",
+            updated_at=updated_at,
+            summary=name,
+            day=shoot_date,
+            start=call_time,
+            end=end_time,
+            location=location,
+            description=description,
+        )
+
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(calendar_name)}",
+        *events,
+        "END:VCALENDAR",
+    ]
+    return ("\r\n".join(fold(line) for line in lines) + "\r\n").encode()
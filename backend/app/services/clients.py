@@ -1,7 +1,11 @@
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
+from app.db.database import utc_now
 from app.models.client import Client
+from app.models.project import Project
+from app.models.shotlist import Shotlist
 from app.schemas.client import ClientCreate, ClientUpdate
 
 
@@ -10,7 +14,7 @@ def get_user_clients(
 ) -> List[Client]:
     return (
         db.query(Client)
-        .filter(Client.user_id == user_id)
+        .filter(Client.user_id == user_id, Client.deleted_at.is_(None))
         .offset(skip)
         .limit(limit)
         .all()
@@ -18,38 +22,74 @@ def get_user_clients(
 
 
 def get_client(db: Session, client_id: UUID, user_id: UUID = None) -> Optional[Client]:
-    query = db.query(Client).filter(Client.id == client_id)
+    query = db.query(Client).filter(Client.id == client_id, Client.deleted_at.is_(None))
     if user_id:
         query = query.filter(Client.user_id == user_id)
     return query.first()
 
 
 def create_client(db: Session, client: ClientCreate, user_id: UUID) -> Client:
-    db_client = Client(**client.model_dump(), user_id=user_id)
-    db.add(db_client)
+    db_client = db.scalars(
+        insert(Client)
+        .values(**client.model_dump(exclude_none=True), user_id=user_id)
+        .returning(Client)
+    ).one()
     db.commit()
-    db.refresh(db_client)
     return db_client
 
 
 def update_client(
     db: Session, client_id: UUID, client: ClientUpdate, user_id: UUID
-) -> Client:
-    db_client = get_client(db, client_id, user_id=user_id)
-    if db_client is None:
-        return None
-    update_data = client.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_client, field, value)
+) -> Optional[Client]:
+    db_client = db.scalars(
+        update(Client)
+        .where(
+            Client.id == client_id,
+            Client.user_id == user_id,
+            Client.deleted_at.is_(None),
+        )
+        .values(**client.model_dump(exclude_unset=True))
+        .returning(Client)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    ).first()
     db.commit()
-    db.refresh(db_client)
     return db_client
 
 
 def delete_client(db: Session, client_id: UUID, user_id: UUID) -> bool:
-    db_client = get_client(db, client_id, user_id=user_id)
-    if db_client is None:
-        return False
-    db.delete(db_client)
+    """Mark the client, its projects and their shotlists deleted in one
+    statement; app/core/purge.py removes them later"""
+    now = utc_now()
+    client = (
+        update(Client)
+        .where(
+            Client.id == client_id,
+            Client.user_id == user_id,
+            Client.deleted_at.is_(None),
+        )
+        .values(deleted_at=now, updated_at=now)
+        .returning(Client.id)
+        .cte("deleted_client")
+    )
+    projects = (
+        update(Project)
+        .where(
+            Project.client_id.in_(select(client.c.id)),
+            Project.deleted_at.is_(None),
+        )
+        .values(deleted_at=now, updated_at=now)
+        .returning(Project.id)
+        .cte("deleted_projects")
+    )
+    shotlists = (
+        update(Shotlist)
+        .where(
+            Shotlist.project_id.in_(select(projects.c.id)),
+            Shotlist.deleted_at.is_(None),
+        )
+        .values(deleted_at=now, updated_at=now)
+        .cte("deleted_shotlists")
+    )
+    deleted = db.execute(select(client.c.id).add_cte(projects, shotlists)).first()
     db.commit()
-    return True
+    return deleted is not None
@@ -0,0 +1,173 @@
+"""Double bookings of a location across a user's shotlists.
+
+A shotlist books its location from call to wrap time on its shooting date
+(past midnight when wrap is earlier than call). Shotlists without both times
+book it through their scheduled shots instead, from each start time for the
+shot's duration. Two bookings from different shotlists conflict when they
+overlap at the same location, compared ignoring case and surrounding spaces.
+A range includes overlaps that started the night before and run into it.
+
+Bookings are loaded with two indexed queries and matched by a sweep over
+them sorted by location and start, so the work is O(n log n) plus the
+conflicts found, whatever the date range.
+"""
+
+import heapq
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from itertools import count
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.project import Project, ProjectStatus
+from app.models.shotlist import Shotlist
+from app.models.shotlist_item import ShotlistItem
+
+
+@dataclass
+class Booking:
+    type: str
+    location: str
+    start: datetime
+    end: datetime
+    project_id: UUID
+    project_name: str
+    shotlist_id: UUID
+    shotlist_name: str
+    item_id: Optional[UUID] = None
+    shot_name: Optional[str] = None
+
+    @property
+    def location_key(self) -> str:
+        return self.location.strip().casefold()
+
+
+def load_bookings(
+    db: Session, user_id: UUID, date_from: date, date_to: date
+) -> List[Booking]:
+    shotlists = db.execute(
+        select(
+            Shotlist.id,
+            Shotlist.name,
+            Shotlist.location,
+            Shotlist.shooting_date,
+            Shotlist.call_time,
+            Shotlist.wrap_time,
+            Project.id,
+            Project.name,
+        )
+        .join(Project, Project.id == Shotlist.project_id)
+        .where(
+            Shotlist.user_id == user_id,
+            Shotlist.shooting_date.between(date_from, date_to),
+            Shotlist.deleted_at.is_(None),
+            func.trim(Shotlist.location) != "",
+            Project.deleted_at.is_(None),
+            # Projects without a status aren't completed either
+            Project.status.is_distinct_from(ProjectStatus.COMPLETED),
+        )
+    ).all()
+
+    bookings = []
+    # Shotlists booked through their shots: id -> (date, shared fields)
+    unscheduled = {}
+    for (
+        shotlist_id,
+        name,
+        location,
+        shooting_date,
+        call_time,
+        wrap_time,
+        project_id,
+        project_name,
+    ) in shotlists:
+        shotlist = dict(
+            location=location,
+            project_id=project_id,
+            project_name=project_name,
+            shotlist_id=shotlist_id,
+            shotlist_name=name,
+        )
+        if call_time is None or wrap_time is None:
+            unscheduled[shotlist_id] = (shooting_date, shotlist)
+            continue
+        start = datetime.combine(shooting_date, call_time)
+        end = datetime.combine(shooting_date, wrap_time)
+        if end <= start:
+            # Wraps after midnight
+            end += timedelta(days=1)
+        bookings.append(Booking(type="shotlist", start=start, end=end, **shotlist))
+
+    if unscheduled:
+        items = db.execute(
+            select(
+                ShotlistItem.id,
+                ShotlistItem.shotlist_id,
+                ShotlistItem.shot_name,
+                ShotlistItem.start_time,
+                ShotlistItem.shot_duration,
+            ).where(
+                ShotlistItem.shotlist_id.in_(unscheduled),
+                ShotlistItem.deleted_at.is_(None),
+                ShotlistItem.start_time.isnot(None),
+                ShotlistItem.shot_duration > 0,
+            )
+        ).all()
+        for item_id, shotlist_id, shot_name, start_time, duration in items:
+            shooting_date, shotlist = unscheduled[shotlist_id]
+            start = datetime.combine(shooting_date, start_time)
+            bookings.append(
+                Booking(
+                    type="shot",
+                    start=start,
+                    end=start + timedelta(minutes=duration),
+                    item_id=item_id,
+                    shot_name=shot_name,
+                    **shotlist,
+                )
+            )
+    return bookings
+
+
+def overlapping_bookings(bookings: List[Booking]) -> List[tuple]:
+    """Pairs of bookings from different shotlists that overlap in place and
+    time, earlier start first"""
+    pairs = []
+    # Bookings at the current location still running, soonest end first
+    running: list = []
+    tiebreak = count()
+    location = None
+    for booking in sorted(bookings, key=lambda b: (b.location_key, b.start)):
+        if booking.location_key != location:
+            location, running = booking.location_key, []
+        while running and running[0][0] <= booking.start:
+            heapq.heappop(running)
+        pairs.extend(
+            (other, booking)
+            for _, _, other in running
+            if other.shotlist_id != booking.shotlist_id
+        )
+        heapq.heappush(running, (booking.end, next(tiebreak), booking))
+    return pairs
+
+
+def find_conflicts(db: Session, user_id: UUID, date_from: date, date_to: date):
+    # Bookings from the day before can run past midnight into the range;
+    # load them too, then keep only overlaps that reach date_from
+    range_start = datetime.combine(date_from, time.min)
+    bookings = load_bookings(db, user_id, date_from - timedelta(days=1), date_to)
+    conflicts = [
+        {
+            "location": first.location.strip(),
+            "overlap_start": second.start,
+            "overlap_end": min(first.end, second.end),
+            "bookings": [first, second],
+        }
+        for first, second in overlapping_bookings(bookings)
+        if min(first.end, second.end) > range_start
+    ]
+    conflicts.sort(key=lambda c: (c["overlap_start"], c["location"]))
+    return {"date_from": date_from, "date_to": date_to, "conflicts": conflicts}
@@ -0,0 +1,172 @@
+"""Streaming CSV and XLSX exports of shotlist items.
+
+Rows are read through a server-side cursor (``yield_per``) as plain tuples, so
+neither the ORM identity map nor the output grows with the number of items.
+CSV is yielded as it is produced. XLSX can't be sent before the workbook is
+closed, so it is written row by row in constant-memory mode to a temporary
+file that is then streamed out. Text is always written as text: XLSX cells
+never become formulas, and CSV cells that a spreadsheet would evaluate get a
+leading apostrophe.
+
+Generators open their own session, as the request's session is closed before
+the response body is sent, bound to the engine the request's session chose so
+that a read-only route keeps reading from its replica.
+"""
+
+import csv
+import io
+import json
+import re
+import tempfile
+from enum import Enum
+from typing import Iterator, Optional
+from uuid import UUID
+
+import xlsxwriter
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from app.db.database import SessionLocal
+from app.models.shotlist import Shotlist
+from app.models.shotlist_item import ShotlistItem
+
+FETCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+# Spreadsheet apps run a cell starting with one of these as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.XLSX: (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    ),
+}
+
+SHOTLIST_COLUMNS = [
+    ("Shotlist", Shotlist.name),
+    ("Shooting Date", Shotlist.shooting_date),
+]
+ITEM_COLUMNS = [
+    ("#", ShotlistItem.order_index + 1),
+    ("Shot", ShotlistItem.shot_name),
+    ("Type", ShotlistItem.shot_type),
+    ("Description", ShotlistItem.shot_description),
+    ("Time of Day", ShotlistItem.time_of_day),
+    ("Duration (min)", ShotlistItem.shot_duration),
+    ("Start Time", ShotlistItem.start_time),
+    ("Scheduled Time", ShotlistItem.scheduled_time),
+    ("Camera Angle", ShotlistItem.camera_angle),
+    ("Aspect Ratio", ShotlistItem.aspect_ratio),
+    ("FPS", ShotlistItem.fps),
+    ("Notes", ShotlistItem.notes),
+    ("Completed", ShotlistItem.is_completed),
+    ("Reference Image", ShotlistItem.shot_reference_image),
+    ("Custom Properties", ShotlistItem.custom_properties),
+]
+
+
+def export_filename(name: str, export_format: ExportFormat) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", name).strip("-").lower() or "export"
+    return f"{slug}.{export_format.value}"
+
+
+def _item_rows(
+    bind: Engine,
+    shotlist_id: Optional[UUID] = None,
+    project_id: Optional[UUID] = None,
+) -> Iterator[tuple]:
+    """Header row, then one row per item in shooting order"""
+    columns = ITEM_COLUMNS if shotlist_id else SHOTLIST_COLUMNS + ITEM_COLUMNS
+    yield tuple(header for header, _ in columns)
+
+    stmt = (
+        select(*(column for _, column in columns))
+        .join(Shotlist, Shotlist.id == ShotlistItem.shotlist_id)
+        .order_by(
+            Shotlist.shooting_date.nulls_last(),
+            Shotlist.name,
+            Shotlist.id,
+            ShotlistItem.order_index,
+        )
+        .execution_options(yield_per=FETCH_SIZE)
+    )
+    stmt = stmt.where(ShotlistItem.deleted_at.is_(None), Shotlist.deleted_at.is_(None))
+    if shotlist_id:
+        stmt = stmt.where(ShotlistItem.shotlist_id == shotlist_id)
+    else:
+        stmt = stmt.where(Shotlist.project_id == project_id)
+
+    with SessionLocal(bind=bind) as db:
+        for row in db.execute(stmt):
+            yield tuple(_cell(value) for value in row)
+
+
+def _cell(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _csv_cell(value):
+    # A leading apostrophe makes the cell text; the import strips it again
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows: Iterator[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_csv_cell(value) for value in row])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_xlsx(rows: Iterator[tuple], sheet_name: str) -> Iterator[bytes]:
+    with tempfile.TemporaryFile() as output:
+        # Cells are user text: never turn it into formulas or links
+        workbook = xlsxwriter.Workbook(
+            output,
+            {
+                "constant_memory": True,
+                "strings_to_formulas": False,
+                "strings_to_urls": False,
+            },
+        )
+        # Sheet names are limited to 31 characters and exclude []:*?/\
+        worksheet = workbook.add_worksheet(
+            re.sub(r"[\[\]:*?/\\]", " ", sheet_name)[:31]
+        )
+        bold = workbook.add_format({"bold": True})
+        for row_number, row in enumerate(rows):
+            worksheet.write_row(row_number, 0, row, bold if row_number == 0 else None)
+        workbook.close()
+
+        output.seek(0)
+        while chunk := output.read(CHUNK_SIZE):
+            yield chunk
+
+
+def stream_export(
+    bind: Engine,
+    export_format: ExportFormat,
+    name: str,
+    shotlist_id: Optional[UUID] = None,
+    project_id: Optional[UUID] = None,
+):
+    rows = _item_rows(bind, shotlist_id=shotlist_id, project_id=project_id)
+    if export_format == ExportFormat.XLSX:
+        return stream_xlsx(rows, name or "Shots")
+    return stream_csv(rows)
@@ -0,0 +1,31 @@
+"""Helpers shared by the list endpoints' filter and sort parameters."""
+
+from typing import Optional
+
+
+def contains(column, value: str):
+    """Case-insensitive substring match with LIKE wildcards escaped"""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+
+def apply_sort(query, model, sort: Optional[str]):
+    """Order by a column name, descending when prefixed with "-".
+
+    Empty values sort last either way and the id breaks ties in the same
+    direction, so pages stay stable between requests. The order is spelled
+    exactly as the model's (column, id) indexes are, so they can serve it.
+    """
+    if not sort:
+        return query
+    name = sort.lstrip("-")
+    column = getattr(model, name)
+    if sort.startswith("-"):
+        order, tiebreak = column.desc(), model.id.desc()
+    else:
+        order, tiebreak = column.asc(), model.id.asc()
+    # NULLS LAST is already the ascending order; spelled out only for
+    # nullable columns, so NOT NULL ones match their index read backwards
+    if model.__table__.c[name].nullable:
+        order = order.nulls_last()
+    return query.order_by(order, tiebreak)
@@ -0,0 +1,153 @@
+"""Reference image processing, run on a bounded worker pool off the event loop
+or, for background uploads, as an ``image.process`` job.
+
+Files live on local disk: processed images under static/uploads, and uploads
+waiting for their job under UPLOAD_DIR/pending. A job may be claimed by any
+worker process, so with workers on more than one host both directories must
+be shared storage (e.g. one network volume); otherwise keep the app and its
+workers on a single host.
+"""
+
+import asyncio
+import io
+import os
+import threading
+import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import UUID
+
+from PIL import Image
+
+from app.core.config import settings
+from app.core.jobs import JobError, job_handler
+from app.core.metrics import IMAGE_PROCESSING_DURATION
+from app.db.database import SessionLocal
+from app.schemas.shotlist_item import ShotlistItemUpdate
+from app.services import shotlist_items as shotlist_item_service
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_WORKERS, thread_name_prefix="image-worker"
+)
+_pending_lock = threading.Lock()
+_pending = 0
+
+
+def queue_depth() -> int:
+    """Uploads waiting for or currently being processed by an image worker"""
+    return _pending
+
+
+def process_reference_image(contents: bytes) -> str:
+    """Fit the image onto a 16:9, 9:16 or 1:1 canvas, save it as JPEG and
+    return its URL"""
+    image = Image.open(io.BytesIO(contents))
+
+    # Convert to RGB if necessary (handles PNG with transparency, etc.)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    # Determine target size based on original image aspect ratio
+    original_width, original_height = image.size
+    aspect_ratio = original_width / original_height
+
+    # Choose target format based on aspect ratio
+    if aspect_ratio > 1.5:  # Wide image -> 16:9
+        target_size = (1920, 1080)
+    elif aspect_ratio < 0.75:  # Tall image -> 9:16
+        target_size = (1080, 1920)
+    else:  # Square-ish image -> 1:1
+        target_size = (1080, 1080)
+
+    # Calculate resize dimensions to fit within target while maintaining aspect ratio
+    image.thumbnail(target_size, Image.Resampling.LANCZOS)
+
+    # Create a new image with target size and white background
+    new_image = Image.new("RGB", target_size, (255, 255, 255))
+
+    # Calculate position to center the resized image
+    x = (target_size[0] - image.size[0]) // 2
+    y = (target_size[1] - image.size[1]) // 2
+
+    # Paste the resized image onto the center of the new image
+    new_image.paste(image, (x, y))
+
+    # Generate unique filename
+    file_extension = ".jpg"  # Always save as JPG for consistency
+    unique_filename = f"{uuid.uuid4()}{file_extension}"
+
+    # Ensure uploads directory exists
+    uploads_dir = "static/uploads"
+    os.makedirs(uploads_dir, exist_ok=True)
+
+    # Save the processed image
+    file_path = os.path.join(uploads_dir, unique_filename)
+    new_image.save(file_path, "JPEG", quality=85, optimize=True)
+
+    # Create URL for the image
+    return f"/static/uploads/{unique_filename}"
+
+
+def _timed_process(contents: bytes) -> str:
+    start = time.perf_counter()
+    try:
+        return process_reference_image(contents)
+    finally:
+        IMAGE_PROCESSING_DURATION.observe(value=time.perf_counter() - start)
+
+
+async def process_in_worker(contents: bytes) -> str:
+    global _pending
+    with _pending_lock:
+        _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, _timed_process, contents)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+def stage_upload(contents: bytes) -> str:
+    """Keep an upload on disk until its image job runs; returns the path,
+    which the job must be able to open wherever it is claimed"""
+    pending_dir = os.path.join(settings.UPLOAD_DIR, "pending")
+    os.makedirs(pending_dir, exist_ok=True)
+    path = os.path.join(pending_dir, str(uuid.uuid4()))
+    with open(path, "wb") as f:
+        f.write(contents)
+    return path
+
+
+@job_handler("image.process", concurrency=settings.IMAGE_WORKERS)
+def process_staged_upload(payload: dict) -> dict:
+    """Process a staged upload and set it as its item's reference image"""
+    path = payload["path"]
+    try:
+        with open(path, "rb") as f:
+            contents = f.read()
+    except FileNotFoundError:
+        raise JobError("Upload is no longer available")
+
+    # The same bytes would fail the same way again; don't retry
+    try:
+        image_url = _timed_process(contents)
+    except Exception:
+        os.remove(path)
+        raise JobError("Error processing image")
+
+    with SessionLocal() as db:
+        db_item = shotlist_item_service.update_shotlist_item(
+            db,
+            item_id=UUID(payload["item_id"]),
+            item=ShotlistItemUpdate(shot_reference_image=image_url),
+            user_id=UUID(payload["user_id"]),
+            # Jobs queued before it was in the payload go without
+            shotlist_id=(
+                UUID(payload["shotlist_id"]) if "shotlist_id" in payload else None
+            ),
+        )
+    os.remove(path)
+    if db_item is None:
+        raise JobError("Item not found")
+    return {"url": image_url}
@@ -0,0 +1,233 @@
+"""Bulk import of shotlist items from CSV.
+
+Rows are parsed as they are read and validated one by one against
+ShotlistItemImportRow (the create fields, plus the start time and reference
+image an export writes); invalid rows are reported with their line numbers and
+skipped. Valid rows are spooled to a temporary file, kept in memory only while
+small, then COPYed into a temporary staging table and appended to the
+shotlist with one INSERT ... SELECT, so the cost per shot is a CSV line rather
+than a statement and memory stays flat however long the file is.
+
+Headers may be the item field names (``shot_name``) or the headings written by
+the export (``Shot``, ``Duration (min)``); unknown columns are ignored.
+"""
+
+import csv
+import json
+import re
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    Time,
+    func,
+    insert,
+    literal,
+    select,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import publish_shotlist_event
+from app.models.shotlist import Shotlist
+from app.models.shotlist_item import ShotlistItem
+from app.schemas.shotlist_item import ShotlistItemImportRow
+from app.services.exports import FORMULA_PREFIXES
+
+MAX_REPORTED_ERRORS = 100
+# Valid rows are held in memory up to this size, then in a temporary file
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+class CSVFormatError(Exception):
+    """The file can't be read as CSV past some line, e.g. a field over
+    csv.field_size_limit() or a stray quote"""
+
+
+class TooManyRowsError(Exception):
+    """The file has more rows than IMPORT_MAX_ROWS"""
+
+
+HEADER_ALIASES = {
+    "shot": "shot_name",
+    "name": "shot_name",
+    "type": "shot_type",
+    "description": "shot_description",
+    "duration": "shot_duration",
+    "duration_min": "shot_duration",
+    "completed": "is_completed",
+    "reference_image": "shot_reference_image",
+}
+
+staging = Table(
+    "shotlist_item_import",
+    MetaData(),
+    Column("line", Integer, nullable=False),
+    Column("shot_name", String(100), nullable=False),
+    Column("shot_type", String(50)),
+    Column("shot_description", Text),
+    Column("time_of_day", String(50)),
+    Column("shot_duration", Integer),
+    Column("notes", Text),
+    Column("camera_angle", String(100)),
+    Column("aspect_ratio", String(20)),
+    Column("fps", Integer),
+    Column("start_time", Time),
+    Column("scheduled_time", Time),
+    Column("shot_reference_image", String(500)),
+    Column("custom_properties", JSONB),
+    Column("is_completed", Boolean),
+    Column("duration_locked", Boolean),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+FIELDS = [column.name for column in staging.columns if column.name != "line"]
+
+
+def _field_name(header: str) -> str:
+    key = re.sub(r"[^a-z0-9]+", "_", header.strip().lower()).strip("_")
+    return HEADER_ALIASES.get(key, key)
+
+
+def _parse_row(
+    row: Dict[str, str],
+) -> Tuple[Optional[ShotlistItemImportRow], List[str]]:
+    """The validated item, or None and every problem found in the row"""
+    values = {}
+    for header, raw in row.items():
+        field = _field_name(header or "")
+        if field not in FIELDS or raw is None or not raw.strip():
+            continue
+        value = raw.strip()
+        # Undo the guard exports put in front of formula-like text
+        if value.startswith("'") and value[1:].startswith(FORMULA_PREFIXES):
+            value = value[1:]
+        values[field] = value
+
+    messages = []
+    if "custom_properties" in values:
+        try:
+            values["custom_properties"] = json.loads(values["custom_properties"])
+        except ValueError:
+            del values["custom_properties"]
+            messages.append("custom_properties: Invalid JSON")
+    try:
+        item = ShotlistItemImportRow.model_validate(values)
+    except ValidationError as e:
+        item = None
+        messages += [
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+        ]
+    return (None if messages else item), messages
+
+
+def _copy_value(value):
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def import_shotlist_items(
+    db: Session, shotlist_id: UUID, user_id: UUID, lines: Iterable[str]
+):
+    """Append the valid rows of a CSV to a shotlist; returns a summary"""
+    with tempfile.SpooledTemporaryFile(
+        max_size=SPOOL_MAX_SIZE, mode="w+", newline=""
+    ) as buffer:
+        return _import(db, shotlist_id, user_id, lines, buffer)
+
+
+def _import(
+    db: Session, shotlist_id: UUID, user_id: UUID, lines: Iterable[str], buffer
+):
+    writer = csv.writer(buffer)
+    errors: List[dict] = []
+    failed = 0
+    valid = 0
+
+    reader = csv.DictReader(lines)
+    try:
+        for row in reader:
+            # Line numbers as seen in a spreadsheet, counting the header
+            line = reader.line_num
+            if valid + failed >= settings.IMPORT_MAX_ROWS:
+                raise TooManyRowsError(
+                    f"Too many rows, the limit is {settings.IMPORT_MAX_ROWS}"
+                )
+            item, messages = _parse_row(row)
+            if item is None:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"line": line, "errors": messages})
+                continue
+            valid += 1
+            writer.writerow([line] + [_copy_value(getattr(item, f)) for f in FIELDS])
+    except csv.Error as e:
+        # Nothing has been written yet, so the whole file is rejected. The
+        # DictReader's own line_num is only updated by rows that parse
+        raise CSVFormatError(f"Line {reader.reader.line_num}: {e}") from e
+
+    if valid:
+        # Keep concurrent reorders and imports of this shotlist apart
+        db.execute(
+            select(Shotlist.id).where(Shotlist.id == shotlist_id).with_for_update()
+        )
+        staging.create(db.connection())
+        buffer.seek(0)
+        cursor = db.connection().connection.cursor()
+        cursor.copy_expert(
+            f"COPY {staging.name} ({', '.join(c.name for c in staging.columns)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+        # New rows go after the existing ones, in file order
+        next_order_index = (
+            select(func.count())
+            .select_from(ShotlistItem)
+            .where(
+                ShotlistItem.shotlist_id == shotlist_id,
+                ShotlistItem.deleted_at.is_(None),
+            )
+            .scalar_subquery()
+        )
+        position = func.row_number().over(order_by=staging.c.line) - 1
+        defaults = {
+            "shot_type": "Standard",
+            "is_completed": False,
+            "duration_locked": False,
+        }
+        db.execute(
+            insert(ShotlistItem).from_select(
+                ["shotlist_id", "user_id", "order_index"] + FIELDS,
+                select(
+                    literal(shotlist_id),
+                    literal(user_id),
+                    next_order_index + position,
+                    *(
+                        (
+                            func.coalesce(staging.c[f], defaults[f])
+                            if f in defaults
+                            else staging.c[f]
+                        )
+                        for f in FIELDS
+                    ),
+                ),
+            )
+        )
+        publish_shotlist_event(db, shotlist_id, "items.imported", count=valid)
+        db.commit()
+
+    return {"imported": valid, "failed": failed, "errors": errors}
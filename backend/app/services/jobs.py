@@ -0,0 +1,44 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from uuid import UUID
+from typing import Optional
+from app.core.jobs import registry
+from app.models.job import Job, JobStatus
+
+
+def enqueue_job(db: Session, job_type: str, payload: dict, user_id: UUID = None):
+    """Queue a job of a registered type; workers pick it up once committed"""
+    if job_type not in registry:
+        raise ValueError(f"Unknown job type {job_type!r}")
+    db_job = db.scalars(
+        insert(Job)
+        .values(
+            type=job_type,
+            payload=payload,
+            user_id=user_id,
+            max_attempts=registry[job_type].max_attempts,
+        )
+        .returning(Job)
+    ).one()
+    db.commit()
+    return db_job
+
+
+def get_job(db: Session, job_id: UUID, user_id: UUID = None):
+    query = db.query(Job).filter(Job.id == job_id)
+    if user_id:
+        query = query.filter(Job.user_id == user_id)
+    return query.first()
+
+
+def get_user_jobs(
+    db: Session,
+    user_id: UUID,
+    status: Optional[JobStatus] = None,
+    skip: int = 0,
+    limit: int = 100,
+):
+    query = db.query(Job).filter(Job.user_id == user_id)
+    if status:
+        query = query.filter(Job.status == status)
+    return query.order_by(Job.created_at.desc()).offset(skip).limit(limit).all()
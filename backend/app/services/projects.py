@@ -1,60 +1,172 @@
+from sqlalchemy import func, insert, literal, select, update
 from sqlalchemy.orm import Session
 from uuid import UUID
+from typing import Optional
+from app.db.database import utc_now
 from app.models.project import Project
-from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.models.shotlist import Shotlist
+from app.models.shotlist_item import ShotlistItem
+from app.schemas.project import ProjectCreate, ProjectFilters, ProjectUpdate
+from app.services.filters import apply_sort, contains
+from app.services.shotlists import copied_columns, copy_name
 
 
 def get_project(db: Session, project_id: UUID, user_id: UUID = None):
-    query = db.query(Project).filter(Project.id == project_id)
+    query = db.query(Project).filter(
+        Project.id == project_id, Project.deleted_at.is_(None)
+    )
     if user_id:
         query = query.filter(Project.user_id == user_id)
     return query.first()
 
 
-def get_user_projects(db: Session, user_id: UUID, skip: int = 0, limit: int = 100):
-    return (
-        db.query(Project)
-        .filter(Project.user_id == user_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+def filter_projects(query, filters: Optional[ProjectFilters]):
+    if filters is None:
+        return query
+    if filters.status:
+        query = query.filter(Project.status.in_(filters.status))
+    if filters.shoot_date_from:
+        query = query.filter(Project.shoot_date >= filters.shoot_date_from)
+    if filters.shoot_date_to:
+        query = query.filter(Project.shoot_date <= filters.shoot_date_to)
+    if filters.location:
+        query = query.filter(contains(Project.location, filters.location))
+    if filters.updated_after:
+        query = query.filter(Project.updated_at >= filters.updated_after)
+    if filters.updated_before:
+        query = query.filter(Project.updated_at < filters.updated_before)
+    return apply_sort(query, Project, filters.sort and filters.sort.value)
+
+
+def get_user_projects(
+    db: Session,
+    user_id: UUID,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[ProjectFilters] = None,
+):
+    query = db.query(Project).filter(
+        Project.user_id == user_id, Project.deleted_at.is_(None)
     )
+    return filter_projects(query, filters).offset(skip).limit(limit).all()
 
 
-def get_client_projects(db: Session, client_id: UUID, skip: int = 0, limit: int = 100):
-    return (
-        db.query(Project)
-        .filter(Project.client_id == client_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+def get_client_projects(
+    db: Session,
+    client_id: UUID,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[ProjectFilters] = None,
+):
+    query = db.query(Project).filter(
+        Project.client_id == client_id, Project.deleted_at.is_(None)
     )
+    return filter_projects(query, filters).offset(skip).limit(limit).all()
 
 
 def create_project(db: Session, project: ProjectCreate, user_id: UUID):
-    db_project = Project(**project.model_dump(), user_id=user_id)
-    db.add(db_project)
+    db_project = db.scalars(
+        insert(Project)
+        .values(**project.model_dump(exclude_none=True), user_id=user_id)
+        .returning(Project)
+    ).one()
+    db.commit()
+    return db_project
+
+
+def duplicate_project(db: Session, project_id: UUID, user_id: UUID):
+    """Copy a project with all its shotlists and items, all in SQL"""
+    columns = copied_columns(Project, "name")
+    db_project = db.scalars(
+        insert(Project)
+        .from_select(
+            [c.name for c in columns] + ["name"],
+            select(*columns, copy_name(Project.name)).where(
+                Project.id == project_id,
+                Project.user_id == user_id,
+                Project.deleted_at.is_(None),
+            ),
+        )
+        .returning(Project)
+    ).first()
+    if db_project is None:
+        return None
+
+    # Pair each shotlist with a fresh id, then copy shotlists and items
+    # against that mapping in a single statement
+    mapping = (
+        select(Shotlist.id.label("old_id"), func.gen_random_uuid().label("new_id"))
+        .where(Shotlist.project_id == project_id, Shotlist.deleted_at.is_(None))
+        .cte("shotlist_ids")
+    )
+    shotlist_columns = copied_columns(Shotlist, "project_id")
+    copy_shotlists = (
+        insert(Shotlist)
+        .from_select(
+            ["id", "project_id"] + [c.name for c in shotlist_columns],
+            select(mapping.c.new_id, literal(db_project.id), *shotlist_columns).join(
+                mapping, mapping.c.old_id == Shotlist.id
+            ),
+        )
+        .cte("copied_shotlists")
+    )
+    item_columns = copied_columns(ShotlistItem, "shotlist_id")
+    db.execute(
+        insert(ShotlistItem)
+        .from_select(
+            ["shotlist_id"] + [c.name for c in item_columns],
+            select(mapping.c.new_id, *item_columns)
+            .join(mapping, mapping.c.old_id == ShotlistItem.shotlist_id)
+            .where(ShotlistItem.deleted_at.is_(None)),
+        )
+        .add_cte(copy_shotlists)
+    )
     db.commit()
-    db.refresh(db_project)
     return db_project
 
 
 def update_project(
     db: Session, project_id: UUID, project: ProjectUpdate, user_id: UUID
 ):
-    db_project = get_project(db, project_id, user_id=user_id)
-    if db_project:
-        update_data = project.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_project, field, value)
-        db.commit()
-        db.refresh(db_project)
+    db_project = db.scalars(
+        update(Project)
+        .where(
+            Project.id == project_id,
+            Project.user_id == user_id,
+            Project.deleted_at.is_(None),
+        )
+        .values(**project.model_dump(exclude_unset=True))
+        .returning(Project)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    ).first()
+    db.commit()
     return db_project
 
 
 def delete_project(db: Session, project_id: UUID, user_id: UUID):
-    db_project = get_project(db, project_id, user_id=user_id)
-    if db_project:
-        db.delete(db_project)
-        db.commit()
-    return db_project
+    """Mark the project and its shotlists deleted; app/core/purge.py removes
+    them later"""
+    now = utc_now()
+    project = (
+        update(Project)
+        .where(
+            Project.id == project_id,
+            Project.user_id == user_id,
+            Project.deleted_at.is_(None),
+        )
+        .values(deleted_at=now, updated_at=now)
+        .returning(Project.id)
+        .cte("deleted_project")
+    )
+    shotlists = (
+        update(Shotlist)
+        .where(
+            Shotlist.project_id.in_(select(project.c.id)),
+            Shotlist.deleted_at.is_(None),
+        )
+        .values(deleted_at=now, updated_at=now)
+        .cte("deleted_shotlists")
+    )
+    deleted = db.scalars(select(project.c.id).add_cte(shotlists)).first()
+    db.commit()
+    return deleted
@@ -0,0 +1,181 @@
+"""Ranked full-text search over a user's projects, shotlists and shots.
+
+Each table carries a generated, GIN-indexed ``search_vector``; queries use
+websearch syntax ("drone beach", "\"golden hour\"", "-interior"). When pg_trgm
+is installed, names also match fuzzily by word similarity so typos still find
+"Sunset Dolly" from "sunst doly".
+
+Ranking reads every matching row, so each table contributes at most
+MAX_CANDIDATES matches, the most recently updated ones; past that a query is
+too broad for the order among them to mean much, and capping keeps broad
+queries in the tens of milliseconds. Results say when a table was capped, so
+clients can ask for a narrower query instead of trusting the ranking.
+"""
+
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, literal, literal_column, null, or_, select, text, union_all
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.shotlist import Shotlist
+from app.models.shotlist_item import ShotlistItem
+from app.schemas.search import SearchResultType
+
+SEARCH_CONFIG = "english"
+MAX_CANDIDATES = 2000
+
+_trigram_available: Optional[bool] = None
+
+
+def trigram_available(db: Session) -> bool:
+    """Whether pg_trgm is installed; checked once per process"""
+    global _trigram_available
+    if _trigram_available is None:
+        _trigram_available = bool(
+            db.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ).scalar()
+        )
+    return _trigram_available
+
+
+def _match(search_vector, name, query, q: str, fuzzy: bool):
+    """WHERE clause and rank for one table, both answerable from its indexes"""
+    rank = func.ts_rank(search_vector, query)
+    condition = search_vector.op("@@")(query)
+    if fuzzy:
+        # name %> q is "q is similar to a word in name", backed by gin_trgm_ops
+        rank = rank + func.word_similarity(q, name)
+        condition = or_(condition, name.op("%>")(q))
+    return condition, rank
+
+
+RESULT_COLUMNS = ("type", "id", "title", "subtitle", "project_id", "shotlist_id")
+
+
+def _candidates(query, updated_at, id):
+    """Keep one table's most recently updated matches, numbered so that one
+    past MAX_CANDIDATES shows it was capped; no ranking needed to pick them.
+
+    ``query`` selects RESULT_COLUMNS and the rank, in that order; any of the
+    types may come first in the union, so each names its own columns.
+    """
+    order = (updated_at.desc().nulls_last(), id)
+    return (
+        query.with_only_columns(
+            *(
+                column.label(name)
+                for column, name in zip(
+                    query.selected_columns, RESULT_COLUMNS + ("rank",)
+                )
+            ),
+            func.row_number().over(order_by=order).label("candidate"),
+        )
+        .order_by(*order)
+        .limit(MAX_CANDIDATES + 1)
+    )
+
+
+def search(
+    db: Session,
+    user_id: UUID,
+    q: str,
+    types: Optional[List[SearchResultType]] = None,
+    skip: int = 0,
+    limit: int = 20,
+):
+    """Return up to ``limit`` results best first, whether more exist, and
+    whether any table had more matches than were ranked"""
+    types = set(types or SearchResultType)
+    fuzzy = trigram_available(db)
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    no_shotlist = null().cast(PG_UUID(as_uuid=True))
+
+    selects = []
+    if SearchResultType.PROJECT in types:
+        condition, rank = _match(Project.search_vector, Project.name, query, q, fuzzy)
+        selects.append(
+            _candidates(
+                select(
+                    literal_column("'project'"),
+                    Project.id,
+                    Project.name,
+                    Project.director,
+                    Project.id,
+                    no_shotlist,
+                    rank,
+                ).where(
+                    Project.user_id == user_id, Project.deleted_at.is_(None), condition
+                ),
+                Project.updated_at,
+                Project.id,
+            )
+        )
+    if SearchResultType.SHOTLIST in types:
+        condition, rank = _match(Shotlist.search_vector, Shotlist.name, query, q, fuzzy)
+        selects.append(
+            _candidates(
+                select(
+                    literal_column("'shotlist'"),
+                    Shotlist.id,
+                    Shotlist.name,
+                    Shotlist.location,
+                    Shotlist.project_id,
+                    no_shotlist,
+                    rank,
+                ).where(
+                    Shotlist.user_id == user_id,
+                    Shotlist.deleted_at.is_(None),
+                    condition,
+                ),
+                Shotlist.updated_at,
+                Shotlist.id,
+            )
+        )
+    if SearchResultType.SHOT in types:
+        condition, rank = _match(
+            ShotlistItem.search_vector, ShotlistItem.shot_name, query, q, fuzzy
+        )
+        selects.append(
+            _candidates(
+                select(
+                    literal_column("'shot'"),
+                    ShotlistItem.id,
+                    ShotlistItem.shot_name,
+                    ShotlistItem.shot_description,
+                    Shotlist.project_id,
+                    ShotlistItem.shotlist_id,
+                    rank,
+                )
+                .join(Shotlist, Shotlist.id == ShotlistItem.shotlist_id)
+                .where(
+                    ShotlistItem.user_id == user_id,
+                    ShotlistItem.deleted_at.is_(None),
+                    Shotlist.deleted_at.is_(None),
+                    condition,
+                ),
+                ShotlistItem.updated_at,
+                ShotlistItem.id,
+            )
+        )
+
+    results = union_all(*selects).cte("results")
+    truncated = (
+        select(results.c.id).where(results.c.candidate > MAX_CANDIDATES).exists()
+    )
+    # One extra row tells whether there is another page, without a COUNT
+    rows = db.execute(
+        select(
+            *(c for c in results.c if c.name != "candidate"),
+            truncated.label("truncated"),
+        )
+        .where(results.c.candidate <= MAX_CANDIDATES)
+        .order_by(results.c.rank.desc(), results.c.title, results.c.id)
+        .offset(skip)
+        .limit(limit + 1)
+    ).all()
+    truncated = bool(rows) and rows[0].truncated
+    return [row._asdict() for row in rows[:limit]], len(rows) > limit, truncated
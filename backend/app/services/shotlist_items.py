@@ -1,85 +1,255 @@
+from sqlalchemy import (
+    Integer,
+    Time,
+    and_,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
 from sqlalchemy.orm import Session
 from uuid import UUID
-from datetime import time, datetime, timedelta
+from datetime import time, datetime, timedelta, timezone
 from typing import Optional
-from app.models.shotlist_item import ShotlistItem
+from app.core.config import settings
+from app.core.events import publish_shotlist_event
+from app.db.database import utc_now
 from app.models.shotlist import Shotlist
-from app.models.project import Project
+from app.models.shotlist_item import ShotlistItem
+from app.models.shotlist_item_tombstone import ShotlistItemTombstone
 from app.schemas.shotlist_item import (
+    ShotlistItem as ShotlistItemSchema,
     ShotlistItemCreate,
     ShotlistItemUpdate,
     ReorderRequest,
 )
 
+# Items addressed by id are hidden when deleted themselves or with their
+# shotlist; lists by shotlist only check the item, the shotlist is looked up
+# first
+visible = and_(
+    ShotlistItem.deleted_at.is_(None),
+    select(Shotlist.id)
+    .where(Shotlist.id == ShotlistItem.shotlist_id, Shotlist.deleted_at.is_(None))
+    .exists(),
+)
+
 
-def get_shotlist_item(db: Session, item_id: UUID, user_id: UUID = None):
-    query = db.query(ShotlistItem).filter(ShotlistItem.id == item_id)
+def by_id(item_id: UUID, shotlist_id: Optional[UUID] = None):
+    """Match one item. Give its shotlist when known: the id alone can't be
+    pruned to a partition, so it is looked up in all of them"""
+    if shotlist_id is None:
+        return ShotlistItem.id == item_id
+    return and_(ShotlistItem.id == item_id, ShotlistItem.shotlist_id == shotlist_id)
+
+
+def get_shotlist_item(
+    db: Session,
+    item_id: UUID,
+    user_id: UUID = None,
+    shotlist_id: Optional[UUID] = None,
+):
+    query = db.query(ShotlistItem).filter(by_id(item_id, shotlist_id), visible)
     if user_id:
-        query = query.join(Shotlist).join(Project).filter(Project.user_id == user_id)
+        query = query.filter(ShotlistItem.user_id == user_id)
     return query.first()
 
 
-def get_shotlist_items(db: Session, shotlist_id: UUID):
+def get_shotlist_items(
+    db: Session, shotlist_id: UUID, properties: Optional[dict] = None
+):
+    query = db.query(ShotlistItem).filter(
+        ShotlistItem.shotlist_id == shotlist_id, ShotlistItem.deleted_at.is_(None)
+    )
+    if properties:
+        # Items whose custom properties include all of these
+        query = query.filter(ShotlistItem.custom_properties.contains(properties))
+    return query.order_by(ShotlistItem.order_index).all()
+
+
+def get_user_items_by_properties(
+    db: Session, user_id: UUID, properties: dict, skip: int = 0, limit: int = 100
+):
+    """A user's items, across their shotlists, whose custom properties contain
+    ``properties``; the GIN index finds them without reading the user's other
+    items"""
     return (
         db.query(ShotlistItem)
-        .filter(ShotlistItem.shotlist_id == shotlist_id)
-        .order_by(ShotlistItem.order_index)
+        .join(Shotlist, Shotlist.id == ShotlistItem.shotlist_id)
+        .filter(
+            ShotlistItem.user_id == user_id,
+            ShotlistItem.custom_properties.contains(properties),
+            ShotlistItem.deleted_at.is_(None),
+            Shotlist.deleted_at.is_(None),
+        )
+        .order_by(ShotlistItem.shotlist_id, ShotlistItem.order_index)
+        .offset(skip)
+        .limit(limit)
         .all()
     )
 
 
-def create_shotlist_item(db: Session, item: ShotlistItemCreate, shotlist_id: UUID):
-    # Get the max order index for this shotlist
-    max_order = (
-        db.query(ShotlistItem).filter(ShotlistItem.shotlist_id == shotlist_id).count()
+def encode_sync_token(moment: datetime) -> str:
+    return str(int(moment.replace(tzinfo=timezone.utc).timestamp() * 1_000_000))
+
+
+def decode_sync_token(token: str) -> Optional[datetime]:
+    try:
+        moment = datetime.fromtimestamp(int(token) / 1_000_000, timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        return None
+    return moment.replace(tzinfo=None)
+
+
+def new_sync_token() -> str:
+    # Step back so rows written by transactions still in flight are re-sent
+    return encode_sync_token(
+        datetime.utcnow() - timedelta(seconds=settings.SYNC_TOKEN_OVERLAP_SECONDS)
     )
 
-    db_item = ShotlistItem(
-        **item.dict(), shotlist_id=shotlist_id, order_index=max_order
+
+def get_shotlist_item_changes(db: Session, shotlist_id: UUID, since: datetime):
+    token = new_sync_token()
+    retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    if since < datetime.utcnow() - retention:
+        items = get_shotlist_items(db, shotlist_id)
+        return {"items": items, "deleted": [], "token": token, "reset": True}
+
+    items = (
+        db.query(ShotlistItem)
+        .filter(
+            ShotlistItem.shotlist_id == shotlist_id,
+            ShotlistItem.updated_at > since,
+            ShotlistItem.deleted_at.is_(None),
+        )
+        .order_by(ShotlistItem.order_index)
+        .all()
+    )
+    deleted = [
+        item_id
+        for (item_id,) in db.query(ShotlistItemTombstone.item_id).filter(
+            ShotlistItemTombstone.shotlist_id == shotlist_id,
+            ShotlistItemTombstone.deleted_at > since,
+        )
+    ]
+    return {"items": items, "deleted": deleted, "token": token, "reset": False}
+
+
+def create_shotlist_item(
+    db: Session, item: ShotlistItemCreate, shotlist_id: UUID, user_id: UUID
+):
+    # New items go to the end; the count is taken inside the INSERT
+    next_order_index = (
+        select(func.count())
+        .select_from(ShotlistItem)
+        .where(
+            ShotlistItem.shotlist_id == shotlist_id, ShotlistItem.deleted_at.is_(None)
+        )
+        .scalar_subquery()
+    )
+    db_item = db.scalars(
+        insert(ShotlistItem)
+        .values(
+            **item.model_dump(exclude_none=True),
+            shotlist_id=shotlist_id,
+            user_id=user_id,
+            order_index=next_order_index,
+        )
+        .returning(ShotlistItem)
+    ).one()
+    publish_shotlist_event(
+        db,
+        shotlist_id,
+        "item.created",
+        item=ShotlistItemSchema.model_validate(db_item).model_dump(mode="json"),
     )
-    db.add(db_item)
     db.commit()
-    db.refresh(db_item)
     return db_item
 
 
 def update_shotlist_item(
-    db: Session, item_id: UUID, item: ShotlistItemUpdate, user_id: UUID
+    db: Session,
+    item_id: UUID,
+    item: ShotlistItemUpdate,
+    user_id: UUID,
+    shotlist_id: Optional[UUID] = None,
 ):
-    db_item = get_shotlist_item(db, item_id, user_id=user_id)
+    db_item = db.scalars(
+        update(ShotlistItem)
+        .where(by_id(item_id, shotlist_id), ShotlistItem.user_id == user_id, visible)
+        .values(**item.model_dump(exclude_unset=True))
+        .returning(ShotlistItem)
+        # The row may already be in the session (upload_image loads it first);
+        # overwrite it with what RETURNING sent back instead of keeping stale
+        # values
+        .execution_options(synchronize_session=False, populate_existing=True)
+    ).first()
     if db_item:
-        update_data = item.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_item, field, value)
-        db.commit()
-        db.refresh(db_item)
+        publish_shotlist_event(
+            db,
+            db_item.shotlist_id,
+            "item.updated",
+            item_id=str(db_item.id),
+            changes=item.model_dump(mode="json", exclude_unset=True),
+            updated_at=db_item.updated_at.isoformat(),
+        )
+    db.commit()
     return db_item
 
 
-def delete_shotlist_item(db: Session, item_id: UUID, user_id: UUID):
-    db_item = get_shotlist_item(db, item_id, user_id=user_id)
-    if db_item:
-        shotlist_id = db_item.shotlist_id
-        order_index = db_item.order_index
-
-        # Delete the item
-        db.delete(db_item)
+def delete_shotlist_item(
+    db: Session, item_id: UUID, user_id: UUID, shotlist_id: Optional[UUID] = None
+):
+    # Hidden now, removed by app/core/purge.py
+    deleted = db.execute(
+        update(ShotlistItem)
+        .where(by_id(item_id, shotlist_id), ShotlistItem.user_id == user_id, visible)
+        .values(deleted_at=utc_now())
+        .returning(ShotlistItem.shotlist_id, ShotlistItem.order_index)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if deleted is None:
+        return None
+    shotlist_id, order_index = deleted
 
-        # Update order indices for remaining items
-        remaining_items = (
-            db.query(ShotlistItem)
-            .filter(
-                ShotlistItem.shotlist_id == shotlist_id,
-                ShotlistItem.order_index > order_index,
-            )
-            .all()
+    # Close the gap left in the ordering
+    db.execute(
+        update(ShotlistItem)
+        .where(
+            ShotlistItem.shotlist_id == shotlist_id,
+            ShotlistItem.order_index > order_index,
+            ShotlistItem.deleted_at.is_(None),
         )
+        .values(order_index=ShotlistItem.order_index - 1)
+        .execution_options(synchronize_session=False)
+    )
 
-        for item in remaining_items:
-            item.order_index -= 1
+    # Leave a tombstone for delta sync and drop ones past retention
+    db.execute(
+        pg_insert(ShotlistItemTombstone)
+        .values(item_id=item_id, shotlist_id=shotlist_id)
+        .on_conflict_do_update(
+            index_elements=[ShotlistItemTombstone.item_id],
+            set_={"deleted_at": utc_now()},
+        )
+    )
+    retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    db.execute(
+        delete(ShotlistItemTombstone).where(
+            ShotlistItemTombstone.shotlist_id == shotlist_id,
+            ShotlistItemTombstone.deleted_at < datetime.utcnow() - retention,
+        )
+    )
 
-        db.commit()
-    return db_item
+    publish_shotlist_event(db, shotlist_id, "item.deleted", item_id=str(item_id))
+    db.commit()
+    return deleted
 
 
 def reorder_shotlist_items(
@@ -89,29 +259,90 @@ def reorder_shotlist_items(
     call_time: Optional[time] = None,
     user_id: UUID = None,
 ):
-    # Verify each item belongs to the user before reordering
-    for item_reorder in reorder_request.items:
-        db_item = get_shotlist_item(db, item_reorder.item_id, user_id=user_id)
-        if db_item and db_item.shotlist_id == shotlist_id:
-            db_item.order_index = item_reorder.new_index
+    # Serialize reorders of a shotlist: concurrent ones would otherwise lock
+    # the same item rows in different orders and deadlock
+    db.execute(select(Shotlist.id).where(Shotlist.id == shotlist_id).with_for_update())
 
-    db.commit()
+    # Apply every new index in one UPDATE ... FROM (VALUES ...)
+    if reorder_request.items:
+        new_order = values(
+            column("item_id", PG_UUID(as_uuid=True)),
+            column("new_index", Integer),
+            name="new_order",
+        ).data([(r.item_id, r.new_index) for r in reorder_request.items])
+        stmt = (
+            update(ShotlistItem)
+            .where(
+                ShotlistItem.id == new_order.c.item_id,
+                ShotlistItem.shotlist_id == shotlist_id,
+                ShotlistItem.deleted_at.is_(None),
+            )
+            .values(order_index=new_order.c.new_index)
+            .execution_options(synchronize_session=False)
+        )
+        if user_id:
+            stmt = stmt.where(ShotlistItem.user_id == user_id)
+        db.execute(stmt)
+
+    # Recalculate start times if call_time is provided: each timed shot
+    # starts when the timed shots before it are done, all in one UPDATE
+    if call_time:
+        minutes_before = (
+            select(
+                ShotlistItem.id,
+                (
+                    func.sum(ShotlistItem.shot_duration).over(
+                        order_by=(ShotlistItem.order_index, ShotlistItem.id)
+                    )
+                    - ShotlistItem.shot_duration
+                ).label("minutes"),
+            )
+            .where(
+                ShotlistItem.shotlist_id == shotlist_id,
+                ShotlistItem.deleted_at.is_(None),
+                ShotlistItem.shot_duration > 0,
+            )
+            .subquery("minutes_before")
+        )
+        db.execute(
+            update(ShotlistItem)
+            .where(
+                ShotlistItem.id == minutes_before.c.id,
+                ShotlistItem.shotlist_id == shotlist_id,
+            )
+            .values(
+                start_time=literal(call_time, Time)
+                + func.make_interval(
+                    0, 0, 0, 0, 0, cast(minutes_before.c.minutes, Integer)
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
 
     # Get all items in new order
     items = (
         db.query(ShotlistItem)
-        .filter(ShotlistItem.shotlist_id == shotlist_id)
+        .filter(
+            ShotlistItem.shotlist_id == shotlist_id, ShotlistItem.deleted_at.is_(None)
+        )
         .order_by(ShotlistItem.order_index)
+        .populate_existing()
         .all()
     )
 
-    # Recalculate start times if call_time is provided
-    if call_time:
-        current_time = datetime.combine(datetime.today(), call_time)
-        for item in items:
-            if item.shot_duration:
-                item.start_time = current_time.time()
-                current_time += timedelta(minutes=item.shot_duration)
-        db.commit()
+    publish_shotlist_event(
+        db,
+        shotlist_id,
+        "items.reordered",
+        items=[
+            {
+                "id": str(item.id),
+                "order_index": item.order_index,
+                "start_time": item.start_time.isoformat() if item.start_time else None,
+            }
+            for item in items
+        ],
+    )
+    db.commit()
 
     return items
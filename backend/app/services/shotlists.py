@@ -1,53 +1,146 @@
+from sqlalchemy import func, insert, literal, select, update
 from sqlalchemy.orm import Session
 from uuid import UUID
+from typing import Optional
+from app.db.database import utc_now
 from app.models.shotlist import Shotlist
-from app.models.project import Project
-from app.schemas.shotlist import ShotlistCreate, ShotlistUpdate
+from app.models.shotlist_item import ShotlistItem
+from app.schemas.shotlist import ShotlistCreate, ShotlistFilters, ShotlistUpdate
+from app.services.filters import apply_sort, contains
 
 
 def get_shotlist(db: Session, shotlist_id: UUID, user_id: UUID = None):
-    query = db.query(Shotlist).filter(Shotlist.id == shotlist_id)
+    query = db.query(Shotlist).filter(
+        Shotlist.id == shotlist_id, Shotlist.deleted_at.is_(None)
+    )
     if user_id:
-        query = query.join(Project).filter(Project.user_id == user_id)
+        query = query.filter(Shotlist.user_id == user_id)
     return query.first()
 
 
+def filter_shotlists(query, filters: Optional[ShotlistFilters]):
+    if filters is None:
+        return query
+    if filters.shooting_date_from:
+        query = query.filter(Shotlist.shooting_date >= filters.shooting_date_from)
+    if filters.shooting_date_to:
+        query = query.filter(Shotlist.shooting_date <= filters.shooting_date_to)
+    if filters.location:
+        query = query.filter(contains(Shotlist.location, filters.location))
+    if filters.updated_after:
+        query = query.filter(Shotlist.updated_at >= filters.updated_after)
+    if filters.updated_before:
+        query = query.filter(Shotlist.updated_at < filters.updated_before)
+    return apply_sort(query, Shotlist, filters.sort and filters.sort.value)
+
+
 def get_project_shotlists(
-    db: Session, project_id: UUID, skip: int = 0, limit: int = 100
+    db: Session,
+    project_id: UUID,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[ShotlistFilters] = None,
 ):
-    return (
-        db.query(Shotlist)
-        .filter(Shotlist.project_id == project_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    query = db.query(Shotlist).filter(
+        Shotlist.project_id == project_id, Shotlist.deleted_at.is_(None)
     )
+    return filter_shotlists(query, filters).offset(skip).limit(limit).all()
 
 
-def create_shotlist(db: Session, shotlist: ShotlistCreate, project_id: UUID):
-    db_shotlist = Shotlist(**shotlist.dict(), project_id=project_id)
-    db.add(db_shotlist)
+def create_shotlist(
+    db: Session, shotlist: ShotlistCreate, project_id: UUID, user_id: UUID
+):
+    db_shotlist = db.scalars(
+        insert(Shotlist)
+        .values(
+            **shotlist.model_dump(exclude_none=True),
+            project_id=project_id,
+            user_id=user_id,
+        )
+        .returning(Shotlist)
+    ).one()
+    db.commit()
+    return db_shotlist
+
+
+def copied_columns(model, *exclude: str):
+    """Columns a duplicate takes from its original: not the key, timestamps,
+    generated columns or the ones named in ``exclude``"""
+    skip = {"id", "created_at", "updated_at", "deleted_at", *exclude}
+    return [
+        column
+        for column in model.__table__.columns
+        if column.name not in skip and column.computed is None
+    ]
+
+
+def copy_name(name_column):
+    return func.left(name_column + " (copy)", 255)
+
+
+def duplicate_shotlist(db: Session, shotlist_id: UUID, user_id: UUID):
+    """Copy a shotlist and its items next to the original, all in SQL"""
+    columns = copied_columns(Shotlist, "name")
+    db_shotlist = db.scalars(
+        insert(Shotlist)
+        .from_select(
+            [c.name for c in columns] + ["name"],
+            select(*columns, copy_name(Shotlist.name)).where(
+                Shotlist.id == shotlist_id,
+                Shotlist.user_id == user_id,
+                Shotlist.deleted_at.is_(None),
+            ),
+        )
+        .returning(Shotlist)
+    ).first()
+    if db_shotlist is None:
+        return None
+
+    # order_index, custom_properties and image references come along as-is
+    item_columns = copied_columns(ShotlistItem, "shotlist_id")
+    db.execute(
+        insert(ShotlistItem).from_select(
+            [c.name for c in item_columns] + ["shotlist_id"],
+            select(*item_columns, literal(db_shotlist.id)).where(
+                ShotlistItem.shotlist_id == shotlist_id,
+                ShotlistItem.deleted_at.is_(None),
+            ),
+        )
+    )
     db.commit()
-    db.refresh(db_shotlist)
     return db_shotlist
 
 
 def update_shotlist(
     db: Session, shotlist_id: UUID, shotlist: ShotlistUpdate, user_id: UUID
 ):
-    db_shotlist = get_shotlist(db, shotlist_id, user_id=user_id)
-    if db_shotlist:
-        update_data = shotlist.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_shotlist, field, value)
-        db.commit()
-        db.refresh(db_shotlist)
+    db_shotlist = db.scalars(
+        update(Shotlist)
+        .where(
+            Shotlist.id == shotlist_id,
+            Shotlist.user_id == user_id,
+            Shotlist.deleted_at.is_(None),
+        )
+        .values(**shotlist.model_dump(exclude_unset=True))
+        .returning(Shotlist)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    ).first()
+    db.commit()
     return db_shotlist
 
 
 def delete_shotlist(db: Session, shotlist_id: UUID, user_id: UUID):
-    db_shotlist = get_shotlist(db, shotlist_id, user_id=user_id)
-    if db_shotlist:
-        db.delete(db_shotlist)
-        db.commit()
-    return db_shotlist
+    # Its items are hidden with it; app/core/purge.py removes both later
+    deleted = db.scalars(
+        update(Shotlist)
+        .where(
+            Shotlist.id == shotlist_id,
+            Shotlist.user_id == user_id,
+            Shotlist.deleted_at.is_(None),
+        )
+        .values(deleted_at=utc_now())
+        .returning(Shotlist.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.commit()
+    return deleted
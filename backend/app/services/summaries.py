@@ -0,0 +1,74 @@
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+from uuid import UUID
+from app.models.project import Project, ProjectStatus
+from app.models.shotlist import Shotlist
+from app.models.shotlist_item import ShotlistItem
+
+
+def get_project_summary(db: Session, project_id: UUID):
+    """Shot counts and durations per shotlist, aggregated in one query"""
+    rows = db.execute(
+        select(
+            Shotlist.id,
+            Shotlist.name,
+            Shotlist.shooting_date,
+            func.count(ShotlistItem.id),
+            func.count(ShotlistItem.id).filter(ShotlistItem.is_completed),
+            func.coalesce(func.sum(ShotlistItem.shot_duration), 0),
+        )
+        .outerjoin(
+            ShotlistItem,
+            and_(
+                ShotlistItem.shotlist_id == Shotlist.id,
+                ShotlistItem.deleted_at.is_(None),
+            ),
+        )
+        .where(Shotlist.project_id == project_id, Shotlist.deleted_at.is_(None))
+        .group_by(Shotlist.id)
+        .order_by(Shotlist.shooting_date.nulls_last(), Shotlist.name, Shotlist.id)
+    ).all()
+
+    shotlists = [
+        {
+            "shotlist_id": shotlist_id,
+            "name": name,
+            "shooting_date": shooting_date,
+            "shot_count": shots,
+            "completed_count": completed,
+            "remaining_count": shots - completed,
+            "total_duration": duration,
+        }
+        for shotlist_id, name, shooting_date, shots, completed, duration in rows
+    ]
+    totals = {
+        key: sum(s[key] for s in shotlists)
+        for key in (
+            "shot_count",
+            "completed_count",
+            "remaining_count",
+            "total_duration",
+        )
+    }
+    return {
+        "project_id": project_id,
+        "shotlist_count": len(shotlists),
+        "shotlists": shotlists,
+        **totals,
+    }
+
+
+def get_dashboard_summary(db: Session, user_id: UUID):
+    counts = dict(
+        db.execute(
+            select(Project.status, func.count())
+            .where(Project.user_id == user_id, Project.deleted_at.is_(None))
+            .group_by(Project.status)
+        ).all()
+    )
+    # Every status is listed, including ones with no projects
+    by_status = {status.value: counts.get(status, 0) for status in ProjectStatus}
+    return {
+        "project_count": sum(counts.values()),
+        "projects_by_status": by_status,
+    }
@@ -0,0 +1,305 @@
+"""Compare hash-partitioned and plain layouts of shotlist_items at scale.
+
+Builds two copies of the items table in a scratch schema of the database in
+DATABASE_URL, one partitioned like the real table and one plain, and fills
+both with the same generated rows. Then times, against each, the statements
+the item endpoints issue: list a shotlist, count it to place a new item,
+reorder two items, fetch an item by id, and a vacuum after that churn.
+
+    python -m benchmarks.partitioning --rows 50000000 --output partitioning.json
+
+50M rows take tens of GB of disk and a long time to load; ``--rows 1000000``
+gives a quick run. The scratch schema is dropped at the end unless
+``--keep-data``, so a kept one can be reused with ``--skip-load``.
+"""
+
+import argparse
+import hashlib
+import json
+import platform
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from sqlalchemy import text
+
+from benchmarks.run import git_revision, percentile
+
+SCHEMA = "bench_partitioning"
+LAYOUTS = ["plain", "partitioned"]
+LOAD_CHUNK = 1_000_000
+
+# Rows are numbered; shotlist and item ids derive from the numbers, so both
+# layouts hold identical data and any run can find them again
+SHOTLIST_ID = "md5('shotlist' || {n} / {per})::uuid"
+ITEM_ID = "md5('item' || {n})::uuid"
+
+
+def create_tables(conn, partitions: int):
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    # Without INCLUDING GENERATED the search vector is a plain, empty column:
+    # its cost is the same for both layouts and would only slow the load
+    like = "(LIKE public.shotlist_items INCLUDING DEFAULTS)"
+    conn.execute(text(f"CREATE TABLE {SCHEMA}.plain {like}"))
+    conn.execute(
+        text(
+            f"CREATE TABLE {SCHEMA}.partitioned {like} "
+            "PARTITION BY HASH (shotlist_id)"
+        )
+    )
+    for remainder in range(partitions):
+        conn.execute(
+            text(
+                f"CREATE TABLE {SCHEMA}.partitioned_p{remainder} "
+                f"PARTITION OF {SCHEMA}.partitioned "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            )
+        )
+
+
+def load_rows(conn, rows: int, per_shotlist: int):
+    started = time.perf_counter()
+    for first in range(0, rows, LOAD_CHUNK):
+        last = min(first + LOAD_CHUNK, rows) - 1
+        for layout in LAYOUTS:
+            conn.execute(
+                text(
+                    f"INSERT INTO {SCHEMA}.{layout} (id, shotlist_id, user_id, "
+                    "shot_name, shot_duration, notes, order_index, "
+                    "is_completed, duration_locked) "
+                    f"SELECT {ITEM_ID.format(n='n')}, "
+                    f"{SHOTLIST_ID.format(n='n', per=per_shotlist)}, "
+                    "md5('benchmark')::uuid, 'Shot ' || n, 5 + n % 25, "
+                    f"repeat('note ', n % 20), n % {per_shotlist}, false, false "
+                    f"FROM generate_series({first}, {last}) AS n"
+                )
+            )
+        conn.commit()
+        print(f"  loaded {last + 1} rows ({time.perf_counter() - started:.0f}s)")
+
+
+def create_indexes(conn):
+    # The production indexes, built after the load
+    for layout in LAYOUTS:
+        key = "id" if layout == "plain" else "id, shotlist_id"
+        table = f"{SCHEMA}.{layout}"
+        conn.execute(text(f"ALTER TABLE {table} ADD PRIMARY KEY ({key})"))
+        conn.execute(
+            text(
+                f"CREATE INDEX ON {table} (shotlist_id, order_index) "
+                "WHERE deleted_at IS NULL"
+            )
+        )
+        conn.execute(text(f"CREATE INDEX ON {table} (shotlist_id, updated_at)"))
+        conn.execute(text(f"CREATE INDEX ON {table} (user_id)"))
+    conn.commit()
+
+
+def vacuum(engine, table: str) -> float:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        started = time.perf_counter()
+        conn.execute(text(f"VACUUM (ANALYZE) {table}"))
+        return time.perf_counter() - started
+
+
+def table_size(conn, layout: str) -> int:
+    # pg_total_relation_size is 0 for a partitioned parent, so add up its
+    # leaves; a plain table has none
+    size = conn.execute(
+        text(
+            "SELECT coalesce(sum(pg_total_relation_size(relid)), "
+            "pg_total_relation_size(CAST(:table AS regclass))) "
+            "FROM pg_partition_tree(:table) WHERE isleaf"
+        ),
+        {"table": f"{SCHEMA}.{layout}"},
+    ).scalar()
+    return int(size)
+
+
+def derived_id(prefix: str, n: int) -> str:
+    """The id SHOTLIST_ID or ITEM_ID gives in SQL"""
+    return str(uuid.UUID(hashlib.md5(f"{prefix}{n}".encode()).hexdigest()))
+
+
+def build_operations(rows: int, per_shotlist: int) -> Dict[str, Callable]:
+    """Each operation takes (conn, table, rng) and runs one statement"""
+    shotlists = max(1, rows // per_shotlist)
+    shotlist_id = lambda rng: derived_id("shotlist", rng.randrange(shotlists))
+
+    def list_items(conn, table, rng):
+        conn.execute(
+            text(
+                f"SELECT * FROM {table} WHERE shotlist_id = :shotlist_id "
+                "AND deleted_at IS NULL ORDER BY order_index"
+            ),
+            {"shotlist_id": shotlist_id(rng)},
+        ).fetchall()
+
+    def count_items(conn, table, rng):
+        conn.execute(
+            text(
+                f"SELECT count(*) FROM {table} "
+                "WHERE shotlist_id = :shotlist_id AND deleted_at IS NULL"
+            ),
+            {"shotlist_id": shotlist_id(rng)},
+        ).scalar()
+
+    def reorder(conn, table, rng):
+        conn.execute(
+            text(
+                f"UPDATE {table} SET order_index = 1 - order_index "
+                "WHERE shotlist_id = :shotlist_id "
+                "AND order_index IN (0, 1) AND deleted_at IS NULL"
+            ),
+            {"shotlist_id": shotlist_id(rng)},
+        )
+        conn.commit()
+
+    def read_item(conn, table, rng):
+        # Addressed by id alone, as /shotlist-items/{id} is: no pruning, one
+        # primary key probe per partition
+        conn.execute(
+            text(f"SELECT * FROM {table} WHERE id = :id"),
+            {"id": derived_id("item", rng.randrange(rows))},
+        ).fetchall()
+
+    return {
+        "list_items": list_items,
+        "count_items": count_items,
+        "reorder": reorder,
+        "read_item": read_item,
+    }
+
+
+def time_operation(conn, operation, table, iterations: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation(conn, table, rng)
+        latencies.append(time.perf_counter() - start)
+    conn.rollback()
+    latencies.sort()
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "mean_ms": ms(sum(latencies) / len(latencies)),
+    }
+
+
+def benchmark(args) -> dict:
+    from app.db.database import engine
+    from app.models.shotlist_item import PARTITIONS
+
+    if not args.skip_load:
+        print(f"Loading {args.rows} rows into each layout")
+        with engine.connect() as conn:
+            create_tables(conn, PARTITIONS)
+            conn.commit()
+            load_rows(conn, args.rows, args.items_per_shotlist)
+            create_indexes(conn)
+        for layout in LAYOUTS:
+            vacuum(engine, f"{SCHEMA}.{layout}")
+
+    results = {
+        "meta": {
+            "rows": args.rows,
+            "items_per_shotlist": args.items_per_shotlist,
+            "partitions": PARTITIONS,
+            "iterations": args.iterations,
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "layouts": {layout: {"operations": {}} for layout in LAYOUTS},
+    }
+    operations = build_operations(args.rows, args.items_per_shotlist)
+    try:
+        with engine.connect() as conn:
+            for name, operation in operations.items():
+                for layout in LAYOUTS:
+                    # Warm the cache, then time the same shotlists and items
+                    time_operation(
+                        conn, operation, f"{SCHEMA}.{layout}", 20, args.seed + 1
+                    )
+                    results["layouts"][layout]["operations"][name] = time_operation(
+                        conn,
+                        operation,
+                        f"{SCHEMA}.{layout}",
+                        args.iterations,
+                        args.seed,
+                    )
+                print(f"  {name}: done")
+            for layout in LAYOUTS:
+                results["layouts"][layout]["size_bytes"] = table_size(conn, layout)
+            conn.commit()
+
+        # The reorders above left dead tuples behind. Autovacuum works one
+        # leaf table at a time, so a partition is what it has to get through
+        results["layouts"]["plain"]["vacuum_s"] = round(
+            vacuum(engine, f"{SCHEMA}.plain"), 3
+        )
+        results["layouts"]["partitioned"]["vacuum_s"] = round(
+            vacuum(engine, f"{SCHEMA}.partitioned_p0"), 3
+        )
+    finally:
+        if not args.keep_data:
+            with engine.connect() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+                conn.commit()
+    return results
+
+
+def print_table(results: dict):
+    plain = results["layouts"]["plain"]
+    partitioned = results["layouts"]["partitioned"]
+    print(
+        f"{'operation':<16}{'plain p50':>12}{'plain p95':>12}"
+        f"{'part. p50':>12}{'part. p95':>12}{'p95 change':>12}"
+    )
+    for name, a in plain["operations"].items():
+        b = partitioned["operations"][name]
+        delta = ""
+        if a["p95_ms"]:
+            delta = f"{(b['p95_ms'] / a['p95_ms'] - 1) * 100:+.0f}%"
+        print(
+            f"{name:<16}{a['p50_ms']:>12}{a['p95_ms']:>12}"
+            f"{b['p50_ms']:>12}{b['p95_ms']:>12}{delta:>12}"
+        )
+    print(
+        f"vacuum: {plain['vacuum_s']}s for the plain table, "
+        f"{partitioned['vacuum_s']}s per partition"
+    )
+    print(
+        f"size: {plain['size_bytes'] / 2**20:.0f} MB plain, "
+        f"{partitioned['size_bytes'] / 2**20:.0f} MB partitioned"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--items-per-shotlist", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--keep-data", action="store_true")
+    parser.add_argument(
+        "--skip-load", action="store_true", help="reuse data kept by --keep-data"
+    )
+    args = parser.parse_args()
+
+    results = benchmark(args)
+    print_table(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""Latency and throughput benchmarks for the hot API endpoints.
+
+Seeds a fresh benchmark user at the chosen scale, then drives the real app from
+``main.py`` in-process (or a running server with ``--base-url``) against the
+database in DATABASE_URL, which must be migrated. Requests authenticate with a
+signed session cookie, so they go through the same auth path as the frontend.
+
+    python -m benchmarks.run --scale small --output results.json \\
+        --baseline benchmarks/baseline.json
+
+Exits non-zero when a scenario's p95 latency or throughput regresses past the
+tolerance against the baseline. ``--save-baseline`` records a new one.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from base64 import b64encode
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import httpx
+from itsdangerous import TimestampSigner
+from PIL import Image
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[rank]
+
+
+def session_cookie(secret: str, user_id) -> str:
+    # Same encoding as Starlette's SessionMiddleware
+    data = b64encode(json.dumps({"user_id": str(user_id)}).encode("utf-8"))
+    return TimestampSigner(secret).sign(data).decode("utf-8")
+
+
+def sample_image() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (1600, 900), (120, 80, 40)).save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def build_scenarios(dataset) -> Dict[str, Callable]:
+    """Each scenario takes (client, rng) and issues one request"""
+    shotlist_ids = list(dataset.hot_items)
+    image = sample_image()
+
+    def list_items(client, rng):
+        return client.get(f"/api/shotlists/{rng.choice(shotlist_ids)}/items")
+
+    def read_shotlist(client, rng):
+        return client.get(f"/api/shotlists/{rng.choice(shotlist_ids)}")
+
+    def update_item(client, rng):
+        item_id = rng.choice(dataset.hot_items[rng.choice(shotlist_ids)])
+        return client.put(
+            f"/api/shotlist-items/{item_id}",
+            json={"notes": f"benchmark note {rng.random()}"},
+        )
+
+    def reorder(client, rng):
+        shotlist_id = rng.choice(shotlist_ids)
+        items = dataset.hot_items[shotlist_id]
+        first, second = rng.sample(range(len(items)), 2)
+        return client.put(
+            f"/api/shotlists/{shotlist_id}/items/reorder",
+            json={
+                "items": [
+                    {"item_id": str(items[first]), "new_index": second},
+                    {"item_id": str(items[second]), "new_index": first},
+                ]
+            },
+        )
+
+    def upload_image(client, rng):
+        item_id = rng.choice(dataset.hot_items[rng.choice(shotlist_ids)])
+        return client.post(
+            f"/api/shotlist-items/{item_id}/upload-image",
+            files={"file": ("reference.jpg", image, "image/jpeg")},
+        )
+
+    def delete_client(client, rng):
+        # Every request removes a different client with thousands of items
+        return client.delete(f"/api/clients/{dataset.disposable_clients.pop()}")
+
+    return {
+        "list_items": list_items,
+        "read_shotlist": read_shotlist,
+        "update_item": update_item,
+        "reorder": reorder,
+        "upload_image": upload_image,
+        "delete_client": delete_client,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Callable,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int,
+) -> dict:
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        await scenario(client, rng)
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker(worker_rng: random.Random):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await scenario(client, worker_rng)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(worker(random.Random(seed * 1000 + n)) for n in range(concurrency))
+    )
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda seconds: round(seconds * 1000, 2)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "mean_ms": ms(sum(latencies) / len(latencies)),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Scenarios that got slower or lost throughput beyond the tolerance"""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']}ms vs baseline {previous['p95_ms']}ms"
+            )
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['throughput_rps']} req/s vs baseline "
+                f"{previous['throughput_rps']} req/s"
+            )
+    return regressions
+
+
+def print_table(results: dict, baseline: dict = None):
+    print(
+        f"{'scenario':<16}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'req/s':>10}{'errors':>8}{'p95 vs base':>13}"
+    )
+    for name, r in results["scenarios"].items():
+        delta = ""
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if previous and previous["p95_ms"]:
+            delta = f"{(r['p95_ms'] / previous['p95_ms'] - 1) * 100:+.0f}%"
+        print(
+            f"{name:<16}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}"
+            f"{r['throughput_rps']:>10}{r['errors']:>8}{delta:>13}"
+        )
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+async def benchmark(args) -> dict:
+    from app.core.config import settings
+    from app.db.database import SessionLocal
+    from benchmarks.seed import drop_dataset, seed_dataset, seed_disposable_clients
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    dataset = seed_dataset(db, args.scale, seed=args.seed)
+    print(f"Seeded {dataset.item_count} items in {time.perf_counter() - started:.1f}s")
+
+    cookie = session_cookie(
+        args.session_secret or settings.SESSION_SECRET, dataset.user_id
+    )
+    scenarios = build_scenarios(dataset)
+    selected = args.scenarios or list(scenarios)
+    if "delete_client" in selected:
+        seed_disposable_clients(db, dataset, args.requests + args.warmup)
+    results = {
+        "meta": {
+            "scale": args.scale,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "target": args.base_url or "in-process",
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "scenarios": {},
+    }
+
+    async def run_all(client):
+        for name in selected:
+            results["scenarios"][name] = await run_scenario(
+                client,
+                scenarios[name],
+                args.requests,
+                args.concurrency,
+                args.warmup,
+                args.seed,
+            )
+            print(f"  {name}: done")
+
+    try:
+        cookies = {"session": cookie}
+        if args.base_url:
+            async with httpx.AsyncClient(
+                base_url=args.base_url, cookies=cookies, timeout=60
+            ) as client:
+                await run_all(client)
+        else:
+            from main import app
+
+            async with app.router.lifespan_context(app):
+                async with httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+                    base_url="http://benchmark",
+                    cookies=cookies,
+                    timeout=60,
+                ) as client:
+                    await run_all(client)
+    finally:
+        if not args.keep_data:
+            drop_dataset(db, dataset)
+        db.close()
+    return results
+
+
+def main():
+    from benchmarks.seed import SCALES
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenarios", nargs="+", metavar="NAME")
+    parser.add_argument("--base-url", help="benchmark a running server instead")
+    parser.add_argument(
+        "--session-secret", help="the server's SESSION_SECRET, with --base-url"
+    )
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed regression as a fraction of the baseline (default 0.25)",
+    )
+    parser.add_argument("--keep-data", action="store_true")
+    args = parser.parse_args()
+
+    if args.base_url and not args.session_secret:
+        parser.error("--base-url needs --session-secret to sign session cookies")
+
+    args.baseline = args.baseline.resolve()
+    if args.output:
+        args.output = args.output.resolve()
+
+    # main.py serves the frontend bundle and uploads relative to the working
+    # directory; run in a scratch one so uploads don't land in the checkout
+    sys.path.insert(0, str(BACKEND_DIR))
+    workdir = tempfile.mkdtemp(prefix="callsheet-bench-")
+    os.makedirs(os.path.join(workdir, "client-bundle", "assets"))
+    os.chdir(workdir)
+
+    results = asyncio.run(benchmark(args))
+
+    baseline = None
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("meta", {}).get("scale") != args.scale:
+            print(f"Baseline is for scale {baseline['meta'].get('scale')}, skipping")
+            baseline = None
+
+    print_table(results, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance) if baseline else []
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Seed a benchmark user with clients, projects, shotlists and items."""
+
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, time, timedelta
+from typing import Dict, List
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.models import Client, Project, Shotlist, ShotlistItem, User
+from app.models.project import ProjectStatus
+
+SCALES = {
+    "small": dict(clients=2, projects_per_client=5, shotlists_per_project=3, items=50),
+    "medium": dict(
+        clients=5, projects_per_client=20, shotlists_per_project=5, items=200
+    ),
+    "large": dict(
+        clients=10, projects_per_client=20, shotlists_per_project=5, items=1000
+    ),
+}
+
+BATCH_SIZE = 5000
+# Each client seeded for the delete benchmark holds 2000 items
+DELETE_TREE = dict(projects=2, shotlists_per_project=2, items=500)
+# Shotlists whose item ids are kept for the item benchmarks
+HOT_SHOTLISTS = 16
+
+
+@dataclass
+class Dataset:
+    user_id: uuid.UUID
+    client_ids: List[uuid.UUID] = field(default_factory=list)
+    project_ids: List[uuid.UUID] = field(default_factory=list)
+    shotlist_ids: List[uuid.UUID] = field(default_factory=list)
+    # Item ids of the first few shotlists, the targets of item benchmarks
+    hot_items: Dict[uuid.UUID, List[uuid.UUID]] = field(default_factory=dict)
+    item_count: int = 0
+    # Clients seeded to be deleted, one per delete request
+    disposable_clients: List[uuid.UUID] = field(default_factory=list)
+
+
+def _insert(db: Session, model, rows: List[dict]):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.execute(insert(model), rows[start : start + BATCH_SIZE])
+
+
+def seed_dataset(db: Session, scale: str, seed: int = 0) -> Dataset:
+    shape = SCALES[scale]
+    rng = random.Random(seed)
+
+    user_id = uuid.uuid4()
+    db.execute(
+        insert(User).values(
+            id=user_id, email=f"bench-{user_id}@example.com", provider="bench"
+        )
+    )
+    dataset = Dataset(user_id=user_id)
+
+    clients, projects, shotlists, items = [], [], [], []
+    statuses = list(ProjectStatus)
+    for c in range(shape["clients"]):
+        client_id = uuid.uuid4()
+        dataset.client_ids.append(client_id)
+        clients.append(dict(id=client_id, user_id=user_id, name=f"Client {c}"))
+        for p in range(shape["projects_per_client"]):
+            project_id = uuid.uuid4()
+            dataset.project_ids.append(project_id)
+            shoot_date = date(2025, 1, 1) + timedelta(days=rng.randrange(730))
+            projects.append(
+                dict(
+                    id=project_id,
+                    user_id=user_id,
+                    client_id=client_id,
+                    name=f"Project {c}-{p}",
+                    director=f"Director {rng.randrange(50)}",
+                    status=rng.choice(statuses),
+                    shoot_date=shoot_date,
+                    location=f"Location {rng.randrange(100)}",
+                )
+            )
+            for s in range(shape["shotlists_per_project"]):
+                shotlist_id = uuid.uuid4()
+                dataset.shotlist_ids.append(shotlist_id)
+                shotlists.append(
+                    dict(
+                        id=shotlist_id,
+                        project_id=project_id,
+                        user_id=user_id,
+                        name=f"Day {s + 1}",
+                        shooting_date=shoot_date + timedelta(days=s),
+                        call_time=time(7, 0),
+                        wrap_time=time(19, 0),
+                        location=f"Location {rng.randrange(100)}",
+                    )
+                )
+                if len(dataset.shotlist_ids) <= HOT_SHOTLISTS:
+                    dataset.hot_items[shotlist_id] = []
+                for i in range(shape["items"]):
+                    item_id = uuid.uuid4()
+                    if shotlist_id in dataset.hot_items:
+                        dataset.hot_items[shotlist_id].append(item_id)
+                    items.append(
+                        dict(
+                            id=item_id,
+                            shotlist_id=shotlist_id,
+                            user_id=user_id,
+                            shot_name=f"Shot {i}",
+                            shot_description="Wide establishing shot",
+                            shot_duration=rng.randrange(5, 60),
+                            order_index=i,
+                            camera_angle=rng.choice(["high", "low", "eye level"]),
+                            custom_properties={"lens": rng.choice(["24mm", "35mm"])},
+                        )
+                    )
+
+    _insert(db, Client, clients)
+    _insert(db, Project, projects)
+    _insert(db, Shotlist, shotlists)
+    _insert(db, ShotlistItem, items)
+    db.commit()
+    dataset.item_count = len(items)
+    return dataset
+
+
+def seed_disposable_clients(db: Session, dataset: Dataset, count: int):
+    """Add ``count`` clients shaped like DELETE_TREE for the delete benchmark"""
+    clients, projects, shotlists, items = [], [], [], []
+    for c in range(count):
+        client_id = uuid.uuid4()
+        dataset.disposable_clients.append(client_id)
+        clients.append(
+            dict(id=client_id, user_id=dataset.user_id, name=f"Disposable {c}")
+        )
+        for p in range(DELETE_TREE["projects"]):
+            project_id = uuid.uuid4()
+            projects.append(
+                dict(
+                    id=project_id,
+                    user_id=dataset.user_id,
+                    client_id=client_id,
+                    name=f"Disposable {c}-{p}",
+                )
+            )
+            for s in range(DELETE_TREE["shotlists_per_project"]):
+                shotlist_id = uuid.uuid4()
+                shotlists.append(
+                    dict(
+                        id=shotlist_id,
+                        project_id=project_id,
+                        user_id=dataset.user_id,
+                        name=f"Day {s + 1}",
+                    )
+                )
+                items.extend(
+                    dict(
+                        shotlist_id=shotlist_id,
+                        user_id=dataset.user_id,
+                        shot_name=f"Shot {i}",
+                        shot_duration=10,
+                        order_index=i,
+                    )
+                    for i in range(DELETE_TREE["items"])
+                )
+
+    _insert(db, Client, clients)
+    _insert(db, Project, projects)
+    _insert(db, Shotlist, shotlists)
+    _insert(db, ShotlistItem, items)
+    db.commit()
+
+
+def drop_dataset(db: Session, dataset: Dataset):
+    # Projects, shotlists and items cascade from their clients
+    db.execute(delete(Client).where(Client.user_id == dataset.user_id))
+    db.execute(delete(User).where(User.id == dataset.user_id))
+    db.commit()
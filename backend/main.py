@@ -1,12 +1,26 @@
 import os
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from app.api.endpoints import projects, shotlists, shotlist_items, clients
+from fastapi.responses import FileResponse, JSONResponse, Response
+from app.api.endpoints import (
+    projects,
+    shotlists,
+    shotlist_items,
+    clients,
+    search,
+    exports,
+    jobs,
+    conflicts,
+    calendar,
+)
 from app.core.config import settings
-from app.db.database import engine
-from sqlalchemy.exc import OperationalError
-from sqlalchemy import text
+from app.core.events import broker
+from app.core.health import database_probe
+from app.core.jobs import job_runner
+from app.core.purge import purger
+from app.core import metrics, query_budget
+from app.db.database import dispose_engines, pool_status
+from app.services import images as image_service
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.api.endpoints import auth
@@ -15,19 +29,29 @@ from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Check database connection on startup
-    try:
-        with engine.connect() as conn:
-            pass
-    except OperationalError:
+    # Check database connection on startup, then keep probing in the background
+    await database_probe.start()
+    if not database_probe.healthy:
         print(
             "WARNING: Could not connect to database. Application may not function correctly."
         )
 
+    await broker.start()
+    await purger.start()
+    await job_runner.start()
+
     yield
 
-    # Dispose of the engine on shutdown
-    engine.dispose()
+    await job_runner.stop()
+    await purger.stop()
+    await broker.stop()
+    await database_probe.stop()
+
+    if settings.QUERY_BUDGET_MODE != "off":
+        query_budget.logger.info(query_budget.format_report())
+
+    # Dispose of the engines on shutdown
+    dispose_engines()
 
 
 # Security Headers Middleware
@@ -64,27 +88,76 @@ app.add_middleware(
     same_site="lax",
 )
 
+if settings.QUERY_BUDGET_MODE != "off":
+    app.add_middleware(query_budget.QueryBudgetMiddleware)
+
+# Outermost, so timings cover the whole stack
+if settings.METRICS_ENABLED:
+    metrics.instrument_sqlalchemy()
+    app.add_middleware(metrics.MetricsMiddleware)
+
 
-# Health check endpoint
+# Health check endpoints. None of them do I/O: database state comes from the
+# background probe.
 @app.get("/api/v1/health")
 async def health_check():
     """Health check endpoint for monitoring and deployment systems"""
-    try:
-        # Test database connection
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"unhealthy: {str(e)}"
-
     return {
-        "status": "ok" if db_status == "healthy" else "degraded",
-        "database": db_status,
+        "status": "ok" if database_probe.healthy else "degraded",
+        "database": database_probe.detail,
+        "pool": pool_status(),
         "version": settings.VERSION,
         "environment": settings.ENVIRONMENT,
     }
 
 
+@app.get("/api/v1/health/live")
+async def liveness_check():
+    """The process is up and serving requests"""
+    return {"status": "ok"}
+
+
+@app.get("/api/v1/health/ready")
+async def readiness_check():
+    """Whether this instance should receive traffic"""
+    pool = pool_status()
+    capacity = pool["size"] + pool["max_overflow"]
+    body = {
+        "status": "ok" if database_probe.healthy else "unavailable",
+        "database": database_probe.status(),
+        "pool": {
+            **pool,
+            "saturation": pool["checked_out"] / capacity if capacity else 0.0,
+        },
+        "image_queue_depth": image_service.queue_depth(),
+    }
+    return JSONResponse(body, status_code=200 if database_probe.healthy else 503)
+
+
+def _collect_runtime_metrics():
+    metrics.record_pool_status(pool_status())
+    metrics.IMAGE_QUEUE_DEPTH.set(value=image_service.queue_depth())
+
+
+metrics.registry.add_collector(_collect_runtime_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+if settings.QUERY_BUDGET_MODE != "off":
+
+    @app.get("/api/v1/debug/query-report", include_in_schema=False)
+    def query_budget_report(limit: int = 10):
+        """Routes with the most statements per request, worst first"""
+        return query_budget.report(limit)
+
+
 # Auth routes
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 
@@ -93,9 +166,19 @@ app.include_router(clients.router, prefix="/api/clients", tags=["Clients"])
 app.include_router(projects.router, prefix="/api/projects", tags=["Projects"])
 app.include_router(shotlists.router, prefix="/api", tags=["Shotlists"])
 app.include_router(shotlist_items.router, prefix="/api", tags=["Shotlist Items"])
-
-# Mount static assets (JS, CSS, images) - must be before catch-all
-app.mount("/assets", StaticFiles(directory="client-bundle/assets"), name="assets")
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
+app.include_router(exports.router, prefix="/api", tags=["Exports"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+app.include_router(conflicts.router, prefix="/api/conflicts", tags=["Conflicts"])
+app.include_router(calendar.router, prefix="/api/calendar", tags=["Calendar"])
+
+# Mount static assets (JS, CSS, images) - must be before catch-all. Not
+# checked up front, so the API also runs without a frontend build (tests)
+app.mount(
+    "/assets",
+    StaticFiles(directory="client-bundle/assets", check_dir=False),
+    name="assets",
+)
 
 # Serve uploaded files
 if os.path.exists("uploads"):
@@ -0,0 +1,374 @@
+"""Bulk-generate realistic data for load and capacity testing.
+
+Streams users, clients, projects, shotlists and items into the database in
+DATABASE_URL with COPY, in chunks, so millions of rows load in minutes with
+flat memory use. Every id and value comes from one seeded RNG: apart from
+image file names, the same arguments produce the same rows.
+
+    python -m scripts.generate_data --users 10 --projects-per-client 50 \\
+        --items-per-shotlist 1000 --images 20
+
+Items get ``custom_properties`` and, with ``--images``, a share of them point
+at reference images processed through the normal upload pipeline.
+
+Because the rows are the same, a seed can only be loaded once: load another
+seed next to it, or pass ``--replace`` to delete the seed's earlier rows in
+the same transaction first.
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, time as dt_time, timedelta
+
+from PIL import Image
+
+from app.db.database import engine
+from app.models import Client, Project, Shotlist, ShotlistItem, User
+from app.models.project import ProjectStatus
+from app.services.images import process_reference_image
+
+# Values accepted by the ShotlistItem schemas; mostly shots, a few breaks
+SHOT_TYPES = ["Standard"] * 18 + ["Lunch", "Break"]
+FRAMINGS = ["Wide", "Medium", "Close-up", "Insert", "Over the shoulder", "POV"]
+CAMERA_ANGLES = ["eye level", "high", "low", "dutch", "overhead"]
+TIMES_OF_DAY = ["dawn", "morning", "afternoon", "evening", "night"]
+LENSES = ["16mm", "24mm", "35mm", "50mm", "85mm", "135mm"]
+RIGS = ["tripod", "handheld", "gimbal", "dolly", "crane", "drone"]
+LOCATIONS = ["Studio A", "Studio B", "Warehouse", "Beach", "Rooftop", "Forest"]
+
+
+@dataclass
+class Fanout:
+    users: int = 1
+    clients_per_user: int = 5
+    projects_per_client: int = 20
+    shotlists_per_project: int = 5
+    items_per_shotlist: int = 200
+
+    @property
+    def total_items(self) -> int:
+        return (
+            self.users
+            * self.clients_per_user
+            * self.projects_per_client
+            * self.shotlists_per_project
+            * self.items_per_shotlist
+        )
+
+
+class CopyWriter:
+    """Buffers rows for one table as CSV and COPYs them in chunks.
+
+    Parent writers are flushed first so foreign keys always resolve.
+    """
+
+    def __init__(self, cursor, model, columns, chunk_size: int, parent=None):
+        self.cursor = cursor
+        self.parent = parent
+        self.sql = (
+            f"COPY {model.__tablename__} ({', '.join(columns)}) "
+            "FROM STDIN WITH (FORMAT csv)"
+        )
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self._pending = 0
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def write(self, row):
+        # None becomes an empty unquoted field, which COPY reads as NULL
+        self._writer.writerow(row)
+        self._pending += 1
+        if self._pending >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.parent:
+            self.parent.flush()
+        if not self._pending:
+            return
+        self._buffer.seek(0)
+        self.cursor.copy_expert(self.sql, self._buffer)
+        self.rows += self._pending
+        self._pending = 0
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+
+def generate_images(count: int, rng: random.Random):
+    """Process ``count`` generated images like uploads and return their URLs"""
+    urls = []
+    for _ in range(count):
+        size = rng.choice([(1920, 1080), (1080, 1920), (1200, 1200)])
+        color = tuple(rng.randrange(256) for _ in range(3))
+        buffer = io.BytesIO()
+        Image.new("RGB", size, color).save(buffer, "JPEG")
+        urls.append(process_reference_image(buffer.getvalue()))
+    return urls
+
+
+def user_email(seed: int, u: int) -> str:
+    return f"load-{seed}-{u}@example.com"
+
+
+def delete_generated(cursor, seed: int) -> int:
+    """Delete the users generated with ``seed`` and everything they own"""
+    cursor.execute(
+        "SELECT array_agg(id) FROM users WHERE provider = 'generated' "
+        "AND email LIKE %s",
+        (f"load-{seed}-%@example.com",),
+    )
+    (user_ids,) = cursor.fetchone()
+    if not user_ids:
+        return 0
+    # Children first: only shotlists cascade to their items
+    for model in (ShotlistItem, Shotlist, Project, Client, User):
+        column = "id" if model is User else "user_id"
+        cursor.execute(
+            f"DELETE FROM {model.__tablename__} WHERE {column} = ANY(%s)", (user_ids,)
+        )
+    return len(user_ids)
+
+
+def generate(
+    fanout: Fanout,
+    seed: int,
+    chunk_size: int,
+    images: int,
+    image_ratio,
+    replace: bool = False,
+):
+    rng = random.Random(seed)
+    new_id = lambda: uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if replace:
+            print(f"Deleted {delete_generated(cursor, seed)} users of seed {seed}")
+        else:
+            cursor.execute(
+                "SELECT 1 FROM users WHERE email = %s", (user_email(seed, 0),)
+            )
+            if cursor.fetchone():
+                raise SystemExit(
+                    f"Seed {seed} is already loaded; pass --replace to load it "
+                    "again, or use another --seed"
+                )
+        image_urls = generate_images(images, rng)
+        # Generated data is reproducible; no need to wait on WAL flushes
+        cursor.execute("SET synchronous_commit TO off")
+        users = CopyWriter(
+            cursor,
+            User,
+            ["id", "email", "full_name", "provider", "is_active", "is_superuser"],
+            chunk_size,
+        )
+        clients = CopyWriter(
+            cursor, Client, ["id", "user_id", "name", "description"], chunk_size, users
+        )
+        projects = CopyWriter(
+            cursor,
+            Project,
+            [
+                "id",
+                "user_id",
+                "client_id",
+                "name",
+                "production_company",
+                "director",
+                "producer",
+                "status",
+                "shoot_date",
+                "call_time",
+                "location",
+            ],
+            chunk_size,
+            clients,
+        )
+        shotlists = CopyWriter(
+            cursor,
+            Shotlist,
+            [
+                "id",
+                "project_id",
+                "user_id",
+                "name",
+                "shooting_date",
+                "call_time",
+                "wrap_time",
+                "location",
+                "notes",
+            ],
+            chunk_size,
+            projects,
+        )
+        items = CopyWriter(
+            cursor,
+            ShotlistItem,
+            [
+                "id",
+                "shotlist_id",
+                "user_id",
+                "shot_name",
+                "shot_type",
+                "shot_description",
+                "time_of_day",
+                "shot_duration",
+                "notes",
+                "shot_reference_image",
+                "order_index",
+                "camera_angle",
+                "custom_properties",
+                "is_completed",
+                "duration_locked",
+            ],
+            chunk_size,
+            shotlists,
+        )
+        writers = [users, clients, projects, shotlists, items]
+        statuses = [status.name for status in ProjectStatus]
+
+        started = time.perf_counter()
+        for u in range(fanout.users):
+            user_id = new_id()
+            users.write(
+                [
+                    user_id,
+                    user_email(seed, u),
+                    f"Load User {u}",
+                    "generated",
+                    True,
+                    False,
+                ]
+            )
+            for c in range(fanout.clients_per_user):
+                client_id = new_id()
+                clients.write([client_id, user_id, f"Client {u}-{c}", None])
+                for p in range(fanout.projects_per_client):
+                    project_id = new_id()
+                    shoot_date = date(2024, 1, 1) + timedelta(days=rng.randrange(1095))
+                    projects.write(
+                        [
+                            project_id,
+                            user_id,
+                            client_id,
+                            f"Project {u}-{c}-{p}",
+                            f"Company {rng.randrange(200)}",
+                            f"Director {rng.randrange(500)}",
+                            f"Producer {rng.randrange(500)}",
+                            rng.choice(statuses),
+                            shoot_date,
+                            dt_time(rng.randrange(5, 10), 0),
+                            rng.choice(LOCATIONS),
+                        ]
+                    )
+                    for s in range(fanout.shotlists_per_project):
+                        shotlist_id = new_id()
+                        shotlists.write(
+                            [
+                                shotlist_id,
+                                project_id,
+                                user_id,
+                                f"Day {s + 1}",
+                                shoot_date + timedelta(days=s),
+                                dt_time(rng.randrange(5, 10), 0),
+                                dt_time(rng.randrange(17, 22), 0),
+                                rng.choice(LOCATIONS),
+                                None,
+                            ]
+                        )
+                        for i in range(fanout.items_per_shotlist):
+                            has_image = image_urls and rng.random() < image_ratio
+                            properties = {
+                                "lens": rng.choice(LENSES),
+                                "rig": rng.choice(RIGS),
+                                "take_count": rng.randrange(1, 12),
+                            }
+                            items.write(
+                                [
+                                    new_id(),
+                                    shotlist_id,
+                                    user_id,
+                                    f"Shot {i + 1}",
+                                    rng.choice(SHOT_TYPES),
+                                    f"{rng.choice(FRAMINGS)} of "
+                                    f"scene {rng.randrange(1, 80)}",
+                                    rng.choice(TIMES_OF_DAY),
+                                    rng.randrange(2, 45),
+                                    None,
+                                    rng.choice(image_urls) if has_image else None,
+                                    i,
+                                    rng.choice(CAMERA_ANGLES),
+                                    json.dumps(properties),
+                                    rng.random() < 0.3,
+                                    False,
+                                ]
+                            )
+            print(
+                f"User {u + 1}/{fanout.users}: {items.rows} items loaded, "
+                f"{time.perf_counter() - started:.1f}s"
+            )
+
+        items.flush()
+        raw.commit()
+    finally:
+        raw.close()
+
+    elapsed = time.perf_counter() - started
+    total = sum(writer.rows for writer in writers)
+    print(
+        f"Loaded {total} rows ({items.rows} items) in {elapsed:.1f}s, "
+        f"{total / elapsed:.0f} rows/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--clients-per-user", type=int, default=5)
+    parser.add_argument("--projects-per-client", type=int, default=20)
+    parser.add_argument("--shotlists-per-project", type=int, default=5)
+    parser.add_argument("--items-per-shotlist", type=int, default=200)
+    parser.add_argument("--images", type=int, default=0, help="distinct images")
+    parser.add_argument(
+        "--image-ratio",
+        type=float,
+        default=0.3,
+        help="share of items with a reference image (default 0.3)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="delete rows loaded earlier with the same seed first",
+    )
+    args = parser.parse_args()
+
+    fanout = Fanout(
+        users=args.users,
+        clients_per_user=args.clients_per_user,
+        projects_per_client=args.projects_per_client,
+        shotlists_per_project=args.shotlists_per_project,
+        items_per_shotlist=args.items_per_shotlist,
+    )
+    print(f"Generating {fanout.total_items} items (seed {args.seed})")
+    generate(
+        fanout,
+        args.seed,
+        args.chunk_size,
+        args.images,
+        args.image_ratio,
+        replace=args.replace,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Import shots from a CSV file into a shotlist.
+
+    python -m scripts.import_shots <shotlist_id> breakdown.csv
+
+Uses the same validation and COPY-based load as the import endpoint.
+"""
+
+import argparse
+import json
+import sys
+import time
+from uuid import UUID
+
+from app.db.database import SessionLocal
+from app.services import imports as import_service
+from app.services import shotlists as shotlist_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("shotlist_id", type=UUID)
+    parser.add_argument("csv_file")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        shotlist = shotlist_service.get_shotlist(db, shotlist_id=args.shotlist_id)
+        if shotlist is None:
+            sys.exit(f"Shotlist {args.shotlist_id} not found")
+
+        started = time.perf_counter()
+        with open(args.csv_file, encoding="utf-8-sig", newline="") as lines:
+            try:
+                result = import_service.import_shotlist_items(
+                    db, shotlist_id=shotlist.id, user_id=shotlist.user_id, lines=lines
+                )
+            except (
+                import_service.CSVFormatError,
+                import_service.TooManyRowsError,
+            ) as e:
+                sys.exit(f"{args.csv_file}: {e}")
+
+    for error in result["errors"]:
+        print(f"line {error['line']}: {'; '.join(error['errors'])}", file=sys.stderr)
+    print(
+        json.dumps({k: result[k] for k in ("imported", "failed")})
+        + f" in {time.perf_counter() - started:.1f}s"
+    )
+    sys.exit(1 if result["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Production entry point: serve the app from several worker processes.
+
+    python serve.py
+
+Starts WEB_CONCURRENCY uvicorn workers (one per available CPU when 0) on
+HOST:PORT, with uvloop and httptools. uvicorn supervises them and replaces
+any that die. Each worker has its own event loop and connection pool, so the
+database sees up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections per worker.
+
+Workers share nothing in memory, so more than one needs:
+- SESSION_SECRET, or each worker signs sessions with its own random key and
+  users are logged out whenever a request lands on a different one
+- EVENTS_BACKEND=postgres, or shotlist events only reach clients connected to
+  the worker that published them
+"""
+
+import os
+import sys
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def available_cpus() -> int:
+    # Honours CPU affinity (e.g. taskset or container cpusets) where supported
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    return settings.WEB_CONCURRENCY or available_cpus()
+
+
+def check_multi_worker() -> list:
+    """Settings that would break with several workers"""
+    problems = []
+    if settings.session_secret_generated:
+        problems.append("SESSION_SECRET must be set so all workers share it")
+    if settings.EVENTS_BACKEND != "postgres":
+        problems.append("EVENTS_BACKEND must be 'postgres' to reach every worker")
+    return problems
+
+
+def main():
+    workers = worker_count()
+    if workers > 1:
+        problems = check_multi_worker()
+        if problems:
+            print(
+                f"Cannot start {workers} workers:\n  "
+                + "\n  ".join(problems)
+                + "\nFix these or set WEB_CONCURRENCY=1.",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+    print(
+        f"Serving on {settings.HOST}:{settings.PORT} with {workers} workers, up "
+        f"to {workers * (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)} "
+        "database connections"
+    )
+    uvicorn.run(
+        "main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+    )
+
+
+if __name__ == "__main__":
+    main()
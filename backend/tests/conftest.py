@@ -0,0 +1,145 @@
+"""Tests run the app against a real Postgres.
+
+TEST_DATABASE_URL, by default a ``_test`` database next to DATABASE_URL, is
+dropped, recreated and migrated once per session. Requests are signed in as
+a fresh user through the real session cookie, so authentication costs the
+same statements it does in production, and every request is held to its
+route's query budget in strict mode.
+"""
+
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+
+from app.core.config import settings
+
+# The engine is built from settings when app.db.database is first imported,
+# so point it at the test database before anything imports that
+_url = make_url(settings.DATABASE_URL)
+settings.DATABASE_URL = os.environ.get("TEST_DATABASE_URL") or _url.set(
+    database=f"{_url.database}_test"
+).render_as_string(hide_password=False)
+settings.DATABASE_REPLICA_URLS = []
+settings.JOBS_ENABLED = False
+settings.PURGE_INTERVAL_SECONDS = 0
+# Installs QueryBudgetMiddleware when main is imported; see strict_query_budgets
+settings.QUERY_BUDGET_MODE = "strict"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.models.user import User  # noqa: E402
+from main import app  # noqa: E402
+from tests.utils import ok, sign_in  # noqa: E402
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def recreate_database(url: str):
+    url = make_url(url)
+    admin = create_engine(url.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{url.database}" WITH (FORCE)'))
+        conn.execute(text(f'CREATE DATABASE "{url.database}"'))
+    admin.dispose()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    recreate_database(settings.DATABASE_URL)
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND / "alembic"))
+    command.upgrade(config, "head")
+    yield
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budgets(monkeypatch):
+    """Fail any request over its route's ``@query_budget``, or repeating a
+    statement (N+1), with QueryBudgetExceeded"""
+    monkeypatch.setattr(settings, "QUERY_BUDGET_MODE", "strict")
+
+
+def create_user() -> User:
+    with SessionLocal() as db:
+        user = User(email=f"{uuid.uuid4()}@example.com", provider="google")
+        db.add(user)
+        db.commit()
+        return user
+
+
+@pytest.fixture
+def user() -> User:
+    return create_user()
+
+
+@pytest.fixture
+def client(user) -> TestClient:
+    # Session cookies are https_only
+    client = TestClient(app, base_url="https://testserver")
+    sign_in(client, user)
+    return client
+
+
+@pytest.fixture
+def statements():
+    """SQL statements executed while the test runs; clear() it before the
+    request under test"""
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(Engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def project(client) -> dict:
+    db_client = ok(client.post("/api/clients/", json={"name": "Acme"}))
+    return ok(
+        client.post(
+            "/api/projects/",
+            json={
+                "name": "Commercial",
+                "client_id": db_client["id"],
+                "shoot_date": "2026-10-20",
+            },
+        )
+    )
+
+
+@pytest.fixture
+def shotlist(client, project) -> dict:
+    return ok(
+        client.post(
+            f"/api/projects/{project['id']}/shotlists",
+            json={
+                "name": "Day 1",
+                "shooting_date": "2026-10-20",
+                "call_time": "08:00:00",
+                "wrap_time": "18:00:00",
+                "location": "Beach",
+            },
+        )
+    )
+
+
+@pytest.fixture
+def items(client, shotlist) -> list:
+    return [
+        ok(
+            client.post(
+                f"/api/shotlists/{shotlist['id']}/items",
+                json={"shot_name": f"Shot {i}", "shot_duration": 10},
+            )
+        )
+        for i in range(3)
+    ]
@@ -0,0 +1,54 @@
+from app.services import calendar as calendar_service
+from tests.utils import ok
+
+
+def feed_url(client) -> str:
+    return ok(client.post("/api/calendar/token"))["url"]
+
+
+def test_unchanged_feed_is_not_modified(client, shotlist):
+    url = feed_url(client)
+    feed = ok(client.get(url))
+    assert "SUMMARY:Commercial: Day 1" in feed.text
+    assert "DTSTART:20261020T080000" in feed.text
+
+    response = client.get(url, headers={"If-None-Match": feed.headers["ETag"]})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == feed.headers["ETag"]
+
+
+def test_etag_changes_when_a_shotlist_is_edited_or_deleted(client, shotlist):
+    url = feed_url(client)
+    first = ok(client.get(url)).headers["ETag"]
+
+    ok(client.put(f"/api/shotlists/{shotlist['id']}", json={"location": "Dunes"}))
+    edited = ok(client.get(url, headers={"If-None-Match": first}))
+    assert edited.headers["ETag"] != first
+    assert "LOCATION:Dunes" in edited.text
+
+    ok(client.delete(f"/api/shotlists/{shotlist['id']}"))
+    deleted = ok(client.get(url, headers={"If-None-Match": edited.headers["ETag"]}))
+    assert deleted.headers["ETag"] not in (first, edited.headers["ETag"])
+    assert "Day 1" not in deleted.text
+
+
+def test_revoked_and_unknown_tokens_are_not_found(client, project):
+    url = feed_url(client)
+    project_url = url.replace(".ics", f"/projects/{project['id']}.ics")
+    ok(client.get(project_url))
+
+    ok(client.delete("/api/calendar/token"))
+    assert client.get(url).status_code == 404
+    assert client.get(project_url).status_code == 404
+    assert client.get("/api/calendar/unknown.ics").status_code == 404
+
+
+def test_fold_splits_at_75_octets_between_characters():
+    line = "SUMMARY:" + "Café ☕ 🎬 " * 20
+    folded = calendar_service.fold(line)
+
+    pieces = folded.split("\r\n")
+    assert all(len(piece.encode()) <= 75 for piece in pieces)
+    assert all(piece.startswith(" ") for piece in pieces[1:])
+    assert pieces[0] + "".join(piece[1:] for piece in pieces[1:]) == line
@@ -0,0 +1,50 @@
+from sqlalchemy import update
+
+from app.db.database import SessionLocal
+from app.models.project import Project
+from tests.utils import ok
+
+
+def add_shotlist(client, project, location, call_time, wrap_time):
+    return ok(
+        client.post(
+            f"/api/projects/{project['id']}/shotlists",
+            json={
+                "name": f"{location} {call_time}",
+                "shooting_date": "2026-10-19",
+                "call_time": call_time,
+                "wrap_time": wrap_time,
+                "location": location,
+            },
+        )
+    )
+
+
+def test_overnight_overlaps_from_the_day_before_are_reported(client, project):
+    first = add_shotlist(client, project, "Pier", "22:00:00", "02:00:00")
+    second = add_shotlist(client, project, " pier ", "23:00:00", "03:00:00")
+    # Over before the range starts
+    add_shotlist(client, project, "Forest", "10:00:00", "12:00:00")
+    add_shotlist(client, project, "Forest", "11:00:00", "13:00:00")
+    # A project without a status isn't a completed one
+    with SessionLocal() as db:
+        db.execute(
+            update(Project).where(Project.id == project["id"]).values(status=None)
+        )
+        db.commit()
+
+    found = ok(
+        client.get(
+            "/api/conflicts/",
+            params={"date_from": "2026-10-20", "date_to": "2026-10-21"},
+        )
+    )
+
+    [conflict] = found["conflicts"]
+    assert conflict["location"] == "Pier"
+    assert conflict["overlap_start"] == "2026-10-19T23:00:00"
+    assert conflict["overlap_end"] == "2026-10-20T02:00:00"
+    assert {b["shotlist_id"] for b in conflict["bookings"]} == {
+        first["id"],
+        second["id"],
+    }
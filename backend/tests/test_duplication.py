@@ -0,0 +1,60 @@
+from tests.utils import ok
+
+
+def add_item(client, shotlist, name, **fields):
+    return ok(
+        client.post(
+            f"/api/shotlists/{shotlist['id']}/items",
+            json={"shot_name": name, "shot_duration": 5, **fields},
+        )
+    )
+
+
+def list_items(client, shotlist_id):
+    return ok(client.get(f"/api/shotlists/{shotlist_id}/items"))
+
+
+def test_duplicate_shotlist_copies_live_items_in_order(client, shotlist):
+    originals = [
+        add_item(client, shotlist, "Wide", custom_properties={"lens": "24mm"}),
+        add_item(client, shotlist, "Cut", custom_properties={"lens": "50mm"}),
+        add_item(client, shotlist, "Close", custom_properties={"lens": "85mm"}),
+    ]
+    ok(client.delete(f"/api/shotlist-items/{originals[1]['id']}"))
+
+    copy = ok(client.post(f"/api/shotlists/{shotlist['id']}/duplicate"))
+    assert copy["id"] != shotlist["id"]
+    assert copy["name"] == "Day 1 (copy)"
+    assert copy["project_id"] == shotlist["project_id"]
+
+    copied = list_items(client, copy["id"])
+    assert [
+        (i["shot_name"], i["order_index"], i["custom_properties"]) for i in copied
+    ] == [("Wide", 0, {"lens": "24mm"}), ("Close", 1, {"lens": "85mm"})]
+    assert not {i["id"] for i in copied} & {i["id"] for i in originals}
+    # The original is left as it was
+    assert len(list_items(client, shotlist["id"])) == 2
+
+
+def test_duplicate_project_copies_live_shotlists_and_items(
+    client, project, shotlist, items
+):
+    deleted = ok(
+        client.post(f"/api/projects/{project['id']}/shotlists", json={"name": "Day 2"})
+    )
+    ok(client.delete(f"/api/shotlists/{deleted['id']}"))
+
+    copy = ok(client.post(f"/api/projects/{project['id']}/duplicate"))
+    assert copy["id"] != project["id"]
+    assert copy["name"] == "Commercial (copy)"
+
+    [copied_shotlist] = ok(client.get(f"/api/projects/{copy['id']}/shotlists"))
+    assert copied_shotlist["id"] != shotlist["id"]
+    assert copied_shotlist["name"] == "Day 1"
+    assert copied_shotlist["call_time"] == shotlist["call_time"]
+
+    copied = list_items(client, copied_shotlist["id"])
+    assert [(i["shot_name"], i["order_index"]) for i in copied] == [
+        (i["shot_name"], i["order_index"]) for i in items
+    ]
+    assert not {i["id"] for i in copied} & {i["id"] for i in items}
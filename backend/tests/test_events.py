@@ -0,0 +1,35 @@
+import asyncio
+import json
+import queue
+
+from app.core.events import PostgresBackend, shotlist_channel
+from app.db.database import SessionLocal, engine
+
+
+def test_postgres_backend_sends_oversized_events_as_resync():
+    received = queue.Queue()
+    backend = PostgresBackend(engine)
+    asyncio.run(backend.start(lambda channel, payload: received.put(payload)))
+    channel = shotlist_channel("00000000-0000-0000-0000-000000000000")
+
+    def publish(event: dict):
+        with SessionLocal() as db:
+            backend.publish(db, channel, json.dumps(event))
+            db.commit()
+
+    try:
+        # Until the listener thread has issued LISTEN, notifications are lost
+        for _ in range(50):
+            publish({"type": "ping"})
+            try:
+                received.get(timeout=0.1)
+                break
+            except queue.Empty:
+                pass
+        while not received.empty():
+            received.get()
+
+        publish({"type": "item.updated", "item": {"notes": "x" * 10_000}})
+        assert json.loads(received.get(timeout=5)) == {"type": "resync"}
+    finally:
+        asyncio.run(backend.stop())
@@ -0,0 +1,70 @@
+import io
+import zipfile
+from itertools import cycle
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db import database
+from tests.utils import ok
+
+FORMULA = '=HYPERLINK("http://example.com","x")'
+
+
+def test_xlsx_writes_formula_like_text_as_text(client, shotlist):
+    ok(
+        client.post(
+            f"/api/shotlists/{shotlist['id']}/items",
+            json={"shot_name": FORMULA, "shot_duration": 5, "notes": "http://a.b"},
+        )
+    )
+    response = ok(client.get(f"/api/shotlists/{shotlist['id']}/export.xlsx"))
+
+    with zipfile.ZipFile(io.BytesIO(response.content)) as workbook:
+        sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+        assert "<f>" not in sheet
+        assert "<hyperlink" not in sheet
+
+
+def test_csv_guards_formula_like_text_and_imports_it_back(client, project, shotlist):
+    ok(
+        client.post(
+            f"/api/shotlists/{shotlist['id']}/items",
+            json={"shot_name": FORMULA, "shot_duration": 5, "notes": "-1+1"},
+        )
+    )
+    exported = ok(client.get(f"/api/shotlists/{shotlist['id']}/export.csv")).text
+    assert "'=HYPERLINK" in exported and "'-1+1" in exported
+
+    target = ok(
+        client.post(f"/api/projects/{project['id']}/shotlists", json={"name": "Copy"})
+    )
+    ok(
+        client.post(
+            f"/api/shotlists/{target['id']}/items/import",
+            files={"file": ("shots.csv", exported)},
+        )
+    )
+    (item,) = ok(client.get(f"/api/shotlists/{target['id']}/items"))
+    assert item["shot_name"] == FORMULA and item["notes"] == "-1+1"
+
+
+def test_read_only_exports_stream_from_the_replica(client, items, monkeypatch):
+    replica = database.create_db_engine(settings.DATABASE_URL)
+    monkeypatch.setattr(database, "replica_engines", [replica])
+    monkeypatch.setattr(database, "_replicas", cycle([replica]))
+    on_replica = []
+    event.listen(
+        replica,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: on_replica.append(statement),
+    )
+    try:
+        exported = ok(
+            client.get(f"/api/shotlists/{items[0]['shotlist_id']}/export.csv")
+        )
+    finally:
+        replica.dispose()
+
+    assert "Shot 2" in exported.text
+    assert any("FROM shotlist_items" in statement for statement in on_replica)
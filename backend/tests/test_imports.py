@@ -0,0 +1,111 @@
+import csv
+
+from app.core.config import settings
+from app.services import imports as import_service
+from tests.utils import ok
+
+
+def test_unreadable_csv_is_rejected_with_its_line(client, shotlist, items):
+    oversized = "x" * (csv.field_size_limit() + 1)
+    upload = f"shot_name,shot_duration\nCrane,5\nDolly,5\n{oversized},5\n"
+
+    response = client.post(
+        f"/api/shotlists/{shotlist['id']}/items/import",
+        files={"file": ("shots.csv", upload)},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid CSV: Line 4:")
+    listing = ok(client.get(f"/api/shotlists/{shotlist['id']}/items"))
+    assert len(listing) == len(items)
+
+
+def test_invalid_rows_are_reported_and_the_rest_imported(client, shotlist):
+    result = ok(
+        client.post(
+            f"/api/shotlists/{shotlist['id']}/items/import",
+            files={"file": ("shots.csv", "Shot,Duration (min)\nCrane,5\n,5\n")},
+        )
+    )
+
+    assert result["imported"] == 1
+    assert result["errors"][0]["line"] == 3
+
+
+FIELDS = (
+    "shot_name",
+    "shot_type",
+    "shot_description",
+    "time_of_day",
+    "shot_duration",
+    "start_time",
+    "scheduled_time",
+    "camera_angle",
+    "aspect_ratio",
+    "fps",
+    "notes",
+    "is_completed",
+    "shot_reference_image",
+    "custom_properties",
+)
+
+
+def test_exported_shotlist_imports_back_unchanged(client, project, shotlist, items):
+    full = {
+        "shot_type": "Lunch",
+        "shot_description": "Crew, lunch",
+        "time_of_day": "afternoon",
+        "start_time": "12:30:00",
+        "scheduled_time": "12:00:00",
+        "camera_angle": "low",
+        "aspect_ratio": "2.39:1",
+        "fps": 24,
+        "notes": 'Say "cut"',
+        "is_completed": True,
+        "shot_reference_image": "/static/uploads/still.jpg",
+        "custom_properties": {"lens": "35mm"},
+    }
+    ok(client.put(f"/api/shotlist-items/{items[1]['id']}", json=full))
+    source = ok(client.get(f"/api/shotlists/{shotlist['id']}/items"))
+    exported = ok(client.get(f"/api/shotlists/{shotlist['id']}/export.csv")).text
+
+    target = ok(
+        client.post(f"/api/projects/{project['id']}/shotlists", json={"name": "Copy"})
+    )
+    result = ok(
+        client.post(
+            f"/api/shotlists/{target['id']}/items/import",
+            files={"file": ("shots.csv", exported)},
+        )
+    )
+
+    assert result == {"imported": 3, "failed": 0, "errors": []}
+    imported = ok(client.get(f"/api/shotlists/{target['id']}/items"))
+    assert [{f: item[f] for f in FIELDS} for item in imported] == [
+        {f: item[f] for f in FIELDS} for item in source
+    ]
+
+
+def test_too_many_rows_is_413(client, shotlist, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_ROWS", 2)
+
+    response = client.post(
+        f"/api/shotlists/{shotlist['id']}/items/import",
+        files={"file": ("shots.csv", "Shot,Duration (min)\nA,5\nB,5\nC,5\n")},
+    )
+
+    assert response.status_code == 413
+
+
+def test_rows_past_the_spool_size_still_import(client, shotlist, monkeypatch):
+    monkeypatch.setattr(import_service, "SPOOL_MAX_SIZE", 64)
+    upload = "Shot,Duration (min)\n" + "".join(f"Shot {i},5\n" for i in range(50))
+
+    result = ok(
+        client.post(
+            f"/api/shotlists/{shotlist['id']}/items/import",
+            files={"file": ("shots.csv", upload)},
+        )
+    )
+
+    assert result["imported"] == 50
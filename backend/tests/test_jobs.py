@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.jobs import claim_job
+from app.db.database import SessionLocal
+from app.models.job import Job, JobStatus
+
+
+def stale_job(attempts: int, age: int) -> Job:
+    locked_at = datetime.utcnow() - timedelta(
+        seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS + age
+    )
+    return Job(
+        type="test.stale",
+        status=JobStatus.RUNNING,
+        payload={},
+        attempts=attempts,
+        max_attempts=3,
+        run_at=locked_at,
+        locked_at=locked_at,
+    )
+
+
+def test_stale_jobs_are_reclaimed_until_out_of_attempts():
+    with SessionLocal(expire_on_commit=False) as db:
+        exhausted, retried = stale_job(3, age=60), stale_job(1, age=0)
+        db.add_all([exhausted, retried])
+        db.commit()
+
+    claimed = claim_job("test.stale")
+    assert claimed.id == retried.id
+    assert claimed.attempts == 2
+    assert claim_job("test.stale") is None
+
+    with SessionLocal() as db:
+        failed = db.get(Job, exhausted.id)
+        assert failed.status == JobStatus.FAILED
+        assert failed.attempts == 3
+        assert failed.finished_at is not None and failed.locked_at is None
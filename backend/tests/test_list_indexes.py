@@ -0,0 +1,46 @@
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.db.database import SessionLocal
+from app.models.project import Project
+from app.models.shotlist import Shotlist
+from app.schemas.project import ProjectFilters, ProjectSort
+from app.schemas.shotlist import ShotlistFilters, ShotlistSort
+from app.services.projects import filter_projects
+from app.services.shotlists import filter_shotlists
+
+
+def plan(query) -> str:
+    sql = query.statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    with SessionLocal() as db:
+        # Tables are near empty here; make the planner show what it would
+        # do with enough rows to prefer an index
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        return "\n".join(db.execute(text(f"EXPLAIN {sql}")).scalars())
+
+
+@pytest.mark.parametrize("sort", list(ProjectSort))
+def test_project_sorts_read_an_index_in_order(sort):
+    with SessionLocal() as db:
+        query = db.query(Project).filter(
+            Project.user_id == uuid.uuid4(), Project.deleted_at.is_(None)
+        )
+        query = filter_projects(query, ProjectFilters(sort=sort)).limit(20)
+    explained = plan(query)
+    assert "Index Scan" in explained and "Sort" not in explained, explained
+
+
+@pytest.mark.parametrize("sort", list(ShotlistSort))
+def test_shotlist_sorts_read_an_index_in_order(sort):
+    with SessionLocal() as db:
+        query = db.query(Shotlist).filter(
+            Shotlist.project_id == uuid.uuid4(), Shotlist.deleted_at.is_(None)
+        )
+        query = filter_shotlists(query, ShotlistFilters(sort=sort)).limit(20)
+    explained = plan(query)
+    assert "Index Scan" in explained and "Sort" not in explained, explained
@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.metrics import RequestStats, current_request_stats, instrument_sqlalchemy
+from app.db.database import SessionLocal
+
+
+def test_failed_statements_leave_no_timing_behind():
+    instrument_sqlalchemy()
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    try:
+        with SessionLocal() as db:
+            with pytest.raises(DBAPIError):
+                db.execute(text("SELECT 1 / 0"))
+            db.rollback()
+            db.execute(text("SELECT 1"))
+            info = db.connection().info
+    finally:
+        current_request_stats.reset(token)
+
+    assert stats.queries == 1
+    assert 0 < stats.db_seconds < 60
+    assert not info.get("query_start_time")
@@ -0,0 +1,73 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app.core import purge
+from app.db.database import SessionLocal
+from app.models.client import Client
+from app.models.project import Project
+from app.models.shotlist import Shotlist
+from app.models.shotlist_item import ShotlistItem
+from tests.utils import ok
+
+PARENTS_LAST = [ShotlistItem, Shotlist, Project, Client]
+
+
+def stored(model, id) -> bool:
+    with SessionLocal() as db:
+        return db.scalars(select(model.id).where(model.id == id)).first() is not None
+
+
+def deleted_at(model, id):
+    with SessionLocal() as db:
+        return db.scalars(select(model.deleted_at).where(model.id == id)).one_or_none()
+
+
+def test_deleting_a_client_hides_its_tree_until_purged(client, project, items):
+    shotlist_id = items[0]["shotlist_id"]
+    ok(client.delete(f"/api/clients/{project['client_id']}"))
+
+    assert client.get(f"/api/projects/{project['id']}").status_code == 404
+    assert client.get(f"/api/shotlists/{shotlist_id}").status_code == 404
+    assert client.get(f"/api/shotlists/{shotlist_id}/items").status_code == 404
+    # Marked, not yet removed; items go with their shotlist
+    assert deleted_at(Client, project["client_id"]) is not None
+    assert deleted_at(Project, project["id"]) is not None
+    assert deleted_at(Shotlist, shotlist_id) is not None
+    assert deleted_at(ShotlistItem, items[0]["id"]) is None
+
+
+def test_purger_removes_children_before_parents_in_batches(
+    client, project, items, monkeypatch
+):
+    kept = ok(client.post("/api/clients/", json={"name": "Kept"}))
+    ok(client.delete(f"/api/shotlist-items/{items[0]['id']}"))
+    ok(client.delete(f"/api/clients/{project['client_id']}"))
+
+    batches = []
+    purge_batch = purge.purge_batch
+
+    def record(model, candidates, batch_size):
+        count = purge_batch(model, candidates, batch_size)
+        batches.append((model, count))
+        return count
+
+    monkeypatch.setattr(purge, "purge_batch", record)
+    removed = asyncio.run(purge.Purger(interval=0, batch_size=2).run_once())
+
+    assert removed == sum(count for _, count in batches) >= 6
+    assert all(count <= 2 for _, count in batches)
+    order = [PARENTS_LAST.index(model) for model, count in batches if count]
+    assert order == sorted(order)
+    # A step keeps taking full batches until one comes back short
+    assert (ShotlistItem, 2) in batches
+
+    for model, id in [
+        (ShotlistItem, items[0]["id"]),
+        (ShotlistItem, items[2]["id"]),
+        (Shotlist, items[0]["shotlist_id"]),
+        (Project, project["id"]),
+        (Client, project["client_id"]),
+    ]:
+        assert not stored(model, id)
+    assert stored(Client, kept["id"])
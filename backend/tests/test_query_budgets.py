@@ -0,0 +1,181 @@
+"""Every route's ``@query_budget`` is checked by driving it in strict mode,
+where a request over budget, or repeating a statement shape (N+1), raises."""
+
+import io
+import uuid
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core import query_budget
+from app.core.query_budget import QueryBudgetExceeded, QueryBudgetMiddleware
+from app.db.database import get_db
+from main import app
+from tests.utils import ok
+
+# Needs a live OAuth exchange with Google
+UNREACHABLE = {"GET /api/auth/google/callback"}
+
+
+def budgeted_routes() -> set:
+    return {
+        f"{method} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute) and hasattr(route.endpoint, "__query_budget__")
+        for method in route.methods
+    }
+
+
+def png() -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (64, 36), (200, 120, 40)).save(output, "PNG")
+    return output.getvalue()
+
+
+def test_every_route_stays_within_its_budget(
+    client, project, shotlist, items, tmp_path, monkeypatch
+):
+    # Processed images are written under the working directory
+    monkeypatch.chdir(tmp_path)
+    client_id, project_id = project["client_id"], project["id"]
+    shotlist_id, item_id = shotlist["id"], items[0]["id"]
+
+    ok(client.get("/api/auth/me"))
+
+    ok(client.get("/api/clients/"))
+    ok(client.get(f"/api/clients/{client_id}"))
+    ok(client.put(f"/api/clients/{client_id}", json={"description": "Regular"}))
+
+    ok(client.get("/api/projects/", params={"status": "pre_production"}))
+    ok(client.get("/api/projects/summary"))
+    ok(client.get(f"/api/projects/{project_id}"))
+    ok(client.get(f"/api/projects/{project_id}/summary"))
+    ok(client.put(f"/api/projects/{project_id}", json={"director": "Someone"}))
+    copy = ok(client.post(f"/api/projects/{project_id}/duplicate"))
+
+    ok(client.get(f"/api/projects/{project_id}/shotlists"))
+    ok(client.get(f"/api/shotlists/{shotlist_id}"))
+    ok(client.put(f"/api/shotlists/{shotlist_id}", json={"notes": "Sunscreen"}))
+    ok(client.post(f"/api/shotlists/{shotlist_id}/duplicate"))
+
+    listing = client.get(f"/api/shotlists/{shotlist_id}/items")
+    ok(listing)
+    ok(
+        client.get(
+            f"/api/shotlists/{shotlist_id}/items",
+            params={"since": listing.headers["X-Sync-Token"]},
+        )
+    )
+    ok(
+        client.get(
+            f"/api/shotlists/{shotlist_id}/items",
+            params={"properties": '{"lens": "35mm"}'},
+        )
+    )
+    ok(client.get("/api/shotlist-items", params={"properties": '{"lens": "35mm"}'}))
+    # The budget covers the lookups before the stream starts
+    ok(client.get(f"/api/shotlists/{uuid.uuid4()}/events"), 404)
+    nested = f"/api/shotlists/{shotlist_id}/items/{item_id}"
+    ok(client.get(nested))
+    ok(client.put(nested, json={"notes": "Wide"}))
+    ok(client.get(f"/api/shotlist-items/{item_id}"))
+    ok(client.put(f"/api/shotlist-items/{item_id}", json={"notes": "Wide"}))
+    ok(
+        client.put(
+            f"/api/shotlists/{shotlist_id}/items/reorder",
+            json={"items": [{"item_id": item_id, "new_index": 2}]},
+        )
+    )
+    ok(
+        client.post(
+            f"/api/shotlists/{shotlist_id}/items/import",
+            files={"file": ("shots.csv", "shot_name,shot_duration\nCrane,5\n")},
+        )
+    )
+    ok(
+        client.post(
+            f"/api/shotlist-items/{item_id}/upload-image",
+            files={"file": ("still.png", png(), "image/png")},
+        )
+    )
+    ok(
+        client.post(
+            f"{nested}/upload-image",
+            files={"file": ("still.png", png(), "image/png")},
+        )
+    )
+    job = ok(
+        client.post(
+            f"/api/shotlist-items/{item_id}/upload-image",
+            params={"background": "true"},
+            files={"file": ("still.png", png(), "image/png")},
+        ),
+        202,
+    )
+    ok(client.get("/api/jobs/"))
+    ok(client.get(f"/api/jobs/{job['id']}"))
+
+    ok(client.get("/api/search/", params={"q": "shot"}))
+    for export_format in ("csv", "xlsx"):
+        ok(client.get(f"/api/shotlists/{shotlist_id}/export.{export_format}"))
+        ok(client.get(f"/api/projects/{project_id}/export.{export_format}"))
+    ok(client.get("/api/conflicts/"))
+
+    token = ok(client.post("/api/calendar/token"))["token"]
+    ok(client.get("/api/calendar/"))
+    feed = ok(client.get(f"/api/calendar/{token}.ics"))
+    ok(
+        client.get(
+            f"/api/calendar/{token}.ics",
+            headers={"If-None-Match": feed.headers["ETag"]},
+        ),
+        304,
+    )
+    ok(client.get(f"/api/calendar/{token}/projects/{project_id}.ics"))
+    ok(client.delete("/api/calendar/token"))
+
+    ok(client.delete(f"/api/shotlist-items/{items[1]['id']}"))
+    ok(client.delete(nested))
+    ok(client.delete(f"/api/shotlists/{shotlist_id}"))
+    ok(client.delete(f"/api/projects/{copy['id']}"))
+    ok(client.delete(f"/api/clients/{client_id}"))
+
+    checked = {entry["route"] for entry in query_budget.report(limit=1000)}
+    assert budgeted_routes() - UNREACHABLE <= checked
+
+
+@pytest.fixture
+def probe_app() -> FastAPI:
+    probe = FastAPI()
+    probe.add_middleware(QueryBudgetMiddleware)
+
+    @probe.get("/over-budget")
+    @query_budget.query_budget(1)
+    def over_budget(db: Session = Depends(get_db)):
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+        return {}
+
+    @probe.get("/n-plus-one")
+    @query_budget.query_budget(100)
+    def n_plus_one(db: Session = Depends(get_db)):
+        for n in range(10):
+            db.execute(text("SELECT :n"), {"n": n})
+        return {}
+
+    return probe
+
+
+def test_strict_mode_fails_requests_over_budget(probe_app):
+    with pytest.raises(QueryBudgetExceeded, match="2 statements, budget is 1"):
+        TestClient(probe_app).get("/over-budget")
+
+
+def test_strict_mode_fails_repeated_statements(probe_app):
+    with pytest.raises(QueryBudgetExceeded, match="possible N\\+1"):
+        TestClient(probe_app).get("/n-plus-one")
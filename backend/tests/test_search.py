@@ -0,0 +1,30 @@
+from app.services import search as search_service
+from tests.utils import ok
+
+
+def test_capped_search_keeps_recent_matches_and_says_so(client, items, monkeypatch):
+    edited = f"/api/shotlist-items/{items[0]['id']}"
+    ok(client.put(edited, json={"notes": "Retake"}))
+    monkeypatch.setattr(search_service, "MAX_CANDIDATES", 2)
+
+    found = ok(client.get("/api/search/", params={"q": "shot", "type": "shot"}))
+
+    assert found["truncated"] is True
+    assert {r["id"] for r in found["results"]} == {items[0]["id"], items[2]["id"]}
+
+
+def test_uncapped_search_is_not_truncated(client, items, monkeypatch):
+    monkeypatch.setattr(search_service, "MAX_CANDIDATES", 3)
+
+    found = ok(client.get("/api/search/", params={"q": "shot", "type": "shot"}))
+
+    assert found["truncated"] is False
+    assert len(found["results"]) == 3
+
+
+def test_columns_line_up_whichever_type_comes_first(client, project, shotlist):
+    for q, type in (("commercial", "project"), ("day", "shotlist")):
+        found = ok(client.get("/api/search/", params={"q": q, "type": type}))
+        [result] = found["results"]
+        assert result["type"] == type
+        assert result["project_id"] == project["id"]
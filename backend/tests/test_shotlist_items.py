@@ -0,0 +1,45 @@
+from sqlalchemy import select
+
+from app.db.database import SessionLocal, utc_now
+from app.models.shotlist_item import ShotlistItem
+from app.models.shotlist_item_tombstone import ShotlistItemTombstone
+from app.services import shotlist_items as shotlist_item_service
+from tests.utils import ok
+
+
+def test_reorder_schedules_shots_from_the_call_time(client, shotlist, items):
+    reordered = ok(
+        client.put(
+            f"/api/shotlists/{shotlist['id']}/items/reorder",
+            json={
+                "items": [
+                    {"item_id": items[0]["id"], "new_index": 2},
+                    {"item_id": items[2]["id"], "new_index": 0},
+                ]
+            },
+        )
+    )
+
+    assert [(i["id"], i["start_time"]) for i in reordered] == [
+        (items[2]["id"], "08:00:00"),
+        (items[1]["id"], "08:10:00"),
+        (items[0]["id"], "08:20:00"),
+    ]
+
+
+def test_updates_and_tombstones_use_the_database_clock(user, items):
+    with SessionLocal() as db:
+        # now() is the start of the transaction, whatever the app's clock says
+        now = db.scalar(select(utc_now()))
+        item = db.get(ShotlistItem, (items[0]["id"], items[0]["shotlist_id"]))
+        item.notes = "Golden hour"
+        db.flush()
+        assert item.updated_at == now
+
+        shotlist_item_service.delete_shotlist_item(db, items[1]["id"], user.id)
+        tombstone = db.scalar(
+            select(ShotlistItemTombstone).where(
+                ShotlistItemTombstone.item_id == items[1]["id"]
+            )
+        )
+        assert tombstone.deleted_at == now
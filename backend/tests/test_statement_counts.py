@@ -0,0 +1,117 @@
+"""Statements per write endpoint, counting the session lookup that signs the
+user in. Updates and deletes are one ownership-scoped statement with
+RETURNING; creates add the lookup of the parent they go under."""
+
+import pytest
+
+from app.db.database import SessionLocal
+from app.schemas.shotlist_item import ShotlistItemUpdate
+from app.services import shotlist_items as shotlist_item_service
+from tests.utils import ok
+
+
+def request_for(name, project, shotlist, items):
+    reorder = [
+        {"item_id": items[0]["id"], "new_index": 2},
+        {"item_id": items[2]["id"], "new_index": 0},
+    ]
+    return {
+        "create client": ("POST", "/api/clients/", {"name": "Other"}),
+        "update client": (
+            "PUT",
+            f"/api/clients/{project['client_id']}",
+            {"description": "Returning client"},
+        ),
+        "delete client": ("DELETE", f"/api/clients/{project['client_id']}", None),
+        "create project": (
+            "POST",
+            "/api/projects/",
+            {"name": "Sequel", "client_id": project["client_id"]},
+        ),
+        "update project": (
+            "PUT",
+            f"/api/projects/{project['id']}",
+            {"director": "Someone"},
+        ),
+        "delete project": ("DELETE", f"/api/projects/{project['id']}", None),
+        "create shotlist": (
+            "POST",
+            f"/api/projects/{project['id']}/shotlists",
+            {"name": "Day 2"},
+        ),
+        "update shotlist": (
+            "PUT",
+            f"/api/shotlists/{shotlist['id']}",
+            {"notes": "Bring sunscreen"},
+        ),
+        "delete shotlist": ("DELETE", f"/api/shotlists/{shotlist['id']}", None),
+        "create item": (
+            "POST",
+            f"/api/shotlists/{shotlist['id']}/items",
+            {"shot_name": "Drone", "shot_duration": 5},
+        ),
+        "update item": (
+            "PUT",
+            f"/api/shotlist-items/{items[0]['id']}",
+            {"notes": "Golden hour"},
+        ),
+        # Plus closing the gap in the ordering and the sync tombstones
+        "delete item": ("DELETE", f"/api/shotlist-items/{items[1]['id']}", None),
+        # Plus the shotlist lock and reading the new order back
+        "reorder items": (
+            "PUT",
+            f"/api/shotlists/{shotlist['id']}/items/reorder",
+            {"items": reorder},
+        ),
+    }[name]
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("create client", 2),
+        ("update client", 2),
+        ("delete client", 2),
+        ("create project", 2),
+        ("update project", 2),
+        ("delete project", 2),
+        ("create shotlist", 3),
+        ("update shotlist", 2),
+        ("delete shotlist", 2),
+        ("create item", 3),
+        ("update item", 2),
+        ("delete item", 5),
+        ("reorder items", 6),
+    ],
+)
+def test_write_statement_count(
+    client, project, shotlist, items, statements, name, expected
+):
+    method, path, body = request_for(name, project, shotlist, items)
+    statements.clear()
+    ok(client.request(method, path, json=body))
+    assert len(statements) == expected, statements
+
+
+def test_update_returns_current_row_when_already_loaded(user, items, monkeypatch):
+    events = []
+    monkeypatch.setattr(
+        shotlist_item_service,
+        "publish_shotlist_event",
+        lambda db, shotlist_id, event_type, **data: events.append(data),
+    )
+    with SessionLocal() as db:
+        # As upload_image does before its update
+        loaded = shotlist_item_service.get_shotlist_item(
+            db, item_id=items[0]["id"], user_id=user.id
+        )
+        updated = shotlist_item_service.update_shotlist_item(
+            db,
+            item_id=loaded.id,
+            item=ShotlistItemUpdate(notes="Changed"),
+            user_id=user.id,
+        )
+
+    assert updated.notes == "Changed"
+    assert updated.updated_at > loaded.created_at
+    assert events[0]["updated_at"] == updated.updated_at.isoformat()
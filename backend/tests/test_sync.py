@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.services import shotlist_items as shotlist_item_service
+from tests.utils import ok
+
+
+def changes_since(client, shotlist, token):
+    response = client.get(
+        f"/api/shotlists/{shotlist['id']}/items", params={"since": token}
+    )
+    return ok(response), response.headers["X-Sync-Token"]
+
+
+def test_changes_since_a_token_include_edits_and_deletes(
+    client, shotlist, items, monkeypatch
+):
+    monkeypatch.setattr(settings, "SYNC_TOKEN_OVERLAP_SECONDS", 0)
+    response = client.get(f"/api/shotlists/{shotlist['id']}/items")
+    assert len(ok(response)) == 3
+    token = response.headers["X-Sync-Token"]
+
+    ok(client.put(f"/api/shotlist-items/{items[0]['id']}", json={"notes": "Wide"}))
+    ok(client.delete(f"/api/shotlist-items/{items[1]['id']}"))
+
+    changes, next_token = changes_since(client, shotlist, token)
+    # The shot after the deleted one moved up to close the gap
+    assert [(i["id"], i["order_index"]) for i in changes["items"]] == [
+        (items[0]["id"], 0),
+        (items[2]["id"], 1),
+    ]
+    assert changes["items"][0]["notes"] == "Wide"
+    assert changes["deleted"] == [items[1]["id"]]
+    assert changes["reset"] is False
+    assert changes["token"] == next_token
+
+    # Nothing has changed since the token that came back
+    changes, _ = changes_since(client, shotlist, next_token)
+    assert changes["items"] == [] and changes["deleted"] == []
+
+
+def test_a_token_older_than_the_tombstones_resets(client, shotlist, items):
+    ok(client.delete(f"/api/shotlist-items/{items[1]['id']}"))
+    retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+    token = shotlist_item_service.encode_sync_token(datetime.utcnow() - retention)
+
+    changes, _ = changes_since(client, shotlist, token)
+    assert changes["reset"] is True
+    assert changes["deleted"] == []
+    assert [item["id"] for item in changes["items"]] == [
+        items[0]["id"],
+        items[2]["id"],
+    ]
+
+
+def test_a_malformed_token_is_rejected(client, shotlist):
+    response = client.get(
+        f"/api/shotlists/{shotlist['id']}/items", params={"since": "yesterday"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid sync token"
@@ -0,0 +1,22 @@
+import json
+from base64 import b64encode
+
+import itsdangerous
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.models.user import User
+
+
+def sign_in(client: TestClient, user: User):
+    # What SessionMiddleware would set after the OAuth callback
+    signer = itsdangerous.TimestampSigner(settings.SESSION_SECRET)
+    data = b64encode(json.dumps({"user_id": str(user.id)}).encode())
+    client.cookies.set("session", signer.sign(data).decode())
+
+
+def ok(response, status_code: int = 200):
+    assert response.status_code == status_code, response.text
+    if response.headers.get("content-type", "").startswith("application/json"):
+        return response.json()
+    return response